@@ -0,0 +1,7 @@
+"""
+Offline benchmarks of brightspot_employee, run against recorded fixture pages and local HTTP servers.
+
+Each bench_* module has a run() function returning its measurements as a dict
+and can be run on its own (python -m benchmarks.bench_parse); python -m benchmarks runs them all
+and writes the results to a json file.
+"""
@@ -0,0 +1,91 @@
+"""
+Run every benchmark (or the ones named) and write the results to a json file.
+
+Run: python -m benchmarks [names...] [--quick] [--output results.json] [--compare earlier.json]
+"""
+from argparse import ArgumentParser
+from contextlib import suppress
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+import json
+import platform
+import subprocess
+import sys
+
+# name -> (module, run() kwargs, run() kwargs with --quick)
+SUITE = {
+    'parse': ('bench_parse', {}, {'cards': 1000}),
+    'extraction': ('bench_extraction', {}, {'repeat': 20}),
+    'room': ('bench_room', {}, {'count': 10000}),
+    'csv': ('bench_csv', {}, {'sizes': (10000,)}),
+    'photos': ('bench_photos', {}, {'count': 50}),
+    'pool': ('bench_pool', {}, {}),
+    'memory': ('bench_memory', {}, {'count': 10000}),
+    'index': ('bench_index', {}, {'count': 10000}),
+    'instrument': ('bench_instrument', {}, {'cards': 100}),
+    'parallel': ('bench_parallel', {}, {'pages': 4, 'cards': 200}),
+    'scheduler': ('bench_scheduler', {}, {'count': 100}),
+    'thumbnails': ('bench_thumbnails', {}, {'count': 10}),
+    'merge': ('bench_merge', {}, {'count': 5000, 'pairwise_count': 500}),
+}
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def _git_commit() -> str:
+    with suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+                              universal_newlines=True).stdout.strip()
+    return ''
+
+
+def _flatten(results: dict, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f'{prefix}{key}.')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield prefix + key, value
+
+
+def compare(earlier: dict, later: dict) -> None:
+    """Print every measurement found in both result files, with the ratio of later to earlier."""
+    before = dict(_flatten(earlier['results']))  # type: Dict[str, float]
+    for key, value in _flatten(later['results']):
+        if key in before:
+            ratio = f'{value / before[key]:.2f}x' if before[key] else '-'
+            print(f'{key}: {before[key]:.4g} -> {value:.4g} ({ratio})')
+
+
+def main(argv=None) -> None:
+    parser = ArgumentParser(prog='python -m benchmarks', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help=f'benchmarks to run (default: all of {", ".join(SUITE)})')
+    parser.add_argument('--quick', action='store_true', help='run with smaller inputs')
+    parser.add_argument('--output', type=Path, help='json file to write (default: benchmarks/results/<time>.json)')
+    parser.add_argument('--compare', type=Path, help='earlier json file to compare the results against')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in SUITE]
+    if unknown:
+        parser.error(f'unknown benchmark {", ".join(unknown)} (choose from {", ".join(SUITE)})')
+
+    created = datetime.now(timezone.utc)
+    report = {'created': created.isoformat(timespec='seconds'), 'commit': _git_commit(),
+              'python': platform.python_version(), 'platform': platform.platform(), 'quick': args.quick,
+              'results': dict()}
+    for name in args.names or SUITE:
+        module, kwargs, quick_kwargs = SUITE[name]
+        print(f'running {name}...', file=sys.stderr)
+        report['results'][name] = import_module(f'benchmarks.{module}').run(**(quick_kwargs if args.quick else kwargs))
+
+    output = args.output or RESULTS_DIR / f'{created:%Y%m%dT%H%M%S}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1, default=str), encoding='utf-8')
+    print(f'results written to {output}', file=sys.stderr)
+    if args.compare is not None:
+        compare(json.loads(args.compare.read_text(encoding='utf-8')), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Employee.from_csv with the csv module (the default) and with pandas (vectorized room parsing and name splitting)
+against the per-row from_named_tuple path, and the time to write the loaded employees back with Employee.to_csv.
+Also compares the peak memory of from_csv with streaming the file through iter_csv into a gzip write_csv_stream.
+
+Run: python -m benchmarks.bench_csv [row counts...]   (default: 10000 100000; add 1000000 for the full run)
+"""
+from src.brightspot_employee import Employee
+from src.brightspot_employee.room import Room
+from tests.fixtureLayouts import write_csv
+
+from pandas import read_csv
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import sys
+import time
+import tracemalloc
+
+
+def per_row(file_path: Path) -> list:
+    Room.parser.clear()
+    dataframe = read_csv(file_path, keep_default_na=False)
+    return [Employee.from_named_tuple(row) for row in dataframe.itertuples()]
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _peak_mib(function, *args) -> float:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def run(sizes=(10000, 100000)) -> dict:
+    results = dict()
+    with TemporaryDirectory() as temp_dir:
+        for rows in sizes:
+            for full_name in (False, True):
+                file_path = Path(temp_dir) / f'{rows}-{full_name}.csv'
+                write_csv(file_path, rows, full_name)
+                label = f'{rows}_{"full_name" if full_name else "split_name"}'
+                Room.parser.clear()
+                csv_module = _time(Employee.from_csv, file_path)
+                Room.parser.clear()
+                vectorized = _time(Employee.from_csv, file_path, None, 'pandas')
+                Room.parser.clear()
+                chunked = _time(Employee.from_csv, file_path, 50000, 'pandas')
+                row_by_row = _time(per_row, file_path)
+                written = _time(Employee.to_csv, Path(temp_dir) / 'out.csv', Employee.from_csv(file_path))
+                stream_path = Path(temp_dir) / 'out.csv.gz'
+                streamed = _time(Employee.write_csv_stream, stream_path, Employee.iter_csv(file_path))
+                Room.parser.clear()
+                list_peak = _peak_mib(Employee.from_csv, file_path)
+                Room.parser.clear()
+                stream_peak = _peak_mib(Employee.write_csv_stream, stream_path, Employee.iter_csv(file_path))
+                results[label] = {'per_row_seconds': row_by_row, 'csv_module_seconds': csv_module,
+                                  'vectorized_seconds': vectorized, 'chunked_seconds': chunked,
+                                  'speedup': row_by_row / vectorized, 'to_csv_seconds': written,
+                                  'round_trip_seconds': csv_module + written,
+                                  'stream_gzip_round_trip_seconds': streamed,
+                                  'from_csv_peak_mib': list_peak, 'stream_peak_mib': stream_peak}
+    return results
+
+
+if __name__ == '__main__':
+    for label, result in run(tuple(int(arg) for arg in sys.argv[1:]) or (10000, 100000)).items():
+        print(label, ' '.join(f'{key}={value:.3f}' for key, value in result.items()))
@@ -0,0 +1,50 @@
+"""
+Per-tag time of Employee.from_html_tag with the compiled ExtractionPlan
+against calling every EmployeeProcessor.process_* method on its own.
+
+Run: python -m benchmarks.bench_extraction
+"""
+from src.brightspot_employee import util, Employee, EmployeeProcessor
+
+from pathlib import Path
+import timeit
+
+FIXTURE = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'religion_directory.html'
+
+
+class BenchEmployee(Employee):
+    processor = EmployeeProcessor('PromoVerticalImage', 'ListVerticalImage-items-item')
+
+
+def _legacy_from_html_tag(tag) -> Employee:
+    processor = BenchEmployee.processor
+    first_name, last_name = processor.process_split_name(tag)
+    return BenchEmployee(first_name, last_name, processor.process_room(tag), processor.process_page_url(tag),
+                         processor.process_telephone(tag), processor.process_department(tag),
+                         processor.process_job_title(tag))
+
+
+def run(repeat: int = 200) -> dict:
+    tags = util.find_tags(FIXTURE.read_text(encoding='utf-8'), kwargs={'class_': BenchEmployee.processor.super_container})
+    tags = [tag for tag in tags if tag.find(class_='PromoVerticalImage-phoneNumber')]
+
+    def legacy():
+        for tag in tags:
+            _legacy_from_html_tag(tag)
+
+    def compiled():
+        for tag in tags:
+            BenchEmployee.from_html_tag(tag)
+
+    calls = repeat * len(tags)
+    legacy_seconds = min(timeit.repeat(legacy, number=repeat, repeat=3)) / calls
+    compiled_seconds = min(timeit.repeat(compiled, number=repeat, repeat=3)) / calls
+    return {'tags': calls,
+            'legacy_us_per_tag': legacy_seconds * 1e6,
+            'compiled_us_per_tag': compiled_seconds * 1e6,
+            'speedup': legacy_seconds / compiled_seconds}
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
@@ -0,0 +1,55 @@
+"""
+Lookup latency of an EmployeeIndex against scanning a list of employees.
+
+Run: python -m benchmarks.bench_index [record count]
+"""
+from src.brightspot_employee import Employee
+from src.brightspot_employee.index import EmployeeIndex
+from src.brightspot_employee.room import Room
+from benchmarks.bench_memory import _fields
+
+import sys
+import timeit
+
+
+def _microseconds(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def run(count: int = 100000) -> dict:
+    employees = [Employee(f, l, Room(*room), u, t, d, j) for f, l, room, u, t, d, j in map(_fields, range(count))]
+    start = timeit.default_timer()
+    index = EmployeeIndex(employees)
+    build_seconds = timeit.default_timer() - start
+
+    prefix = f'last{count // 3}'
+    telephone = employees[count // 2].telephone
+
+    def scan_prefix():
+        return [e for e in employees if e.last_name.casefold().startswith(prefix)]
+
+    def scan_room():
+        return [e for e in employees if e.room.building == 'JSB' and str(e.room.floor) == '2']
+
+    def scan_telephone():
+        return [e for e in employees if e.telephone == telephone]
+
+    def remove_add():
+        employee = employees[count // 4]
+        index.remove(employee)
+        index.add(employee)
+
+    return {'records': count,
+            'build_seconds': build_seconds,
+            'scan_prefix_us': _microseconds(scan_prefix, 3),
+            'index_prefix_us': _microseconds(lambda: index.search(prefix, 'last_name'), 1000),
+            'scan_room_us': _microseconds(scan_room, 3),
+            'index_room_us': _microseconds(lambda: index.by_room('JSB', 2), 20),
+            'scan_telephone_us': _microseconds(scan_telephone, 3),
+            'index_telephone_us': _microseconds(lambda: index.lookup('telephone', telephone), 1000),
+            'remove_add_us': _microseconds(remove_add, 1000)}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.1f}' if isinstance(value, float) else f'{key}: {value}')
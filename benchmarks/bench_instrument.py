@@ -0,0 +1,31 @@
+"""
+Cost of the instrumentation hooks: Employee.from_html_tags with no listener, and with a Metrics listener.
+
+Run: python -m benchmarks.bench_instrument
+"""
+from src.brightspot_employee import instrument, util
+from tests.fixtureLayouts import LAYOUTS, scaled_page
+
+import timeit
+
+
+def run(cards: int = 500, repeat: int = 5) -> dict:
+    layout = LAYOUTS['default']
+    tags = util.find_tags(scaled_page(layout, cards), kwargs={'class_': layout.employee_cls.processor.super_container})
+
+    def extract():
+        layout.employee_cls.from_html_tags(tags)
+
+    disabled = min(timeit.repeat(extract, number=1, repeat=repeat)) / len(tags)
+    with instrument.Metrics():
+        enabled = min(timeit.repeat(extract, number=1, repeat=repeat)) / len(tags)
+    hook = min(timeit.repeat(lambda: instrument.count('tags_found'), number=100000, repeat=3)) / 100000
+    return {'tags': len(tags),
+            'disabled_us_per_tag': disabled * 1e6,
+            'enabled_us_per_tag': enabled * 1e6,
+            'disabled_hook_ns': hook * 1e9}
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
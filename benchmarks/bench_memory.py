@@ -0,0 +1,78 @@
+"""
+Memory per record of dict-based objects, __slots__ Employee/Room objects and an EmployeeTable.
+
+Run: python -m benchmarks.bench_memory [record count]
+"""
+from src.brightspot_employee import Employee, EmployeeTable
+from src.brightspot_employee.room import Room
+
+import gc
+import sys
+import tracemalloc
+
+BUILDINGS = ('JSB', 'HGB', 'TMCB', 'JFSB', 'MARB')
+DEPARTMENTS = ('Church History and Doctrine', 'Ancient Scripture', 'Computer Science', 'History')
+TITLES = ('Professor', 'Associate Professor', 'Assistant Professor', 'Secretary')
+
+
+class DictRoom:
+    def __init__(self, building, floor, rm_num, rm_letter=''):
+        self.floor = floor
+        self.rm_num = rm_num
+        self.rm_letter = rm_letter
+        self.building = building
+
+
+class DictEmployee:
+    def __init__(self, first_name, last_name, room_address, page_url, telephone, department, job_title):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.room = room_address
+        self.page_url = page_url
+        self.telephone = telephone
+        self.department = department
+        self.job_title = job_title
+
+
+def _fields(index: int) -> tuple:
+    rm_num = str(100 + index % 400)
+    return (f'First{index}', f'Last{index}', (BUILDINGS[index % 5], rm_num[0], rm_num, 'ABC'[index % 3]),
+            f'https://example.byu.edu/directory/person-{index}', f'801-422-{index % 10000:04d}',
+            DEPARTMENTS[index % 4], TITLES[index % 4])
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(count: int = 100000) -> dict:
+    records = [_fields(index) for index in range(count)]
+
+    def legacy():
+        return [DictEmployee(f, l, DictRoom(*room), u, t, d, j) for f, l, room, u, t, d, j in records]
+
+    def slotted():
+        return [Employee(f, l, Room(*room), u, t, d, j) for f, l, room, u, t, d, j in records]
+
+    def table():
+        return EmployeeTable.from_employees(Employee(f, l, Room(*room), u, t, d, j)
+                                            for f, l, room, u, t, d, j in records)
+
+    # strings shared by every variant are allocated before measuring
+    legacy_bytes, slotted_bytes, table_bytes = _measure(legacy), _measure(slotted), _measure(table)
+    return {'records': count,
+            'dict_bytes_per_record': legacy_bytes / count,
+            'slots_bytes_per_record': slotted_bytes / count,
+            'table_bytes_per_record': table_bytes / count}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.1f}' if isinstance(value, float) else f'{key}: {value}')
@@ -0,0 +1,68 @@
+"""
+Merging overlapping directories with merge.merge against comparing every pair of employees.
+
+Each of the directories holds count employees, half of them shared with the next directory
+(with a different host in their page_url, and some fields left blank).
+
+Run: python -m benchmarks.bench_merge [employees per directory] [directories]
+"""
+from src.brightspot_employee import Employee
+from src.brightspot_employee.merge import merge
+from src.brightspot_employee.room import Room
+from benchmarks.bench_memory import _fields
+
+import sys
+import time
+
+
+def _directories(count: int, directories: int) -> dict:
+    result = dict()
+    for number in range(directories):
+        employees = []
+        for index in range(number * count // 2, number * count // 2 + count):
+            f, l, room, u, t, d, j = _fields(index)
+            u = u.replace('example.byu.edu', 'www.example.byu.edu' if number % 2 else 'example.byu.edu')
+            employees.append(Employee(f, l, Room(*room) if number % 2 else Room('', '', ''), u, t, d,
+                                      j if number % 2 == 0 else ''))
+        result[f'https://directory-{number}.byu.edu'] = employees
+    return result
+
+
+def pairwise(directories: dict) -> list:
+    """Merge by comparing each employee with every employee kept so far (the approach merge replaces)."""
+    kept = []
+    for employees in directories.values():
+        for employee in employees:
+            for other in kept:
+                if other.full_name == employee.full_name and other.telephone == employee.telephone:
+                    break
+            else:
+                kept.append(employee)
+    return kept
+
+
+def run(count: int = 50000, directories: int = 3, pairwise_count: int = 2000) -> dict:
+    lists = _directories(count, directories)
+    start = time.perf_counter()
+    merged = merge(lists)
+    merge_seconds = time.perf_counter() - start
+
+    small = _directories(pairwise_count, directories)
+    start = time.perf_counter()
+    pairwise(small)
+    pairwise_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    merge(small)
+    small_merge_seconds = time.perf_counter() - start
+    return {'employees': count * directories,
+            'merged': len(merged),
+            'merge_seconds': merge_seconds,
+            'merge_employees_per_second': count * directories / merge_seconds,
+            'pairwise_employees': pairwise_count * directories,
+            'pairwise_seconds': pairwise_seconds,
+            'merge_seconds_same_input': small_merge_seconds}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
@@ -0,0 +1,45 @@
+"""
+Parsing many large directory pages in this process against a ParsePool of worker processes.
+
+The speedup is bounded by the number of cores (reported as cpu_count).
+
+Run: python -m benchmarks.bench_parallel [page count] [cards per page]
+"""
+from src.brightspot_employee.parallel import ParsePool, parse_page, to_employees
+from tests.fixtureLayouts import LAYOUTS, scaled_page
+
+from os import cpu_count
+import sys
+import time
+
+
+def run(pages: int = 8, cards: int = 1000) -> dict:
+    layout = LAYOUTS['default']
+    employee_cls = layout.employee_cls
+    bodies = [scaled_page(layout, cards)] * pages
+
+    start = time.perf_counter()
+    for html_data in bodies:
+        to_employees(employee_cls, parse_page(employee_cls, html_data))
+    serial = time.perf_counter() - start
+
+    with ParsePool(employee_cls) as pool:
+        pool.parse(bodies[0][:1000])  # start the workers before timing
+        start = time.perf_counter()
+        for _ in pool.map(bodies):
+            pass
+        pooled = time.perf_counter() - start
+        processes = pool.processes
+
+    return {'pages': pages,
+            'cards_per_page': cards,
+            'cpu_count': cpu_count(),
+            'processes': processes,
+            'serial_seconds': serial,
+            'pool_seconds': pooled,
+            'speedup': serial / pooled}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
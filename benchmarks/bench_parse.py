@@ -0,0 +1,47 @@
+"""
+Parse and extraction time of directory pages scaled up to many cards, for each layout in tests.fixtureLayouts.
+
+Pages are served by a local FixtureServer, so util.tag_iterator and util.iter_tags are timed
+including the (local) request; util.find_tags is timed on the page text alone.
+
+Run: python -m benchmarks.bench_parse [card count]
+"""
+from src.brightspot_employee import util
+from tests.fixtureLayouts import LAYOUTS, scaled_page
+from tests.fixtureServer import FixtureServer
+
+import sys
+import timeit
+
+
+def _seconds(function, number: int = 1, repeat: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def run(cards: int = 10000) -> dict:
+    pages = {name: scaled_page(layout, cards) for name, layout in LAYOUTS.items()}
+    results = dict()
+    with FixtureServer({f'/{name}': page for name, page in pages.items()}) as server:
+        for name, layout in LAYOUTS.items():
+            url = server.url(f'/{name}')
+            kwargs = {'class_': layout.employee_cls.processor.super_container}
+            tags = util.find_tags(pages[name], kwargs=kwargs)
+            employees = layout.employee_cls.from_html_tags(tags)
+            full_names = [employee.full_name for employee in employees]
+            results[name] = {
+                'cards': len(tags),
+                'page_bytes': len(pages[name].encode('utf-8')),
+                'find_tags_seconds': _seconds(lambda: util.find_tags(pages[name], kwargs=kwargs)),
+                'tag_iterator_seconds': _seconds(lambda: util.tag_iterator(url, kwargs=kwargs)),
+                'iter_tags_seconds': _seconds(lambda: sum(1 for _ in util.iter_tags(url, kwargs['class_']))),
+                'from_html_tag_us_per_tag': _seconds(lambda: layout.employee_cls.from_html_tags(tags)) / len(tags) * 1e6,
+                'split_name_us_per_name': _seconds(lambda: [util.split_name(n) for n in full_names], 5)
+                                          / len(full_names) * 1e6,
+            }
+    return results
+
+
+if __name__ == '__main__':
+    for layout, result in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(layout, ' '.join(f'{key}={value:.3f}' if isinstance(value, float) else f'{key}={value}'
+                               for key, value in result.items()))
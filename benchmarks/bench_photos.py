@@ -0,0 +1,46 @@
+"""
+Photo download throughput of Employee.download_all_photos against a local FixtureServer.
+
+The first run downloads every photo; the second finds them unchanged and skips them.
+
+Run: python -m benchmarks.bench_photos [photo count] [photo KiB]
+"""
+from src.brightspot_employee import Employee
+from src.brightspot_employee.room import Room
+from tests.fixtureServer import FixtureServer, profile_page
+
+from tempfile import TemporaryDirectory
+import os
+import sys
+import time
+
+
+def run(count: int = 200, photo_kib: int = 256, thread_limit: int = 5) -> dict:
+    routes = dict()
+    for index in range(count):
+        routes[f'/img/{index}.jpg'] = os.urandom(photo_kib * 1024)
+    with FixtureServer(routes) as server:
+        for index in range(count):
+            routes[f'/directory/{index}'] = profile_page(server.url(f'/img/{index}.jpg'))
+        employees = [Employee(f'First{index}', f'Last{index}', Room('JSB', '2', '270'),
+                              server.url(f'/directory/{index}'), '', '', '') for index in range(count)]
+        with TemporaryDirectory() as temp_dir:
+            start = time.perf_counter()
+            results = Employee.download_all_photos(employees, temp_dir, thread_limit=thread_limit)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            Employee.download_all_photos(employees, temp_dir, thread_limit=thread_limit)
+            warm = time.perf_counter() - start
+    failed = sum(not result.ok for result in results)
+    return {'photos': count,
+            'failed': failed,
+            'cold_seconds': cold,
+            'cold_photos_per_second': count / cold,
+            'cold_mib_per_second': count * photo_kib / 1024 / cold,
+            'unchanged_seconds': warm,
+            'unchanged_photos_per_second': count / warm}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
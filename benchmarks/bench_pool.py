@@ -0,0 +1,57 @@
+"""
+Throughput of WorkerPool against chunk-joined threads (how util.stepped_limited_multithread used to run).
+
+Tasks sleep for uneven durations (as photo downloads do), so the stepped
+version waits on the slowest task of every chunk while the pool keeps refilling slots.
+
+Run: python -m benchmarks.bench_pool
+"""
+from src.brightspot_employee import util
+from src.brightspot_employee.pool import WorkerPool
+
+from functools import partial
+from threading import Thread
+import random
+import time
+
+
+def _stepped(functions, limit: int) -> None:
+    """Start limit threads at a time, and join every thread of a chunk before starting the next chunk."""
+    for function_chunk in util.chunk_iterator(limit, functions):
+        threads = [Thread(target=function) for function in function_chunk]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def _sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def run(task_count: int = 200, limit: int = 10, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    durations = [0.05 if rng.random() < 0.1 else 0.005 for _ in range(task_count)]
+    functions = [partial(_sleep, seconds) for seconds in durations]
+
+    start = time.perf_counter()
+    _stepped(functions, limit)
+    stepped = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with WorkerPool(limit) as pool:
+        pool.map(functions)
+    pooled = time.perf_counter() - start
+
+    return {'tasks': task_count,
+            'limit': limit,
+            'stepped_seconds': stepped,
+            'pool_seconds': pooled,
+            'stepped_tasks_per_second': task_count / stepped,
+            'pool_tasks_per_second': task_count / pooled,
+            'speedup': stepped / pooled}
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
@@ -0,0 +1,56 @@
+"""
+Room parsing with RoomParser (compiled, memoized, interned) against the original per-call re.sub/re.search.
+
+Run: python -m benchmarks.bench_room
+"""
+from src.brightspot_employee.room import Room, RoomParser
+
+import random
+import re
+import timeit
+
+
+def legacy_from_string(room_string: str) -> Room:
+    clean_string = room_string.strip()
+    clean_string = re.sub(r'-', ' ', clean_string)
+    clean_string = re.sub(r'Office(:\s)*', '', clean_string)
+    clean_string = re.sub(r'Joseph.*', 'JSB', clean_string)
+    clean_string = re.sub(r'Heber.*', 'HGB', clean_string)
+    clean_string = re.sub(r'(?<=\d)\s*([^\d\s])(?!\w)', r'\g<1>', clean_string)
+    building = re.search(r'[^\d\s]{2,}', clean_string)
+    rm_num = re.search(r'\d{2,}', clean_string)
+    rm_letter = re.search(r'(?<=\d{2})([^\d\s])(?!\w)', clean_string)
+    rm_num = '' if rm_num is None else rm_num.group(0)
+    return Room('' if building is None else building.group(0), rm_num[0] if rm_num else '', rm_num,
+                '' if rm_letter is None else rm_letter.group(0))
+
+
+def room_strings(count: int, distinct: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    buildings = ('Joseph Smith Building', 'Heber J. Grant Building', 'TMCB', 'JFSB', 'MARB')
+    pool = [f'Office: {rng.randint(100, 4999)}{rng.choice(("", "", "A", "-B"))} {rng.choice(buildings)}'
+            for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def run(count: int = 100000, distinct: int = 500) -> dict:
+    strings = room_strings(count, distinct)
+    unique = room_strings(count, count, seed=1)
+    legacy = min(timeit.repeat(lambda: [legacy_from_string(s) for s in strings], number=1, repeat=3))
+    uncached_parser = RoomParser(cache_size=0)
+    uncached = min(timeit.repeat(lambda: uncached_parser.parse_many(unique), number=1, repeat=3))
+    memoized = min(timeit.repeat(lambda: RoomParser().parse_many(strings), number=1, repeat=3))
+    parser = RoomParser()
+    rooms = parser.parse_many(strings)
+    return {'strings': count,
+            'distinct_strings': distinct,
+            'legacy_us_per_string': legacy / count * 1e6,
+            'compiled_uncached_us_per_string': uncached / count * 1e6,
+            'memoized_us_per_string': memoized / count * 1e6,
+            'distinct_room_instances': len({id(room) for room in rooms}),
+            'speedup': legacy / memoized}
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
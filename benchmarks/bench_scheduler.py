@@ -0,0 +1,63 @@
+"""
+Throughput of RequestScheduler against a local FixtureServer that throttles more than capacity simultaneous requests.
+
+Compares a scheduler pinned at the client's thread count with one adapting its concurrency limit,
+counting the 429 responses each provoked.
+
+Run: python -m benchmarks.bench_scheduler [request count] [threads] [capacity]
+"""
+from src.brightspot_employee.scheduler import RequestScheduler
+from tests.fixtureServer import FixtureServer
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import sys
+import time
+
+
+def _throttling_route(capacity: int, latency: float):
+    lock = Lock()
+    in_flight = [0]
+
+    def route(handler):
+        with lock:
+            accepted = in_flight[0] < capacity
+            in_flight[0] += accepted
+        if accepted:
+            time.sleep(latency)
+            with lock:
+                in_flight[0] -= 1
+        handler.send_response(200 if accepted else 429)
+        handler.send_header('Content-Length', '0')
+        handler.end_headers()
+    return route
+
+
+def _time(scheduler: RequestScheduler, url: str, count: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        for response in executor.map(lambda _: scheduler.get(url), range(count)):
+            response.close()
+    return time.perf_counter() - start
+
+
+def run(count: int = 400, threads: int = 16, capacity: int = 4, latency: float = 0.01) -> dict:
+    results = {'requests': count, 'threads': threads, 'capacity': capacity}
+    with FixtureServer({'/page': _throttling_route(capacity, latency)}) as server:
+        url = server.url('/page')
+        for name, scheduler in (('fixed', RequestScheduler(concurrency=threads, min_concurrency=threads,
+                                                           max_concurrency=threads, backoff=0.05)),
+                                ('adaptive', RequestScheduler(concurrency=threads, max_concurrency=threads,
+                                                              backoff=0.05))):
+            seconds = _time(scheduler, url, count, threads)
+            stats = scheduler.host_stats(url)
+            results[f'{name}_seconds'] = seconds
+            results[f'{name}_requests_per_second'] = count / seconds
+            results[f'{name}_throttled'] = stats.throttled
+            results[f'{name}_final_concurrency'] = stats.concurrency
+    return results
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
@@ -0,0 +1,77 @@
+"""
+Thumbnail throughput of make_thumbnails and ThumbnailPool on generated full-resolution JPEG photos.
+
+Compares a naive pass (every output decoded from the full-size photo, one photo at a time)
+with make_thumbnails (one reduced-size decode per photo) in this process and in a ThumbnailPool.
+
+Run: python -m benchmarks.bench_thumbnails [photo count] [processes]
+"""
+from src.brightspot_employee.thumbnails import ThumbnailPool, ThumbnailSpec, make_thumbnails, thumbnail_path
+
+from PIL import Image
+
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import sys
+import time
+
+SPECS = (ThumbnailSpec('small', 128), ThumbnailSpec('medium', 512), ThumbnailSpec('webp', 512, 'WEBP', 80))
+
+
+def _photo(index: int, width: int = 2400, height: int = 3000) -> bytes:
+    buffer = BytesIO()
+    image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    image.paste((index * 37 % 256, 80, 160), (0, 0, width // 3, height // 3))
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def _naive(source: Path, out_dir: Path) -> None:
+    for spec in SPECS:
+        with Image.open(source) as image:
+            image = image.resize((spec.size * image.width // max(image.size),
+                                  spec.size * image.height // max(image.size)), Image.LANCZOS)
+            target = thumbnail_path(source, out_dir, spec)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            image.save(target, spec.format, quality=spec.quality)
+
+
+def run(count: int = 40, processes: int = None) -> dict:
+    with TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        sources = []
+        for index in range(count):
+            sources.append(temp_dir / f'{index}.jpg')
+            sources[-1].write_bytes(_photo(index))
+
+        start = time.perf_counter()
+        for source in sources:
+            _naive(source, temp_dir / 'naive')
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for source in sources:
+            make_thumbnails(source, temp_dir / 'serial', SPECS)
+        serial = time.perf_counter() - start
+
+        with ThumbnailPool(temp_dir / 'pool', SPECS, processes) as pool:
+            start = time.perf_counter()
+            results = pool.map(sources)
+            pooled = time.perf_counter() - start
+            start = time.perf_counter()
+            pool.map(sources)
+            unchanged = time.perf_counter() - start
+            processes = pool.processes
+    return {'photos': count,
+            'processes': processes,
+            'failed': sum(not result.ok for result in results),
+            'naive_photos_per_second': count / naive,
+            'draft_photos_per_second': count / serial,
+            'pool_photos_per_second': count / pooled,
+            'unchanged_photos_per_second': count / unchanged}
+
+
+if __name__ == '__main__':
+    for key, value in run(*(int(arg) for arg in sys.argv[1:])).items():
+        print(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
@@ -1 +1,7 @@
 from .employee import *
+from .cache import DiskCache
+from .table import EmployeeTable
+from .store import EmployeeStore
+from .index import EmployeeIndex
+from .scheduler import RequestScheduler
+from .thumbnails import ThumbnailPool
@@ -0,0 +1,351 @@
+"""
+On-disk HTTP response cache with conditional revalidation.
+
+Classes:
+ResponseCache - Interface for caches used by util.open_url (subclass to plug in other storage).
+DiskCache - Size-bounded, least-recently-used cache of response bodies in a directory.
+CacheEntry - A stored response body and its validators.
+CacheStats - Hit/miss counters of a cache.
+CachedResponse - Response served from a cache (supports the parts of requests.Response used here).
+
+Exceptions:
+CacheMissError - Raised by an offline cache for a url it has never stored.
+
+"""
+
+from .scheduler import RequestScheduler, default_scheduler
+from . import util
+
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from hashlib import sha256
+from os import PathLike, utime
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Union, TYPE_CHECKING
+import json
+import time
+
+if TYPE_CHECKING:
+    import requests
+
+
+class CacheMissError(LookupError):
+    """Raised when an offline cache has no stored response for a url."""
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    encoding: Optional[str] = None
+    content_type: Optional[str] = None
+    stored: float = 0
+
+
+class CacheStats:
+    """
+    Counters of how a cache served its requests. Counters are updated through add, which is thread-safe.
+
+    Attributes:
+    hits - responses served from the cache without touching the network (fresh or offline)
+    revalidated - responses confirmed unchanged by a 304, served from the cache
+    misses - responses downloaded in full
+    stored - responses written to the cache
+    evicted - entries removed to stay under the size limit
+    bytes_downloaded - body bytes downloaded because of misses
+    bytes_saved - body bytes served from the cache instead of downloaded
+    """
+
+    FIELDS = ('hits', 'revalidated', 'misses', 'stored', 'evicted', 'bytes_downloaded', 'bytes_saved')
+
+    def __init__(self):
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self._lock = Lock()
+
+    def __str__(self) -> str:
+        return str({field: getattr(self, field) for field in self.FIELDS})
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def add(self, **counts: int) -> None:
+        """Add each count to the counter of the same name, atomically."""
+        with self._lock:
+            for field, count in counts.items():
+                setattr(self, field, getattr(self, field) + count)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the fraction of requests served from the cache."""
+        total = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / total if total else 0.0
+
+
+class CachedResponse:
+    """Response built from a CacheEntry, usable in place of a requests.Response."""
+
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, entry: CacheEntry):
+        self.url = entry.url
+        self.content = entry.body
+        self.encoding = entry.encoding
+        from requests.structures import CaseInsensitiveDict
+        self.headers = CaseInsensitiveDict()
+        if entry.content_type:
+            self.headers['Content-Type'] = entry.content_type
+
+    def __enter__(self) -> 'CachedResponse':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _RecordingResponse:
+    """Live requests.Response that hands its full body to on_complete once it has been read."""
+
+    from_cache = False
+
+    def __init__(self, response: 'requests.Response', on_complete: Callable[[bytes], None]):
+        self._response = response
+        self._on_complete = on_complete
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __enter__(self) -> '_RecordingResponse':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def content(self) -> bytes:
+        content = self._response.content
+        self._complete(content)
+        return content
+
+    @property
+    def text(self) -> str:
+        self._complete(self._response.content)
+        return self._response.text
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        chunks = []
+        for chunk in self._response.iter_content(chunk_size):
+            chunks.append(chunk)
+            yield chunk
+        self._complete(b''.join(chunks))
+
+    def _complete(self, body: bytes) -> None:
+        if self._on_complete is not None:
+            on_complete, self._on_complete = self._on_complete, None
+            on_complete(body)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class ResponseCache(ABC):
+    """
+    Interface for caches of http responses.
+
+    Subclasses store entries however they like by implementing load, store and clear;
+    ResponseCache.open handles freshness, conditional requests and statistics.
+
+    Attributes:
+    ttl - seconds a stored response is used without revalidation. If None, every use is revalidated
+    offline - never touch the network; serve every stored response and raise CacheMissError otherwise
+    stats - CacheStats of this cache
+    """
+
+    def __init__(self, ttl: Optional[float] = None, offline: bool = False):
+        self.ttl = ttl
+        self.offline = offline
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def load(self, url: str) -> Optional[CacheEntry]:
+        """Return the stored CacheEntry for url (None if there is none) and mark it as recently used."""
+
+    @abstractmethod
+    def store(self, entry: CacheEntry) -> None:
+        """Store entry, replacing any entry with the same url."""
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Store the new validators and time of an entry whose body is unchanged."""
+        self.store(entry)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored entry."""
+
+    def open(self, url: str, session: Optional['requests.Session'] = None, stream: bool = False,
+             scheduler: Optional[RequestScheduler] = None) -> Union[CachedResponse, _RecordingResponse]:
+        """
+        Return a response for url, using the stored response whenever it is fresh or still valid.
+
+        :param url: url to pull
+        :param session: session to send any request with. If None, a one-off request is made
+        :param stream: do not download the body until it is read
+        :param scheduler: scheduler limiting and retrying any request. If None, the default_scheduler is used
+        """
+        entry = self.load(url)
+        if entry is not None and (self.offline or (self.ttl is not None and time.time() - entry.stored < self.ttl)):
+            self.stats.add(hits=1, bytes_saved=len(entry.body))
+            return CachedResponse(entry)
+        if self.offline:
+            raise CacheMissError(url)
+
+        headers = dict()
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        if scheduler is None:
+            scheduler = default_scheduler()
+        response = scheduler.get(url, session=session, headers=headers, stream=stream)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.stats.add(revalidated=1, bytes_saved=len(entry.body))
+            entry = entry._replace(stored=time.time(),
+                                   etag=response.headers.get('ETag', entry.etag),
+                                   last_modified=response.headers.get('Last-Modified', entry.last_modified))
+            self.refresh(entry)
+            return CachedResponse(entry)
+
+        self.stats.add(misses=1)
+        on_complete = None
+        if response.status_code == 200:
+            def on_complete(body: bytes) -> None:
+                self.stats.add(bytes_downloaded=len(body))
+                self.store(CacheEntry(url, body,
+                                      etag=response.headers.get('ETag'),
+                                      last_modified=response.headers.get('Last-Modified'),
+                                      encoding=response.encoding or response.apparent_encoding,
+                                      content_type=response.headers.get('Content-Type'),
+                                      stored=time.time()))
+        return _RecordingResponse(response, on_complete)
+
+
+class DiskCache(ResponseCache):
+    """
+    Cache of http responses stored as files in a directory.
+
+    Each entry is a body file plus a json file of its validators, named by the hash of its url.
+    When the bodies grow past max_size bytes, the least recently used entries are evicted.
+
+    Attributes:
+    directory - directory holding the cache files
+    max_size - most body bytes kept in the directory. If None, nothing is ever evicted
+    """
+
+    def __init__(self, directory: Union[PathLike, str], max_size: Optional[int] = 2 ** 30,
+                 ttl: Optional[float] = None, offline: bool = False):
+        super().__init__(ttl=ttl, offline=offline)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = Lock()
+        self._sizes = {path.stem: path.stat().st_size
+                       for path in self.directory.glob('*.body')}  # type: Dict[str, int]
+        self._total_size = sum(self._sizes.values())
+
+    def _paths(self, url: str) -> (Path, Path):
+        key = sha256(url.encode('utf-8')).hexdigest()
+        return self.directory / (key + '.body'), self.directory / (key + '.json')
+
+    def load(self, url: str) -> Optional[CacheEntry]:
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            body = body_path.read_bytes()
+            utime(body_path, None)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or len(body) != meta.get('size'):
+            return None
+        return CacheEntry(url, body, meta.get('etag'), meta.get('last_modified'), meta.get('encoding'),
+                          meta.get('content_type'), meta.get('stored', 0))
+
+    def store(self, entry: CacheEntry) -> None:
+        body_path, meta_path = self._paths(entry.url)
+        util.atomic_write(body_path, entry.body)
+        util.atomic_write(meta_path, _meta_json(entry))
+        with self._lock:
+            self.stats.add(stored=1)
+            self._total_size += len(entry.body) - self._sizes.get(body_path.stem, 0)
+            self._sizes[body_path.stem] = len(entry.body)
+            if self.max_size is not None and self._total_size > self.max_size:
+                self._evict(keep=body_path.stem)
+
+    def refresh(self, entry: CacheEntry) -> None:
+        _, meta_path = self._paths(entry.url)
+        util.atomic_write(meta_path, _meta_json(entry))
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used entries (but never keep) until the cache fits max_size."""
+        by_age = sorted(self._sizes, key=lambda key: _mtime(self.directory / (key + '.body')))
+        for key in by_age:
+            if self._total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            self._total_size -= self._sizes.pop(key)
+            self.stats.add(evicted=1)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._sizes:
+                self._remove(key)
+            self._sizes.clear()
+            self._total_size = 0
+
+    def _remove(self, key: str) -> None:
+        for suffix in ('.body', '.json'):
+            with suppress(FileNotFoundError):
+                (self.directory / (key + suffix)).unlink()
+
+    @property
+    def size(self) -> int:
+        """Return the total bytes of every stored body."""
+        return self._total_size
+
+
+def _meta_json(entry: CacheEntry) -> bytes:
+    meta = {field: getattr(entry, field) for field in CacheEntry._fields if field != 'body'}
+    meta['size'] = len(entry.body)
+    return json.dumps(meta).encode('utf-8')
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0
@@ -0,0 +1,162 @@
+"""
+Concurrently crawl many BrightSpot directory pages.
+
+Classes:
+Crawler - Fetch and process directory pages concurrently over one pooled session.
+CrawlResult - Employees (or the error) produced by a single directory url.
+
+"""
+
+from .cache import ResponseCache
+from .parallel import ParsePool
+from .scheduler import RequestScheduler
+from . import util
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .employee import Employee
+    import requests
+
+
+class CrawlResult(NamedTuple):
+    url: str
+    employees: List['Employee']
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the url was fetched and processed without an error."""
+        return self.error is None
+
+
+class Crawler:
+    """
+    Fetch and process many BrightSpot directory pages at once.
+
+    Every request goes through one keep-alive session, so connections are reused between pages.
+    At most limit pages are in flight overall, and at most per_host_limit per host.
+    With processes, pages are parsed in that many worker processes (see ParsePool) instead of in threads.
+    An error on one url is recorded for that url and never stops the others.
+
+    Attributes:
+    employee_cls - Employee (sub)class whose processor is used on every page
+    cache - cache responses are reused from and stored in (None for no caching)
+    scheduler - scheduler limiting and retrying every request (None for the default_scheduler)
+    parse_pool - ParsePool pages are parsed in (None to parse them in the fetching threads)
+    errors - exceptions from the last stream, keyed by url
+    """
+
+    def __init__(self, employee_cls: Optional[Type['Employee']] = None, limit: int = 10, per_host_limit: int = 4,
+                 session: Optional['requests.Session'] = None, cache: Optional[ResponseCache] = None,
+                 processes: Optional[int] = None, scheduler: Optional[RequestScheduler] = None):
+        if employee_cls is None:
+            from .employee import Employee
+            employee_cls = Employee
+        if session is None:
+            session = util.make_session(pool_connections=limit, pool_maxsize=per_host_limit)
+        self.employee_cls = employee_cls
+        self.limit = limit
+        self.per_host_limit = per_host_limit
+        self.session = session
+        self.cache = cache
+        self.scheduler = scheduler
+        self.parse_pool = ParsePool(employee_cls, processes) if processes else None
+        self.errors = dict()
+
+    def __enter__(self) -> 'Crawler':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close every pooled connection (and stop any worker processes)."""
+        self.session.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+
+    def process_url(self, url: str) -> List['Employee']:
+        """Return the Employee instances found at url (blocking). Raises requests.HTTPError on an error status."""
+        if self.parse_pool is not None:
+            with util.open_url(url, session=self.session, cache=self.cache,
+                               scheduler=self.scheduler) as response:
+                response.raise_for_status()
+                html_data = response.text
+            return self.parse_pool.parse(html_data)
+        tags = util.tag_iterator(url, kwargs={'class_': self.employee_cls.processor.super_container},
+                                 session=self.session, cache=self.cache, scheduler=self.scheduler)
+        return self.employee_cls.from_html_tags(tags)
+
+    async def crawl(self, urls: Iterable[str]) -> Dict[str, CrawlResult]:
+        """
+        Return a CrawlResult for every url, in the same order as urls.
+
+        :param urls: directory pages to pull all data from
+        """
+        urls = list(dict.fromkeys(urls))
+        results = dict()
+        async for url, employees, error in self._crawl(urls):
+            results[url] = CrawlResult(url, employees, error)
+        return {url: results[url] for url in urls}
+
+    async def stream(self, urls: Iterable[str]) -> AsyncIterator[Tuple[str, 'Employee']]:
+        """
+        Yield (url, Employee) pairs as soon as each url has been processed.
+        Errors are not raised, but stored in Crawler.errors
+
+        :param urls: directory pages to pull all data from
+        """
+        self.errors = dict()
+        async for url, employees, error in self._crawl(list(dict.fromkeys(urls))):
+            if error is not None:
+                self.errors[url] = error
+            for employee in employees:
+                yield url, employee
+
+    async def _crawl(self, urls: List[str]) -> AsyncIterator[Tuple[str, List['Employee'], Optional[BaseException]]]:
+        loop = asyncio.get_event_loop()
+        overall_limit = asyncio.Semaphore(self.limit)
+        host_limits = {host: asyncio.Semaphore(self.per_host_limit) for host in {urlsplit(url).netloc for url in urls}}
+
+        async def crawl_one(url: str) -> Tuple[str, List['Employee'], Optional[BaseException]]:
+            # the host slot first, so tasks queued behind a busy host never hold overall slots other hosts could use
+            async with host_limits[urlsplit(url).netloc], overall_limit:
+                try:
+                    return url, await loop.run_in_executor(executor, self.process_url, url), None
+                except Exception as error:
+                    return url, [], error
+
+        with ThreadPoolExecutor(max_workers=self.limit) as executor:
+            for future in asyncio.as_completed([crawl_one(url) for url in urls]):
+                yield await future
+
+    def run(self, urls: Iterable[str]) -> Dict[str, CrawlResult]:
+        """Blocking version of Crawler.crawl."""
+        return run_coroutine(self.crawl(urls))
+
+    def iter_run(self, urls: Iterable[str]) -> Iterator[Tuple[str, 'Employee']]:
+        """Blocking version of Crawler.stream."""
+        loop = asyncio.new_event_loop()
+        stream = self.stream(urls)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(stream.aclose())
+            loop.close()
+
+
+def run_coroutine(coroutine):
+    """Run coroutine to completion on a new event loop and return its result."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
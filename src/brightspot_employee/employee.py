@@ -8,20 +8,34 @@ EmployeeProcessor - Functions used to get BrightSpot brightspot_employee data.
 Constants:
 EmployeeAttributes - Expected fields in a named tuple for an Employee instance
 AlternateEmployeeAttributes - Alternate expected fields in a named tuple for an Employee instance
+PHOTO_STORE_NAME - directory (inside the photo directory) holding downloaded photo contents and their index
+CSV_BATCH_SIZE - rows written or read at a time by the streaming csv methods
 
 """
 
 from .room import Room
-from . import util
-
-from pandas import DataFrame, read_csv
-from bs4.element import Tag as BeautifulSoup_Tag
-import requests
+from .pool import WorkerPool, TaskResult
+from .extraction import ExtractionPlan, FIELD_METHODS
+from .cache import ResponseCache
+from .photos import PhotoDownloader, PhotoResult
+from .thumbnails import ThumbnailPool
+from .profile import Profile
+from .scheduler import RequestScheduler
+from . import profile as profiles
+from . import instrument, util
 
 from contextlib import suppress
-from typing import Iterable, List, Union, Optional, NamedTuple, TypeVar, Type
-from os import path, makedirs, PathLike
+from itertools import islice
+from typing import IO, Dict, Generator, Iterable, Iterator, List, Union, Optional, NamedTuple, Tuple, TypeVar, Type, TYPE_CHECKING
+from os import PathLike, linesep
 from pathlib import Path
+import csv
+import gzip
+
+if TYPE_CHECKING:
+    from .crawler import CrawlResult
+    from bs4.element import Tag as BeautifulSoup_Tag
+    from pandas import DataFrame
 
 
 class EmployeeAttributes(NamedTuple):
@@ -53,12 +67,16 @@ class EmployeeProcessor:
     Constants:
     NAME_SUFFIXES - name suffixes (such as jr.) for splitting first/last names.
     NON_EXISTENT - value returned for most fields that blank.
+    PROFILE_CONTAINER - css class prefix of the containers on a profile page.
+    PROFILE_FIELDS - css class suffix (after PROFILE_CONTAINER) of each profile field.
 
     """
 
     NAME_SUFFIXES = util.NAME_SUFFIXES[:]
     NON_EXISTENT = ''
     NAME_SEARCH_TEXT = '-title promo-title'
+    PROFILE_CONTAINER = 'ProfilePage'
+    PROFILE_FIELDS = {'email': '-email', 'bio': '-bio', 'office_hours': '-officeHours'}
 
     def __init__(self, container: str, super_container: Optional[str] = None):
         if super_container is None:
@@ -66,21 +84,40 @@ class EmployeeProcessor:
         self.container = container
         self.super_container = super_container
 
-    def process_job_title(self, tag: BeautifulSoup_Tag, search_text: str = '-jobTitle') -> str:
+    def compile(self) -> ExtractionPlan:
+        """
+        Return an ExtractionPlan that finds every field of a tag in one walk.
+        Fields whose process_* methods are overridden by a subclass are left to those methods
+        """
+        key = (self.container, self.NAME_SEARCH_TEXT)
+        plan = getattr(self, '_plan', None)
+        if plan is None or self._plan_key != key:
+            native_fields = (field for field, methods in FIELD_METHODS.items()
+                             if all(getattr(type(self), method) is getattr(EmployeeProcessor, method)
+                                    for method in methods))
+            self._plan = plan = ExtractionPlan(self, native_fields)
+            self._plan_key = key
+        return plan
+
+    def extract(self, tag: 'BeautifulSoup_Tag') -> EmployeeAttributes:
+        """Return every field found in tag, using this processor's compiled ExtractionPlan."""
+        return EmployeeAttributes(*self.compile().extract(tag))
+
+    def process_job_title(self, tag: 'BeautifulSoup_Tag', search_text: str = '-jobTitle') -> str:
         """Return the first job title found in tag."""
         job_title = tag.find(class_=(self.container + search_text))
         if job_title is None:
             return self.NON_EXISTENT
         return job_title.text
 
-    def process_department(self, tag: BeautifulSoup_Tag, search_text: str = '-groups') -> str:
+    def process_department(self, tag: 'BeautifulSoup_Tag', search_text: str = '-groups') -> str:
         """Return the first department found in tag."""
         department = tag.find(class_=(self.container + search_text))
         if department is None:
             return self.NON_EXISTENT
         return department.text
 
-    def process_telephone(self, tag: BeautifulSoup_Tag, search_text: str = '-phoneNumber') -> str:
+    def process_telephone(self, tag: 'BeautifulSoup_Tag', search_text: str = '-phoneNumber') -> str:
         """Return the first telephone number found in tag."""
         telephone_tag = tag.find(class_=(self.container + search_text))
         if telephone_tag is None:
@@ -88,59 +125,89 @@ class EmployeeProcessor:
         phone_ref = telephone_tag.find('a')['href']
         return util.remove_prefix(phone_ref, 'tel:')
 
-    def process_page_url(self, tag: BeautifulSoup_Tag, search_text: str = 'Link') -> str:
+    def process_page_url(self, tag: 'BeautifulSoup_Tag', search_text: str = 'Link') -> str:
         """Return the first hyperlinked url found in tag."""
         url = tag.find(class_=search_text)
         if url is None:
             return self.NON_EXISTENT
         return url['href']
 
+    def profile_classes(self) -> List[str]:
+        """Return the css classes of the profile page containers kept while parsing a profile page."""
+        return [self.PROFILE_CONTAINER + suffix for suffix in self.PROFILE_FIELDS.values()]
+
+    def process_profile(self, meta: Dict[str, str], containers: Dict[str, 'BeautifulSoup_Tag']) -> Dict[str, str]:
+        """
+        Return the fields of a profile page (see profile.parse_profile).
+        Override to add custom fields, adding to PROFILE_FIELDS to keep the containers they are read from
+
+        :param meta: content of every <head> meta tag of the page, by property (or name)
+        :param containers: first tag of the page with each class of profile_classes, by class
+        """
+        fields = dict()
+        for field, suffix in self.PROFILE_FIELDS.items():
+            tag = containers.get(self.PROFILE_CONTAINER + suffix)
+            if tag is None:
+                fields[field] = self.NON_EXISTENT
+                continue
+            link = tag.find('a', href=True)
+            if link is not None and link['href'].startswith('mailto:'):
+                fields[field] = util.remove_prefix(link['href'], 'mailto:')
+            else:
+                fields[field] = ' '.join(tag.get_text(' ').split())
+        return fields
+
     @staticmethod
-    def process_room_static(tag: BeautifulSoup_Tag) -> Room:
+    def process_room_static(tag: 'BeautifulSoup_Tag') -> Room:
         """Return the first room number found in tag, but static"""
         with suppress(AttributeError):
             room_text = tag.find('p').text.strip()
             return Room.from_string(room_text)
         return Room('', '', '')
 
-    def process_room(self, tag: BeautifulSoup_Tag) -> Room:
+    def process_room(self, tag: 'BeautifulSoup_Tag') -> Room:
         """Return the first room number found in tag."""
         return type(self).process_room_static(tag)
 
-    def process_first_name(self, tag: BeautifulSoup_Tag, search_text: Optional[str] = None) -> str:
+    def process_first_name(self, tag: 'BeautifulSoup_Tag', search_text: Optional[str] = None) -> str:
         """Return an estimation of the first name from tag"""
         first_name, _ = self.process_split_name(tag, search_text)
         return first_name
 
-    def process_last_name(self, tag: BeautifulSoup_Tag, search_text: Optional[str] = None) -> str:
+    def process_last_name(self, tag: 'BeautifulSoup_Tag', search_text: Optional[str] = None) -> str:
         """Return an estimation of the last name from tag"""
         _, last_name = self.process_split_name(tag, search_text)
         return last_name
 
-    def process_full_name(self, tag: BeautifulSoup_Tag, search_text: Optional[str] = NAME_SEARCH_TEXT) -> str:
+    def process_full_name(self, tag: 'BeautifulSoup_Tag', search_text: Optional[str] = NAME_SEARCH_TEXT) -> str:
         """Return the first brightspot_employee name found in tag."""
         if search_text is None:
             search_text = self.NAME_SEARCH_TEXT
         return tag.find(class_=(self.container + search_text)).find('a').text.replace(u'\xa0', u' ')
 
-    def process_split_name(self, tag: BeautifulSoup_Tag, search_text: Optional[str] = None) -> (str, str):
+    def process_split_name(self, tag: 'BeautifulSoup_Tag', search_text: Optional[str] = None) -> (str, str):
         """Return the estimated first and last names from the first brightspot_employee name found in tag"""
         full_name = self.process_full_name(tag, search_text)
         return util.split_name(full_name, self.NAME_SUFFIXES)
 
 
 E = TypeVar('E', bound='Employee')
+PHOTO_STORE_NAME = '.photos'
+CSV_BATCH_SIZE = 10000
 
 
 class Employee:
     """
     Store data for a BrightSpot brightspot_employee.
     Employee.processor must be set depending on the website being scraped from
+    Attributes are stored in __slots__; subclasses can set __slots__ = () to keep instances as small
+    profile is None until the profile page is fetched (see fetch_profile and fetch_profiles)
 
     Class Attributes:
     processor - class used for processing all brightspot_employee fields
     """
 
+    __slots__ = EmployeeAttributes._fields + ('profile',)
     processor = EmployeeProcessor('')
 
     def __init__(self, first_name: str, last_name: str, room_address: Room,
@@ -152,34 +219,75 @@ class Employee:
         self.telephone = telephone
         self.department = department
         self.job_title = job_title
+        self.profile = None  # type: Optional[Profile]
 
     def __str__(self) -> str:
-        return str(self.__dict__)
+        return str(self.as_dict())
 
     def __repr__(self) -> str:
         return str(self)
 
-    def download_photo(self, dir_path: Union[PathLike, str], file_name: Optional[str] = None) -> None:
+    def as_dict(self) -> dict:
+        """Return every attribute of this instance (including any set by subclasses) by name."""
+        attributes = {field: getattr(self, field) for field in EmployeeAttributes._fields}
+        attributes.update(getattr(self, '__dict__', ()))
+        return attributes
+
+    @instrument.timed('download_photo')
+    def download_photo(self, dir_path: Union[PathLike, str], file_name: Optional[str] = None,
+                       cache: Optional[ResponseCache] = None,
+                       downloader: Optional[PhotoDownloader] = None) -> PhotoResult:
         """
         Download full-resolution photo from page_url.
+        An unchanged photo that is already in dir_path is not downloaded again.
+        The photo url of profile is reused; without a profile, the profile page is fetched (see fetch_profile)
 
         :param dir_path: : location to store the image
         :param file_name: : name to give the image. If blank, will be saved as full_name.[jpg/png]
-        :return: None
+        :param cache: cache to reuse and store the page response in. If None, nothing is cached
+        :param downloader: PhotoDownloader to download the image with. If None, one storing into dir_path/.photos is used
+        :return: PhotoResult of the image
         """
-        tag = util.tag_iterator(self.page_url, args=('meta',), kwargs={'property': 'og:image:url'})
-        image_url = tag[0]['content']
-        img_request = requests.get(image_url)
+        profile = self.profile if self.profile is not None else self.fetch_profile(cache=cache)
+        image_url = profile.photo_url
+        if image_url is None:
+            raise LookupError(f'no og:image:url meta tag at {self.page_url}')
 
         if file_name is None:
             file_extension_buffer = 10
             file_name = self.full_name + Path(image_url[-file_extension_buffer:]).suffix
 
         dir_path = Path(dir_path)
-        makedirs(dir_path, exist_ok=True)
-        with open(path.join(dir_path, file_name), 'wb') as file:
-            for chunk in img_request.iter_content():
-                file.write(chunk)
+        if downloader is not None:
+            return downloader.download(image_url, dir_path / file_name)
+        with PhotoDownloader(dir_path / PHOTO_STORE_NAME) as downloader:
+            return downloader.download(image_url, dir_path / file_name)
+
+    def fetch_profile(self, cache: Optional[ResponseCache] = None,
+                      scheduler: Optional[RequestScheduler] = None) -> Profile:
+        """
+        Fetch the profile page at page_url, set profile to its Profile and return it.
+
+        :param cache: cache to reuse and store the page response in. If None, nothing is cached
+        :param scheduler: scheduler limiting and retrying the request. If None, the default_scheduler is used
+        """
+        self.profile = profiles.fetch_profile(self.page_url, self.processor, cache=cache, scheduler=scheduler)
+        return self.profile
+
+    @staticmethod
+    def fetch_profiles(employees: Iterable['Employee'], limit: int = 10, cache: Optional[ResponseCache] = None,
+                       scheduler: Optional[RequestScheduler] = None) -> Dict[str, TaskResult]:
+        """
+        Fetch the profile page of every employee concurrently, each distinct page_url once, and set their profiles.
+        A failed page does not stop the others (see profile.enrich)
+
+        :param employees: employees to fetch the profiles of. Employees without a page_url are skipped
+        :param limit: number of profile pages to fetch simultaneously
+        :param cache: cache to reuse and store the responses in. If None, nothing is cached
+        :param scheduler: scheduler limiting and retrying the requests. If None, the default_scheduler is used
+        :return: TaskResult (with the Profile or exception) of each page_url, keyed by page_url
+        """
+        return profiles.enrich(employees, limit=limit, cache=cache, scheduler=scheduler)
 
     @property
     def full_name(self) -> str:
@@ -190,22 +298,15 @@ class Employee:
         self.first_name, self.last_name = util.split_name(new_full_name, name_suffixes=self.processor.NAME_SUFFIXES)
 
     @classmethod
-    def from_html_tag(cls: Type[E], tag: BeautifulSoup_Tag) -> Type[E]:
+    @instrument.timed('from_html_tag')
+    def from_html_tag(cls: Type[E], tag: 'BeautifulSoup_Tag') -> Type[E]:
         """
         Create an Employee using a BeautifulSoup tag object.
 
         :param tag: : BeautifulSoup_Tag containing exactly one brightspot_employee's data
         :return: Employee instance
         """
-        first_name, last_name = cls.processor.process_split_name(tag)
-        return cls(first_name,
-                   last_name,
-                   cls.processor.process_room(tag),
-                   cls.processor.process_page_url(tag),
-                   cls.processor.process_telephone(tag),
-                   cls.processor.process_department(tag),
-                   cls.processor.process_job_title(tag)
-                   )
+        return cls(*cls.processor.extract(tag))
 
     @classmethod
     def from_named_tuple(cls: Type[E], kwargs: Union[EmployeeAttributes, AlternateEmployeeAttributes]) -> Type[E]:
@@ -229,58 +330,319 @@ class Employee:
                    kwargs.job_title)
 
     @staticmethod
-    def to_csv(file_path: Union[PathLike, str], employees: Iterable[Type[E]]) -> None:
+    @instrument.timed('to_csv')
+    def to_csv(file_path: Union[PathLike, str], employees: Iterable[Type[E]], append: bool = False,
+               first_index: int = 0) -> None:
         """
         Create a comma-seperated-values file at file_path.
+        Written with the csv module, in the same format as pandas.DataFrame.to_csv
+        (an unnamed index column, then one column for each field of EmployeeAttributes).
+        A file_path ending in .gz is gzip compressed (see write_csv_stream)
 
         :param file_path: : path to save the csv file to
         :param employees: Employee objects to be included in the file
+        :param append: add the employees as rows at the end of an existing csv file instead
+        :param first_index: index written for the first employee (the number of rows already in the file)
         """
-        dataframe = DataFrame.from_records((
-                                            {k: v
-                                                for k, v in p.__dict__.items()
-                                                if k in EmployeeAttributes._fields}
-                                            for p in employees))
-        dataframe.to_csv(Path(file_path))
+        Employee.write_csv_stream(file_path, employees, append=append, first_index=first_index)
 
     @staticmethod
-    def from_csv(file_path: Union[PathLike, str]) -> List[Type[E]]:
+    def write_csv_stream(file_path: Union[PathLike, str], employees: Iterable[Type[E]],
+                         batch_size: int = CSV_BATCH_SIZE, compression: Optional[str] = 'infer',
+                         append: bool = False, first_index: int = 0) -> int:
+        """
+        Write employees to a csv file (in the same format as to_csv) batch_size rows at a time.
+        employees may be any iterable, such as Employee.iter_website; only one batch is held in memory at once
+
+        :param file_path: : path to save the csv file to
+        :param employees: Employee objects to be included in the file
+        :param batch_size: rows taken from employees and written at a time
+        :param compression: 'gzip', None for an uncompressed file, or 'infer' for gzip if file_path ends in .gz
+        :param append: add the employees as rows at the end of an existing csv file instead
+        :param first_index: index written for the first employee (the number of rows already in the file)
+        :return: number of employees written
+        """
+        fields = EmployeeAttributes._fields
+        rows = 0
+        with _open_csv(file_path, 'a' if append else 'w', compression) as file:
+            writer = csv.writer(file, lineterminator=linesep)
+            if not append:
+                writer.writerow(('',) + fields)
+            for batch in util.chunk_iterator(batch_size, employees):
+                writer.writerows([index] + [_csv_value(getattr(employee, k)) for k in fields]
+                                 for index, employee in enumerate(batch, first_index + rows))
+                rows += len(batch)
+        instrument.count('csv_rows_written', rows)
+        return rows
+
+    @classmethod
+    def from_dataframe(cls: Type[E], dataframe: 'DataFrame') -> List[Type[E]]:
+        """
+        Create a list of Employee instances from the columns of a DataFrame.
+        Rooms and (if there are no first_name/last_name columns) full_name are parsed with vectorized
+        operations over whole columns; Employee instances are only built at the end
+
+        :param dataframe: : DataFrame with a column for each field of EmployeeAttributes or AlternateEmployeeAttributes
+        :return: list of Employee instances from the dataframe's rows
+        """
+        rooms = Room.parser.parse_column(dataframe['room'])
+        if 'first_name' in dataframe.columns and 'last_name' in dataframe.columns:
+            first_names, last_names = dataframe['first_name'].tolist(), dataframe['last_name'].tolist()
+        else:
+            first_names, last_names = util.split_name_column(dataframe['full_name'], cls.processor.NAME_SUFFIXES)
+        columns = (dataframe[field].tolist() for field in ('page_url', 'telephone', 'department', 'job_title'))
+        return [cls(*fields) for fields in zip(first_names, last_names, rooms, *columns)]
+
+    @staticmethod
+    @instrument.timed('from_csv')
+    def from_csv(file_path: Union[PathLike, str], chunksize: Optional[int] = None,
+                 engine: str = 'csv', compression: Optional[str] = 'infer') -> List[Type[E]]:
         """
         Create a list of Employee instances from a proper csv file.
         The csv file must contain every header/column that Employee uses for its attributes
 
         :param file_path: : path to load the csv file from
+        :param chunksize: rows parsed at a time, bounding the memory used while parsing. If None, all at once
+        :param engine: 'csv' to read the file with the csv module, or 'pandas' to read it with pandas.read_csv
+        (and parse its columns with vectorized operations)
+        :param compression: 'gzip', None for an uncompressed file, or 'infer' for gzip if file_path ends in .gz
         :return: list of Employee instances from the file's data
         """
-        dataframe = read_csv(Path(file_path), keep_default_na=False)
-        return [Employee.from_named_tuple(row) for row in dataframe.itertuples()]
+        employees = [employee for chunk in Employee.iter_csv_chunks(file_path, chunksize, engine, compression)
+                     for employee in chunk]
+        instrument.count('csv_rows_read', len(employees))
+        return employees
+
+    @staticmethod
+    def iter_csv(file_path: Union[PathLike, str], chunksize: int = CSV_BATCH_SIZE, engine: str = 'csv',
+                 compression: Optional[str] = 'infer') -> Iterator[Type[E]]:
+        """
+        Yield each Employee in a proper csv file, reading and parsing it chunksize rows at a time.
+        Memory use stays flat no matter how large the file is (see iter_csv_chunks)
+
+        :param file_path: : path to load the csv file from
+        :param chunksize: rows read and parsed at a time
+        :param engine: 'csv' to read the file with the csv module, or 'pandas' to read it with pandas.read_csv
+        :param compression: 'gzip', None for an uncompressed file, or 'infer' for gzip if file_path ends in .gz
+        """
+        rows = 0
+        for chunk in Employee.iter_csv_chunks(file_path, chunksize, engine, compression):
+            rows += len(chunk)
+            yield from chunk
+        instrument.count('csv_rows_read', rows)
+
+    @staticmethod
+    def iter_csv_chunks(file_path: Union[PathLike, str], chunksize: Optional[int] = CSV_BATCH_SIZE,
+                        engine: str = 'csv', compression: Optional[str] = 'infer') -> Iterator[List[Type[E]]]:
+        """
+        Yield lists of up to chunksize Employee instances from a proper csv file, reading it chunksize rows at a time.
+        Memory use stays bounded no matter how large the file is
+
+        :param file_path: : path to load the csv file from
+        :param chunksize: rows read, parsed and yielded at a time. If None, all rows are yielded as one list
+        :param engine: 'csv' to read the file with the csv module, or 'pandas' to read it with pandas.read_csv
+        :param compression: 'gzip', None for an uncompressed file, or 'infer' for gzip if file_path ends in .gz
+        """
+        if engine == 'pandas':
+            from pandas import read_csv
+            if chunksize is None:
+                yield Employee.from_dataframe(read_csv(Path(file_path), keep_default_na=False,
+                                                       compression=compression))
+                return
+            reader = read_csv(Path(file_path), keep_default_na=False, chunksize=chunksize, compression=compression)
+            try:  # TextFileReader is only a context manager from pandas 1.2
+                for dataframe in reader:
+                    yield Employee.from_dataframe(dataframe)
+            finally:
+                reader.close()
+            return
+        if engine != 'csv':
+            raise ValueError(f"engine must be 'csv' or 'pandas', not {engine!r}")
+        with _open_csv(file_path, 'r', compression) as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            make = _csv_row_reader(Employee, header)
+            while True:
+                employees = [make(row) for row in islice(reader, chunksize)]
+                if not employees:
+                    return
+                yield employees
 
     @classmethod
-    def from_website(cls: Type[E], url: str) -> List[Type[E]]:
+    @instrument.timed('from_website')
+    def from_website(cls: Type[E], url: str, cache: Optional[ResponseCache] = None) -> List[Type[E]]:
         """
         Return a list of Employee instances using data from the website at url.
         The url is only guaranteed to work at RELIGION_DIR_URL, the default url
 
         :param url: : webpage to pull all data from
+        :param cache: cache to reuse and store the response in. If None, nothing is cached
         :return: list of Employee instances from the url's data
         """
-        output = list()
-        for tag in util.tag_iterator(url, kwargs={'class_': cls.processor.super_container}):
-            with suppress(AttributeError):
-                output.append(cls.from_html_tag(tag))
-        return output
+        return cls.from_html_tags(util.tag_iterator(url, kwargs={'class_': cls.processor.super_container},
+                                                    cache=cache))
+
+    @classmethod
+    def from_html_tags(cls: Type[E], tags: Iterable['BeautifulSoup_Tag']) -> List[Type[E]]:
+        """
+        Return a list of Employee instances, one for each tag that contains an brightspot_employee's data.
+        Tags missing required fields are skipped
+
+        :param tags: : BeautifulSoup_Tags each containing exactly one brightspot_employee's data
+        :return: list of Employee instances from the tags
+        """
+        return list(cls.iter_html_tags(tags))
+
+    @classmethod
+    def iter_html_tags(cls: Type[E], tags: Iterable['BeautifulSoup_Tag']) -> Iterator[Type[E]]:
+        """
+        Yield an Employee instance for each tag that contains an brightspot_employee's data.
+        Tags missing required fields are skipped
+
+        :param tags: : BeautifulSoup_Tags each containing exactly one brightspot_employee's data
+        """
+        for tag in tags:
+            try:
+                employee = cls.from_html_tag(tag)
+            except AttributeError:
+                instrument.count('tags_dropped')
+                continue
+            yield employee
+
+    @classmethod
+    def iter_website(cls: Type[E], url: str, cache: Optional[ResponseCache] = None) -> Iterator[Type[E]]:
+        """
+        Yield Employee instances using data from the website at url, while the website is still downloading.
+        Yields the same employees as Employee.from_website, but parses the html incrementally
+        and only keeps the current brightspot_employee's tag in memory
+
+        :param url: : webpage to pull all data from
+        :param cache: cache to reuse and store the response in. If None, nothing is cached
+        """
+        yield from cls.iter_html_tags(util.iter_tags(url, class_=cls.processor.super_container, cache=cache))
+
+    @classmethod
+    def from_websites(cls: Type[E], urls: Iterable[str], limit: int = 10,
+                      per_host_limit: int = 4, cache: Optional[ResponseCache] = None,
+                      processes: Optional[int] = None) -> Dict[str, 'CrawlResult']:
+        """
+        Return the Employee instances of every website in urls, fetched concurrently.
+        Connections are pooled and kept alive. An error at one url does not stop the others
+
+        :param urls: : webpages to pull all data from
+        :param limit: number of webpages to fetch simultaneously
+        :param per_host_limit: number of webpages to fetch simultaneously from the same host
+        :param cache: cache to reuse and store the responses in. If None, nothing is cached
+        :param processes: number of worker processes to parse the webpages in (see ParsePool). cls must then be
+        defined at module level. If None, webpages are parsed in this process
+        :return: CrawlResult (employees or error) of each url, keyed by url
+        """
+        from .crawler import Crawler
+        with Crawler(cls, limit=limit, per_host_limit=per_host_limit, cache=cache, processes=processes) as crawler:
+            return crawler.run(urls)
+
+    @classmethod
+    def iter_websites(cls: Type[E], urls: Iterable[str], limit: int = 10, per_host_limit: int = 4,
+                      cache: Optional[ResponseCache] = None, processes: Optional[int] = None,
+                      errors: Optional[Dict[str, BaseException]] = None
+                      ) -> Generator[Tuple[str, Type[E]], None, Dict[str, BaseException]]:
+        """
+        Yield (url, Employee) pairs as soon as each website in urls has been fetched concurrently.
+        Websites that fail (including error statuses) are skipped; their exceptions are added to errors
+        and returned (as the value of the generator) once every website is done
+
+        :param urls: : webpages to pull all data from
+        :param limit: number of webpages to fetch simultaneously
+        :param per_host_limit: number of webpages to fetch simultaneously from the same host
+        :param cache: cache to reuse and store the responses in. If None, nothing is cached
+        :param processes: number of worker processes to parse the webpages in (see ParsePool). cls must then be
+        defined at module level. If None, webpages are parsed in this process
+        :param errors: dict the exception of each failed website is stored in, keyed by url
+        """
+        from .crawler import Crawler
+        if errors is None:
+            errors = dict()
+        with Crawler(cls, limit=limit, per_host_limit=per_host_limit, cache=cache, processes=processes) as crawler:
+            yield from crawler.iter_run(urls)
+            errors.update(crawler.errors)
+        return errors
 
     @staticmethod
     def download_all_photos(professors: Iterable['Employee'], dir_path: PathLike,
-                            thread_limit: int = 5) -> None:
+                            thread_limit: int = 5, timeout: Optional[float] = None,
+                            cache: Optional[ResponseCache] = None,
+                            thumbnails: Optional[ThumbnailPool] = None) -> List[TaskResult]:
         """
         Download each brightspot_employee's photo and save it in dir_path using the default naming
-        Uses multithreading
+        Uses a bounded pool of worker threads sharing one PhotoDownloader; a failed download does not stop the others
         Default naming uses Employee.full_name and the original file extension
 
         :param professors: : all employees to download photos for. Each must have a page_url
         :param dir_path: directory to store all the photos in
         :param thread_limit: number of photos to download simultaneously
+        :param timeout: seconds each download may run before it is abandoned, also used as the timeout of its
+        image requests. Abandoned downloads are not waited for
+        :param cache: cache to reuse and store the page responses in. If None, nothing is cached
+        :param thumbnails: pool each photo is submitted to as soon as it is saved (collect them with
+        ThumbnailPool.wait). If None, no thumbnails are made
+        :return: TaskResult (with any PhotoResult or exception) of each download, in the order of professors
         """
         functions = (prof.download_photo for prof in professors)
-        util.stepped_limited_multithread(functions, args=(dir_path,), limit=thread_limit)
+        if thumbnails is not None:
+            functions = (_then_thumbnails(function, thumbnails) for function in functions)
+        session = util.make_session(pool_maxsize=thread_limit)
+        request_timeout = dict() if timeout is None else {'timeout': timeout}
+        with PhotoDownloader(Path(dir_path) / PHOTO_STORE_NAME, session=session, **request_timeout) as downloader, \
+                WorkerPool(thread_limit) as pool:
+            return pool.map(functions, args=(dir_path,), kwargs={'cache': cache, 'downloader': downloader},
+                            timeout=timeout)
+
+
+def _then_thumbnails(download_photo, thumbnails: ThumbnailPool):
+    """Return download_photo, but submitting the saved photo to thumbnails before returning."""
+    def download_then_submit(*args, **kwargs) -> PhotoResult:
+        result = download_photo(*args, **kwargs)
+        thumbnails.submit(result.path)
+        return result
+    return download_then_submit
+
+
+def _open_csv(file_path: Union[PathLike, str], mode: str, compression: Optional[str] = 'infer') -> IO[str]:
+    """Open the csv file at file_path as text in mode ('r', 'w' or 'a'), gzip compressed if compression says so."""
+    file_path = Path(file_path)
+    if compression == 'infer':
+        compression = 'gzip' if file_path.suffix == '.gz' else None
+    if compression == 'gzip':
+        return gzip.open(file_path, mode + 't', newline='', encoding='utf-8')
+    if compression is not None:
+        raise ValueError(f"compression must be 'infer', 'gzip' or None, not {compression!r}")
+    return open(file_path, mode, newline='', encoding='utf-8')
+
+
+def _csv_value(value) -> str:
+    """Return value as written to a csv file by pandas (None as an empty cell)."""
+    return '' if value is None else str(value)
+
+
+def _csv_row_reader(cls: Type[E], header: List[str]):
+    """Return a function creating an instance of cls from a row of a csv file with the given header."""
+    column = {name: index for index, name in enumerate(header)}
+    room, page_url, telephone, department, job_title = (column[field] for field in
+                                                        ('room', 'page_url', 'telephone', 'department', 'job_title'))
+    parse_room = Room.parser.parse
+    if 'first_name' in column and 'last_name' in column:
+        first_name, last_name = column['first_name'], column['last_name']
+
+        def make(row: List[str]) -> E:
+            return cls(row[first_name], row[last_name], parse_room(row[room]), row[page_url], row[telephone],
+                       row[department], row[job_title])
+    else:
+        full_name = column['full_name']
+        name_suffixes = cls.processor.NAME_SUFFIXES
+
+        def make(row: List[str]) -> E:
+            return cls(*util.split_name(row[full_name], name_suffixes), parse_room(row[room]), row[page_url],
+                       row[telephone], row[department], row[job_title])
+    return make
@@ -0,0 +1,174 @@
+"""
+Single-pass extraction of every Employee field from a BeautifulSoup tag.
+
+Classes:
+ExtractionPlan - Compiled class lookups of an EmployeeProcessor, filled by one walk over a tag.
+
+Constants:
+FIELD_METHODS - process_* methods of EmployeeProcessor that each field relies on.
+CLASS_SUFFIXES - css class suffix (after the container) that each field is found by.
+
+"""
+
+from .room import Room
+from . import instrument, util
+
+from contextlib import suppress
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+import time
+
+if TYPE_CHECKING:
+    from bs4.element import Tag as BeautifulSoup_Tag
+
+FIELD_METHODS = {
+    'name': ('process_split_name', 'process_full_name'),
+    'room': ('process_room', 'process_room_static'),
+    'page_url': ('process_page_url',),
+    'telephone': ('process_telephone',),
+    'department': ('process_department',),
+    'job_title': ('process_job_title',),
+}
+CLASS_SUFFIXES = {
+    'telephone': '-phoneNumber',
+    'department': '-groups',
+    'job_title': '-jobTitle',
+}
+
+
+class ExtractionPlan:
+    """
+    Every css class lookup of an EmployeeProcessor, compiled so one walk over a tag finds them all.
+
+    Fields whose process_* method is overridden are not part of the walk;
+    the overriding method is called instead, so subclass behaviour is always honored.
+
+    Attributes:
+    processor - EmployeeProcessor the plan was compiled from
+    native_fields - fields found by the walk instead of by calling process_* methods
+    """
+
+    def __init__(self, processor, native_fields: Iterable[str]):
+        self.processor = processor
+        self.native_fields = frozenset(native_fields)
+        targets = dict()  # type: Dict[str, str]
+        for field in self.native_fields:
+            if field == 'name':
+                targets[field] = processor.container + processor.NAME_SEARCH_TEXT
+            elif field == 'page_url':
+                targets[field] = 'Link'
+            elif field != 'room':
+                targets[field] = processor.container + CLASS_SUFFIXES[field]
+
+        self._single_class = dict()  # type: Dict[str, List[str]]
+        self._multiple_classes = dict()  # type: Dict[str, List[str]]
+        for field, class_ in targets.items():
+            lookup = self._multiple_classes if ' ' in class_ else self._single_class
+            lookup.setdefault(class_, []).append(field)
+        self._wants_paragraph = 'room' in self.native_fields
+        self._wanted = len(targets) + self._wants_paragraph
+
+    def find(self, tag: 'BeautifulSoup_Tag') -> Dict[str, 'BeautifulSoup_Tag']:
+        """Return the first tag found for every native field, walking tag only once."""
+        found = dict()
+        single_class = self._single_class
+        multiple_classes = self._multiple_classes
+        for element in tag.descendants:
+            if element.name is None:
+                continue
+            if self._wants_paragraph and element.name == 'p' and 'room' not in found:
+                found['room'] = element
+            classes = element.get('class')
+            if classes:
+                if isinstance(classes, str):
+                    classes = classes.split()
+                for class_ in classes:
+                    for field in single_class.get(class_, ()):
+                        found.setdefault(field, element)
+                if multiple_classes:
+                    for field in multiple_classes.get(' '.join(classes), ()):
+                        found.setdefault(field, element)
+            if len(found) == self._wanted:
+                break
+        return found
+
+    def extract(self, tag: 'BeautifulSoup_Tag') -> Tuple[str, str, Room, str, str, str, str]:
+        """
+        Return (first_name, last_name, room, page_url, telephone, department, job_title) from tag.
+
+        Raises AttributeError when the name is missing, just like EmployeeProcessor.process_full_name.
+        While instrumentation is enabled, the walk and each field are reported as extract.* stages.
+        """
+        processor = self.processor
+        native = self.native_fields
+        lap = _Lap() if instrument.enabled() else None
+        found = self.find(tag)
+        non_existent = processor.NON_EXISTENT
+        if lap:
+            lap('find')
+
+        if 'name' in native:
+            full_name = found.get('name').find('a').text.replace(u'\xa0', u' ')
+            first_name, last_name = util.split_name(full_name, processor.NAME_SUFFIXES)
+        else:
+            first_name, last_name = processor.process_split_name(tag)
+        if lap:
+            lap('name')
+
+        if 'room' in native:
+            room = _room(found.get('room'))
+        else:
+            room = processor.process_room(tag)
+        if lap:
+            lap('room')
+
+        if 'page_url' in native:
+            page_url = found['page_url']['href'] if 'page_url' in found else non_existent
+        else:
+            page_url = processor.process_page_url(tag)
+        if lap:
+            lap('page_url')
+
+        if 'telephone' in native:
+            telephone = non_existent
+            if 'telephone' in found:
+                telephone = util.remove_prefix(found['telephone'].find('a')['href'], 'tel:')
+        else:
+            telephone = processor.process_telephone(tag)
+        if lap:
+            lap('telephone')
+
+        if 'department' in native:
+            department = found['department'].text if 'department' in found else non_existent
+        else:
+            department = processor.process_department(tag)
+        if lap:
+            lap('department')
+
+        if 'job_title' in native:
+            job_title = found['job_title'].text if 'job_title' in found else non_existent
+        else:
+            job_title = processor.process_job_title(tag)
+        if lap:
+            lap('job_title')
+
+        return first_name, last_name, room, page_url, telephone, department, job_title
+
+
+class _Lap:
+    """Report the time since the previous lap (or creation) as the stage extract.<field>."""
+    __slots__ = ('last',)
+
+    def __init__(self):
+        self.last = time.perf_counter()
+
+    def __call__(self, field: str) -> None:
+        now = time.perf_counter()
+        instrument.report_timing('extract.' + field, now - self.last)
+        self.last = now
+
+
+def _room(paragraph: Optional['BeautifulSoup_Tag']) -> Room:
+    """Return the Room in paragraph, like EmployeeProcessor.process_room_static."""
+    with suppress(AttributeError):
+        return Room.from_string(paragraph.text.strip())
+    return Room('', '', '')
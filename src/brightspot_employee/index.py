@@ -0,0 +1,245 @@
+"""
+In-memory indexes for fast, repeated lookups over scraped employees.
+
+Classes:
+EmployeeIndex - Prefix search on names and exact lookups on other fields, updated incrementally.
+
+Constants:
+NAME_FIELDS - fields searchable by (case-insensitive) prefix
+HASH_FIELDS - fields with an exact-match index
+
+"""
+
+from .employee import Employee
+from .room import Room
+
+from os.path import commonprefix
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import re
+
+NAME_FIELDS = ('first_name', 'last_name', 'full_name')
+HASH_FIELDS = ('department', 'job_title', 'building', 'floor', 'telephone')
+_NON_DIGITS = re.compile(r'\D+')
+
+
+class _TrieNode:
+    """
+    Node of a radix trie: edges maps the first character of each edge label to (label, child),
+    and ids lists the ids of every record whose key ends at this node.
+    """
+    __slots__ = ('edges', 'ids')
+
+    def __init__(self):
+        self.edges = None  # type: Optional[Dict[str, Tuple[str, _TrieNode]]]
+        self.ids = None  # type: Optional[List[int]]
+
+
+class _PrefixTrie:
+    """Radix trie from (normalized) keys to record ids, supporting prefix searches."""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, key: str, record_id: int) -> None:
+        node = self.root
+        while key:
+            if node.edges is None:
+                node.edges = dict()
+            edge = node.edges.get(key[0])
+            if edge is None:
+                child = _TrieNode()
+                node.edges[key[0]] = (key, child)
+                node, key = child, ''
+                break
+            label, child = edge
+            common = len(label) if key.startswith(label) else len(commonprefix((label, key)))
+            if common < len(label):
+                middle = _TrieNode()
+                middle.edges = {label[common]: (label[common:], child)}
+                node.edges[key[0]] = (label[:common], middle)
+                child = middle
+            node, key = child, key[common:]
+        if node.ids is None:
+            node.ids = []
+        node.ids.append(record_id)
+
+    def remove(self, key: str, record_id: int) -> None:
+        path = [(self.root, '')]
+        node = self.root
+        while key:
+            label, node = node.edges[key[0]]
+            path.append((node, label))
+            key = key[len(label):]
+        node.ids.remove(record_id)
+        if not node.ids:
+            node.ids = None
+        # drop nodes left without records or edges
+        for (child, label), (parent, _) in zip(reversed(path), reversed(path[:-1])):
+            if child.ids or child.edges:
+                break
+            del parent.edges[label[0]]
+            if not parent.edges:
+                parent.edges = None
+
+    def search(self, prefix: str) -> Iterator[int]:
+        """Yield the id of every record whose key starts with prefix."""
+        node = self.root
+        while prefix:
+            edge = node.edges.get(prefix[0]) if node.edges else None
+            if edge is None:
+                return
+            label, child = edge
+            if prefix.startswith(label):
+                prefix = prefix[len(label):]
+            elif not label.startswith(prefix):
+                return
+            else:
+                prefix = ''
+            node = child
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.ids:
+                yield from node.ids
+            if node.edges:
+                stack.extend(child for _, child in node.edges.values())
+
+
+class EmployeeIndex:
+    """
+    Index employees (such as those returned by Employee.from_website) for lookups faster than scanning a list.
+
+    Names are searched by case-insensitive prefix through a radix trie for each of NAME_FIELDS.
+    Names are indexed as split by the employee's processor (util.split_name), so a suffix such as Jr. stays
+    with the last name. Each of HASH_FIELDS has a hash index for exact lookups and grouping;
+    building and floor come from each employee's Room, and telephones are matched by their digits alone.
+    Every lookup returns employees in the order they were added.
+
+    Employees are indexed by identity: remove takes the same instance that was added,
+    and an employee changed while indexed must be removed and added again.
+    """
+
+    def __init__(self, employees: Iterable[Employee] = ()):
+        self._employees = dict()  # type: Dict[int, Employee]
+        self._record_ids = dict()  # type: Dict[int, int]
+        self._next_id = 0
+        self._tries = {field: _PrefixTrie() for field in NAME_FIELDS}
+        self._hashes = {field: dict() for field in HASH_FIELDS}  # type: Dict[str, Dict[str, Set[int]]]
+        self.update(employees)
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __iter__(self) -> Iterator[Employee]:
+        return iter(list(self._employees.values()))
+
+    def __contains__(self, employee: Employee) -> bool:
+        return id(employee) in self._record_ids
+
+    def add(self, employee: Employee) -> None:
+        """Index employee. Adding an employee that is already indexed does nothing."""
+        if id(employee) in self._record_ids:
+            return
+        record_id = self._next_id
+        self._next_id += 1
+        self._employees[record_id] = employee
+        self._record_ids[id(employee)] = record_id
+        for field, key in _name_keys(employee):
+            self._tries[field].insert(key, record_id)
+        for field, key in _hash_keys(employee):
+            self._hashes[field].setdefault(key, set()).add(record_id)
+
+    def update(self, employees: Iterable[Employee]) -> None:
+        """Index every employee in employees."""
+        for employee in employees:
+            self.add(employee)
+
+    def remove(self, employee: Employee) -> None:
+        """
+        Stop indexing employee.
+
+        :raises KeyError: if employee is not indexed
+        """
+        record_id = self._record_ids.pop(id(employee))
+        del self._employees[record_id]
+        for field, key in _name_keys(employee):
+            self._tries[field].remove(key, record_id)
+        for field, key in _hash_keys(employee):
+            ids = self._hashes[field][key]
+            ids.discard(record_id)
+            if not ids:
+                del self._hashes[field][key]
+
+    def search(self, prefix: str, field: Optional[str] = None) -> List[Employee]:
+        """
+        Return every employee with a name starting with prefix (ignoring case and repeated whitespace).
+
+        :param prefix: start of the name
+        :param field: one of NAME_FIELDS to search. If None, searches all of them
+        """
+        prefix = _normalize_name(prefix, strip=False)
+        fields = NAME_FIELDS if field is None else (_check_field(field, NAME_FIELDS),)
+        record_ids = set()
+        for name in fields:
+            record_ids.update(self._tries[name].search(prefix))
+        return self._sorted(record_ids)
+
+    def lookup(self, field: str, value: Union[str, int]) -> List[Employee]:
+        """
+        Return every employee whose field equals value.
+
+        :param field: one of HASH_FIELDS
+        :param value: value to match (telephones are compared by their digits alone)
+        """
+        field = _check_field(field, HASH_FIELDS)
+        return self._sorted(self._hashes[field].get(_hash_key(field, value), ()))
+
+    def by_room(self, building: str, floor: Optional[Union[str, int]] = None) -> List[Employee]:
+        """Return every employee in building (and on floor, if given)."""
+        record_ids = self._hashes['building'].get(_hash_key('building', building), set())
+        if floor is not None:
+            record_ids = record_ids & self._hashes['floor'].get(_hash_key('floor', floor), set())
+        return self._sorted(record_ids)
+
+    def group_by(self, field: str) -> Dict[str, List[Employee]]:
+        """Return the employees with each distinct value of field (one of HASH_FIELDS), in order of value."""
+        field = _check_field(field, HASH_FIELDS)
+        return {value: self._sorted(record_ids) for value, record_ids in sorted(self._hashes[field].items())}
+
+    def _sorted(self, record_ids: Iterable[int]) -> List[Employee]:
+        return [self._employees[record_id] for record_id in sorted(record_ids)]
+
+
+def _normalize_name(name: str, strip: bool = True) -> str:
+    """Return name in lower case with runs of whitespace replaced by one space (kept at the end unless strip)."""
+    name = str(name)
+    normalized = ' '.join(name.split()).casefold()
+    if not strip and normalized and name[-1:].isspace():
+        normalized += ' '
+    return normalized
+
+
+def _name_keys(employee: Employee) -> Iterator[Tuple[str, str]]:
+    for field in NAME_FIELDS:
+        yield field, _normalize_name(getattr(employee, field))
+
+
+def _hash_key(field: str, value: Union[str, int]) -> str:
+    if field == 'telephone':
+        return _NON_DIGITS.sub('', str(value))
+    return str(value)
+
+
+def _hash_keys(employee: Employee) -> Iterator[Tuple[str, str]]:
+    room = employee.room if isinstance(employee.room, Room) else Room.from_string(str(employee.room))
+    yield 'department', _hash_key('department', employee.department)
+    yield 'job_title', _hash_key('job_title', employee.job_title)
+    yield 'building', _hash_key('building', room.building)
+    yield 'floor', _hash_key('floor', room.floor)
+    yield 'telephone', _hash_key('telephone', employee.telephone)
+
+
+def _check_field(field: str, fields: Tuple[str, ...]) -> str:
+    if field not in fields:
+        raise ValueError(f'{field!r} is not one of {", ".join(fields)}')
+    return field
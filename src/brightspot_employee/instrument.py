@@ -0,0 +1,217 @@
+"""
+Optional instrumentation of the scraping pipeline: per-stage timings, counters and tracing callbacks.
+
+Nothing is measured until a listener is registered; until then every hook returns after one check,
+so instrumented code runs at (nearly) its uninstrumented speed.
+
+Classes:
+Event - One timing or counter increment, as passed to listeners.
+Metrics - Listener accumulating every event into counters and timing totals.
+TimingStats - Number, total, minimum and maximum of the timings of one stage.
+
+Functions:
+add_listener - Call a function with every future Event.
+remove_listener - Stop calling a function added with add_listener.
+enabled - Return True if any listener is registered.
+timer - Context manager reporting how long its block took.
+timed - Decorator reporting how long each call of a function took.
+count - Report a counter increment.
+report_timing - Report how long a stage took.
+
+Constants:
+STAGES - names of the timings reported by brightspot_employee
+COUNTERS - names of the counters reported by brightspot_employee
+
+"""
+
+from functools import wraps
+from threading import Lock
+from typing import Callable, Dict, List, NamedTuple
+import time
+
+STAGES = {
+    'fetch': 'requesting a directory page and reading its body (util.tag_iterator)',
+    'parse': 'finding the employee tags in a page (util.tag_iterator)',
+    'from_website': 'all of Employee.from_website',
+    'from_html_tag': 'creating one Employee from its tag',
+    'extract.find': 'the walk over a tag finding every field (part of from_html_tag)',
+    'extract.<field>': 'reading one field (name, room, page_url, telephone, department or job_title) of a tag',
+    'download_photo': 'all of Employee.download_photo, including any profile page request',
+    'profile': 'fetching and parsing one profile page (profile.fetch_profile)',
+    'to_csv': 'Employee.to_csv',
+    'from_csv': 'Employee.from_csv',
+    'request_wait': 'waiting for the rate and concurrency limits of a host (RequestScheduler.get)',
+}
+COUNTERS = {
+    'page_bytes_fetched': 'bytes of directory page bodies read (from the network or a cache)',
+    'photo_bytes_fetched': 'bytes of photos downloaded',
+    'tags_found': 'employee tags found in directory pages',
+    'tags_dropped': 'tags skipped by Employee.from_html_tags because a required field was missing',
+    'csv_rows_written': 'employees written by Employee.to_csv',
+    'csv_rows_read': 'employees read by Employee.from_csv',
+    'requests_retried': 'requests sent again by RequestScheduler.get after an error or a retryable status',
+}
+
+
+class Event(NamedTuple):
+    kind: str  # 'timing' (value in seconds) or 'count'
+    name: str
+    value: float
+    labels: dict
+
+
+Listener = Callable[[Event], None]
+_listeners = []  # type: List[Listener]
+_listeners_lock = Lock()
+
+
+def add_listener(listener: Listener) -> None:
+    """Call listener with every Event reported from now on (from any thread)."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + [listener]
+
+
+def remove_listener(listener: Listener) -> None:
+    """Stop calling listener, which was added with add_listener."""
+    global _listeners
+    with _listeners_lock:
+        _listeners = [registered for registered in _listeners if registered != listener]
+
+
+def enabled() -> bool:
+    """Return True if any listener is registered (so events are being reported)."""
+    return bool(_listeners)
+
+
+def _emit(event: Event) -> None:
+    for listener in _listeners:
+        listener(event)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Report that the counter name increased by value."""
+    if _listeners:
+        _emit(Event('count', name, value, labels))
+
+
+def report_timing(name: str, seconds: float, **labels) -> None:
+    """Report that the stage name took seconds."""
+    if _listeners:
+        _emit(Event('timing', name, seconds, labels))
+
+
+class _Timer:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        report_timing(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, **labels):
+    """
+    Return a context manager reporting how long its block took as the stage name
+    (including blocks that raise). Does nothing while no listener is registered.
+    """
+    if _listeners:
+        return _Timer(name, labels)
+    return _NULL_TIMER
+
+
+def timed(name: str) -> Callable:
+    """Decorate a function so each call is reported as the stage name."""
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _listeners:
+                return function(*args, **kwargs)
+            with _Timer(name, dict()):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TimingStats(NamedTuple):
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float('inf')
+    maximum: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, seconds: float) -> 'TimingStats':
+        return TimingStats(self.count + 1, self.total + seconds, min(self.minimum, seconds),
+                           max(self.maximum, seconds))
+
+
+class Metrics:
+    """
+    Listener summing every counter and timing it is called with (see STAGES and COUNTERS).
+
+    Use it as a context manager to listen only within a block:
+
+        with instrument.Metrics() as metrics:
+            Employee.from_website(url)
+        print(metrics.timings['fetch'].total, metrics.counters['tags_dropped'])
+
+    Attributes:
+    counters - total of each counter, by name
+    timings - TimingStats of each stage, by name
+    """
+
+    def __init__(self):
+        self.counters = dict()  # type: Dict[str, float]
+        self.timings = dict()  # type: Dict[str, TimingStats]
+        self._lock = Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if event.kind == 'count':
+                self.counters[event.name] = self.counters.get(event.name, 0) + event.value
+            else:
+                self.timings[event.name] = self.timings.get(event.name, TimingStats()).add(event.value)
+
+    def __enter__(self) -> 'Metrics':
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_listener(self)
+
+    def as_dict(self) -> dict:
+        """Return every counter and timing (count, total, mean, minimum and maximum seconds) by name."""
+        with self._lock:
+            return {'counters': dict(self.counters),
+                    'timings': {name: dict(stats._asdict(), mean=stats.mean)
+                                for name, stats in self.timings.items()}}
+
+    def __str__(self) -> str:
+        """Return one readable line for every timing and counter."""
+        with self._lock:
+            lines = [f'{stage}: {stats.count} x {stats.mean * 1e3:.3f} ms = {stats.total:.3f} s'
+                     for stage, stats in sorted(self.timings.items())]
+            lines.extend(f'{counter}: {value:g}' for counter, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
@@ -0,0 +1,165 @@
+"""
+Merge the employees of many scraped directories into one record per person, in linear time.
+
+Classes:
+MergedEmployee - One merged employee and the directory urls it was found at.
+
+Functions:
+identity_key - Return the key identifying the person an employee is.
+merge - Merge lists of employees scraped from several directories.
+merge_pairs - Merge (directory url, Employee) pairs, such as those yielded by Employee.iter_websites.
+prefer_non_empty - Field resolver keeping the current value unless it is empty.
+prefer_longest - Field resolver keeping the longer of two values.
+prefer_complete_room - Field resolver keeping the room with more of its parts filled in.
+
+Constants:
+DEFAULT_RESOLVERS - field resolver used for each field when merge is given none
+
+"""
+
+from .employee import Employee, EmployeeAttributes
+from .room import Room
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+import re
+
+FIELDS = EmployeeAttributes._fields
+_URL_PATTERN = re.compile(r'(?:[a-z][a-z\d+.-]*:)?(?://(?:www\.)?([^/?#]*))?([^?#]*)', re.IGNORECASE)
+_NON_DIGITS = re.compile(r'\D')
+Resolver = Callable[[Any, Any], Any]
+
+
+class MergedEmployee(NamedTuple):
+    employee: Employee
+    sources: Tuple[str, ...]  # directory urls the employee was found at, in the order they were merged
+
+
+def _normalize_url(page_url: str) -> str:
+    """Return page_url without its scheme, www., query, fragment and trailing slash, with its host in lowercase."""
+    host, path = _URL_PATTERN.match(page_url.strip()).groups()
+    return (host or '').lower() + (path.rstrip('/') or '/')
+
+
+def _name_key(employee: Employee) -> str:
+    name = ' '.join(employee.full_name.split()).casefold()
+    return 'name:' + name + '|' + _NON_DIGITS.sub('', str(employee.telephone))
+
+
+def identity_key(employee: Employee) -> str:
+    """
+    Return the key identifying the person employee is: its normalized page_url,
+    or (without a page_url) its case- and whitespace-normalized full name and the digits of its telephone
+    """
+    if employee.page_url:
+        return 'url:' + _normalize_url(employee.page_url)
+    return _name_key(employee)
+
+
+def _empty(value) -> bool:
+    return value is None or not str(value).strip()
+
+
+def prefer_non_empty(current, candidate):
+    """Keep current, unless it is empty and candidate is not."""
+    return candidate if _empty(current) and not _empty(candidate) else current
+
+
+def prefer_longest(current, candidate):
+    """Keep the longer of current and candidate (current if they are as long)."""
+    return candidate if len(str(candidate).strip()) > len(str(current).strip()) else current
+
+
+def _room_parts(room) -> int:
+    if isinstance(room, Room):
+        return sum(not _empty(part) for part in (room.building, room.floor, room.rm_num, room.rm_letter))
+    return 0 if _empty(room) else 1
+
+
+def prefer_complete_room(current, candidate):
+    """Keep the room with more of its building, floor, number and letter filled in (current if they tie)."""
+    return candidate if _room_parts(candidate) > _room_parts(current) else current
+
+
+DEFAULT_RESOLVERS = dict({field: prefer_non_empty for field in FIELDS}, room=prefer_complete_room)
+
+
+class _Entry:
+    __slots__ = ('employee', 'sources', 'has_url')
+
+    def __init__(self, employee: Employee, source: str):
+        self.employee = employee
+        self.sources = [source]
+        self.has_url = bool(employee.page_url)
+
+
+def _copy(employee: Employee) -> Employee:
+    copy = type(employee)(*(getattr(employee, field) for field in FIELDS))
+    copy.profile = employee.profile
+    return copy
+
+
+def merge_pairs(pairs: Iterable[Tuple[str, Employee]],
+                resolvers: Optional[Mapping[str, Resolver]] = None) -> List[MergedEmployee]:
+    """
+    Merge every (directory url, Employee) pair into one MergedEmployee per person (see identity_key).
+
+    Employees with a page_url are matched by it. Employees without one are matched by name and telephone,
+    also to an employee with a page_url found with the same name and telephone.
+    Each field of a merged employee is resolved from the values it was found with, in order,
+    by resolvers[field](current value, new value). The employees passed in are never modified
+
+    :param pairs: directory url and employee found there, such as the pairs yielded by Employee.iter_websites
+    :param resolvers: resolver of each field. Fields without one use DEFAULT_RESOLVERS
+    :return: MergedEmployee of each person, in the order they were first found
+    """
+    resolvers = dict(DEFAULT_RESOLVERS, **(resolvers or dict()))
+    field_resolvers = [(field, resolvers[field]) for field in FIELDS]
+    entries = dict()  # type: Dict[str, _Entry]
+    by_name = dict()  # type: Dict[str, _Entry]
+    merged_employees = []  # type: List[_Entry]
+
+    for source, employee in pairs:
+        key = identity_key(employee)
+        name_key = _name_key(employee)
+        named = bool(employee.full_name.strip())  # nameless employees without a page_url are never matched
+        entry = entries.get(key) if employee.page_url or named else None
+        if entry is None and named:
+            entry = by_name.get(name_key)
+            if entry is not None and entry.has_url and employee.page_url:
+                entry = None  # another page_url is another person
+
+        if entry is None:
+            entry = _Entry(_copy(employee), source)
+            merged_employees.append(entry)
+        else:
+            entry.has_url = entry.has_url or bool(employee.page_url)
+            if source not in entry.sources:
+                entry.sources.append(source)
+            merged = entry.employee
+            for field, resolve in field_resolvers:
+                current = getattr(merged, field)
+                resolved = resolve(current, getattr(employee, field))
+                if resolved is not current:
+                    setattr(merged, field, resolved)
+            if merged.profile is None:
+                merged.profile = employee.profile
+        entries.setdefault(key, entry)
+        if named:
+            by_name.setdefault(name_key, entry)
+
+    return [MergedEmployee(entry.employee, tuple(entry.sources)) for entry in merged_employees]
+
+
+def merge(directories: Mapping[str, Iterable[Employee]],
+          resolvers: Optional[Mapping[str, Resolver]] = None) -> List[MergedEmployee]:
+    """
+    Merge the employees of every directory into one MergedEmployee per person (see merge_pairs).
+    Earlier directories win ties between conflicting values
+
+    :param directories: employees found at each directory url,
+    such as {url: result.employees for url, result in Employee.from_websites(urls).items()}
+    :param resolvers: resolver of each field. Fields without one use DEFAULT_RESOLVERS
+    :return: MergedEmployee of each person, in the order they were first found
+    """
+    return merge_pairs(((source, employee) for source, employees in directories.items() for employee in employees),
+                       resolvers)
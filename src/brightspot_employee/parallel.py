@@ -0,0 +1,103 @@
+"""
+Parse directory pages in worker processes, so html parsing and field extraction use every core.
+
+Classes:
+ParsePool - Process pool turning raw page bodies into Employee instances.
+
+Functions:
+parse_page - Return a compact record of every employee found in a page body (run in the workers).
+to_employees - Create Employee instances from records returned by parse_page.
+
+"""
+
+from .room import Room
+from . import util
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from os import cpu_count
+from typing import Iterable, Iterator, List, Optional, Tuple, Type, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .employee import Employee, EmployeeProcessor
+
+# (first_name, last_name, (building, floor, rm_num, rm_letter), page_url, telephone, department, job_title)
+EmployeeRecord = Tuple[str, str, Tuple[str, str, str, str], str, str, str, str]
+
+
+def parse_page(employee_cls: Type['Employee'], html_data: str,
+               processor: Optional['EmployeeProcessor'] = None) -> List[EmployeeRecord]:
+    """
+    Return a record of every employee in html_data, found with employee_cls.from_html_tag.
+    Records are plain tuples of strings, so they are cheap to send back from a worker process
+
+    :param employee_cls: Employee (sub)class whose from_html_tag is used. Must be defined at module level
+    :param html_data: html text of a directory page
+    :param processor: EmployeeProcessor matching the page, set as employee_cls.processor before parsing
+    (a worker process only sees the processor employee_cls is defined with). If None, employee_cls.processor is used
+    """
+    if processor is not None and processor is not employee_cls.processor:
+        employee_cls.processor = processor
+    tags = util.find_tags(html_data, kwargs={'class_': employee_cls.processor.super_container})
+    return [_record(employee) for employee in employee_cls.iter_html_tags(tags)]
+
+
+def to_employees(employee_cls: Type['Employee'], records: Iterable[EmployeeRecord]) -> List['Employee']:
+    """Return an instance of employee_cls for each record returned by parse_page (rooms are shared, see Room)."""
+    intern = Room.parser.intern
+    return [employee_cls(first_name, last_name, intern(*room), *fields)
+            for first_name, last_name, room, *fields in records]
+
+
+def _record(employee: 'Employee') -> EmployeeRecord:
+    room = employee.room if isinstance(employee.room, Room) else Room.from_string(str(employee.room))
+    return (employee.first_name, employee.last_name,
+            (str(room.building), str(room.floor), str(room.rm_num), str(room.rm_letter)),
+            employee.page_url, employee.telephone, employee.department, employee.job_title)
+
+
+class ParsePool:
+    """
+    Parse directory pages with employee_cls.from_html_tag in a pool of worker processes.
+
+    Page bodies are sent to the workers as text, and the employees come back as compact records
+    (never as BeautifulSoup trees), which are turned into employee_cls instances in this process.
+    employee_cls (and its processor's class) must be defined at module level, so the workers can import them.
+    employee_cls.processor itself is sent with every page, so a processor assigned at runtime is used
+    whatever the start method of the workers (pass mp_context to choose it, from Python 3.7).
+
+    Attributes:
+    employee_cls - Employee (sub)class whose processor is used on every page
+    processes - number of worker processes
+    """
+
+    def __init__(self, employee_cls: Type['Employee'], processes: Optional[int] = None,
+                 mp_context: Optional[BaseContext] = None):
+        self.employee_cls = employee_cls
+        self.processes = processes or cpu_count() or 1
+        context = dict() if mp_context is None else {'mp_context': mp_context}  # mp_context needs Python 3.7
+        self._executor = ProcessPoolExecutor(max_workers=self.processes, **context)
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for every submitted page, then stop the worker processes."""
+        self._executor.shutdown(wait=True)
+
+    def submit(self, html_data: str) -> 'Future[List[EmployeeRecord]]':
+        """Start parsing html_data in a worker and return a Future of its records (see to_employees)."""
+        return self._executor.submit(parse_page, self.employee_cls, html_data, self.employee_cls.processor)
+
+    def parse(self, html_data: str) -> List['Employee']:
+        """Return the employees in html_data, parsed in a worker process (blocking)."""
+        return to_employees(self.employee_cls, self.submit(html_data).result())
+
+    def map(self, pages: Iterable[str]) -> Iterator[List['Employee']]:
+        """Yield the employees of each page in pages, in order, while the workers parse the later pages."""
+        futures = [self.submit(html_data) for html_data in pages]
+        for future in futures:
+            yield to_employees(self.employee_cls, future.result())
@@ -0,0 +1,241 @@
+"""
+High-throughput photo downloads: large-chunk streaming, skip-unchanged, resume and content-addressed storage.
+
+Classes:
+PhotoDownloader - Download photos over a shared session into content-addressed storage.
+PhotoResult - What happened to a single photo.
+
+"""
+
+from .scheduler import RequestScheduler, default_scheduler
+from . import instrument, util
+
+from contextlib import suppress
+from hashlib import sha256
+from os import PathLike, link, replace
+from pathlib import Path
+from shutil import copyfile
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Union, TYPE_CHECKING
+import json
+import re
+import time
+
+if TYPE_CHECKING:
+    import requests
+
+DOWNLOAD_CHUNK_SIZE = 2 ** 20
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-')
+
+
+class PhotoResult(NamedTuple):
+    path: Path
+    downloaded: bool = False
+    deduplicated: bool = False
+    size: int = 0
+
+
+class _Interrupted(IOError):
+    """Raised when a response ends early, or cannot be appended to what was already downloaded."""
+
+
+class _Partial:
+    """A photo being written to a temporary file, possibly over several (resumed) requests."""
+
+    def __init__(self, file_path: Path):
+        self.file = NamedTemporaryFile('wb', dir=file_path.parent, prefix='.', suffix='.part', delete=False)
+        self.path = Path(self.file.name)
+        self.restart()
+
+    def restart(self) -> None:
+        self.file.seek(0)
+        self.file.truncate()
+        self.hasher = sha256()
+        self.written = 0
+        self.etag = None  # type: Optional[str]
+        self.last_modified = None  # type: Optional[str]
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self.hasher.update(chunk)
+        self.written += len(chunk)
+
+
+class PhotoDownloader:
+    """
+    Download photos in large chunks through one shared keep-alive session.
+
+    Every photo is streamed to a temporary file and renamed into place, so a photo is never half-written.
+    Photos are stored once per distinct content under store_dir/objects (named by their sha256),
+    and each requested file is a hard link to (or, where links are unsupported, a copy of) that object.
+    An index in store_dir remembers the url, size and ETag behind every file, so unchanged photos are skipped.
+    Error statuses and failed connections are retried by the scheduler alone; a response cut off
+    mid-body is resumed here with a Range request.
+
+    Attributes:
+    store_dir - directory holding the index and the content-addressed objects
+    session - session every request is sent with
+    scheduler - scheduler limiting and retrying every request (see RequestScheduler)
+    chunk_size - bytes read from a response at a time
+    retries - times a download cut off mid-body is resumed
+    backoff - seconds waited before the first resume (doubled for each later resume)
+    timeout - seconds to wait for the server before a request fails
+    """
+
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, store_dir: Union[PathLike, str], session: Optional['requests.Session'] = None,
+                 chunk_size: int = DOWNLOAD_CHUNK_SIZE, retries: int = 3, backoff: float = 0.5,
+                 timeout: Optional[float] = 30, scheduler: Optional[RequestScheduler] = None):
+        self.store_dir = Path(store_dir)
+        self.session = util.make_session() if session is None else session
+        self.scheduler = default_scheduler() if scheduler is None else scheduler
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._lock = Lock()
+        self._index = dict()  # type: Dict[str, dict]
+        with suppress(OSError, ValueError):
+            self._index = json.loads((self.store_dir / self.INDEX_NAME).read_text(encoding='utf-8'))
+
+    def __enter__(self) -> 'PhotoDownloader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Save the index and close every pooled connection."""
+        self.save_index()
+        self.session.close()
+
+    def save_index(self) -> None:
+        """Write the index to store_dir."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._index, indent=1).encode('utf-8')
+        util.atomic_write(self.store_dir / self.INDEX_NAME, data)
+
+    def download(self, image_url: str, file_path: Union[PathLike, str]) -> PhotoResult:
+        """
+        Save the image at image_url to file_path, unless file_path already holds it.
+
+        :param image_url: url of the image
+        :param file_path: where to save the image
+        :return: PhotoResult telling whether the image was downloaded and whether its content was already stored
+        """
+        from requests.exceptions import ChunkedEncodingError
+
+        file_path = Path(file_path)
+        key = str(file_path.resolve())
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is not None and not (entry['url'] == image_url and file_path.is_file()
+                                      and file_path.stat().st_size == entry['size']):
+            entry = None
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = _Partial(file_path)
+        try:
+            attempt = 0
+            while True:
+                try:
+                    changed = self._fetch(image_url, entry, partial)
+                    break
+                except (ChunkedEncodingError, _Interrupted):
+                    if attempt >= self.retries:
+                        raise
+                    time.sleep(self.backoff * 2 ** attempt)
+                    attempt += 1
+            if not changed:
+                return PhotoResult(file_path, size=entry['size'])
+            instrument.count('photo_bytes_fetched', partial.written, url=image_url)
+            return self._commit(image_url, file_path, partial)
+        finally:
+            partial.file.close()
+            with suppress(FileNotFoundError):
+                partial.path.unlink()
+
+    def _fetch(self, image_url: str, entry: Optional[dict], partial: _Partial) -> bool:
+        """Stream image_url into partial. Return False (without downloading) if the stored file is unchanged."""
+        from requests import HTTPError
+
+        headers = dict()
+        if partial.written and not (partial.etag or partial.last_modified):
+            partial.restart()  # without a validator for If-Range, a resumed part could belong to another image
+        if partial.written:
+            headers['Range'] = f'bytes={partial.written}-'
+            headers['If-Range'] = partial.etag or partial.last_modified
+        elif entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        with self.scheduler.get(image_url, session=self.session, headers=headers, stream=True,
+                                timeout=self.timeout) as response:
+            if response.status_code == 304:
+                if entry is None or partial.written:
+                    raise HTTPError(f'304 Not Modified without a matching request for url: {image_url}',
+                                    response=response)
+                return False
+            response.raise_for_status()
+            if partial.written and response.status_code != 206:
+                partial.restart()
+            elif partial.written and _range_start(response) != partial.written:
+                partial.restart()
+                raise _Interrupted(f'{image_url} resumed at byte {_range_start(response)}, not {partial.written}')
+            if not partial.written:
+                partial.etag = response.headers.get('ETag')
+                partial.last_modified = response.headers.get('Last-Modified')
+                if entry is not None and _unchanged(entry, response):
+                    return False
+            start = partial.written
+            for chunk in response.iter_content(self.chunk_size):
+                partial.write(chunk)
+            content_length = response.headers.get('Content-Length')
+            if (content_length is not None and 'Content-Encoding' not in response.headers
+                    and partial.written - start < int(content_length)):
+                raise _Interrupted(f'{image_url} ended after {partial.written - start} of {content_length} bytes')
+        return True
+
+    def _commit(self, image_url: str, file_path: Path, partial: _Partial) -> PhotoResult:
+        """Move the finished download into the object store and link it to file_path."""
+        partial.file.close()
+        digest = partial.hasher.hexdigest()
+        object_path = self.store_dir / 'objects' / digest[:2] / (digest + file_path.suffix)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        deduplicated = object_path.exists()
+        if not deduplicated:
+            replace(partial.path, object_path)
+
+        temp_link = file_path.with_name('.' + file_path.name + '.link')
+        with suppress(FileNotFoundError):
+            temp_link.unlink()
+        try:
+            link(object_path, temp_link)
+        except OSError:
+            copyfile(object_path, temp_link)
+        replace(temp_link, file_path)
+
+        with self._lock:
+            self._index[str(file_path.resolve())] = {'url': image_url, 'size': partial.written, 'sha256': digest,
+                                                     'etag': partial.etag, 'last_modified': partial.last_modified}
+        return PhotoResult(file_path, downloaded=True, deduplicated=deduplicated, size=partial.written)
+
+
+def _range_start(response: 'requests.Response') -> Optional[int]:
+    """Return the first byte position in the Content-Range of response (a 206 response), or None if it has none."""
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _unchanged(entry: dict, response: 'requests.Response') -> bool:
+    """Return True if response (a full 200 response) is for the same image the index entry describes."""
+    etag = response.headers.get('ETag')
+    if etag and entry.get('etag'):
+        return etag == entry['etag']
+    content_length = response.headers.get('Content-Length')
+    return content_length is not None and int(content_length) == entry['size']
@@ -0,0 +1,147 @@
+"""
+Bounded worker pool for running many blocking tasks (such as downloads) at once.
+
+Classes:
+WorkerPool - Persistent pool of worker threads fed from a work queue.
+Task - Handle for a single submitted call.
+TaskResult - Result or exception of a finished (or abandoned) task.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor, CancelledError, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Event
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Set
+import time
+
+
+class TaskResult(NamedTuple):
+    result: Any = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the task returned without raising an exception."""
+        return self.exception is None
+
+
+class Task:
+    """
+    Handle for a call submitted to a WorkerPool.
+
+    The timeout of a task counts from the moment a worker starts running it,
+    so time spent waiting in the queue is never held against it.
+    A task that runs past its timeout is abandoned: wait returns a TimeoutError,
+    but the call itself keeps running in its worker thread until it returns (threads cannot be stopped).
+    """
+
+    def __init__(self, function: Callable, args: Iterable = (), kwargs: Optional[dict] = None,
+                 timeout: Optional[float] = None):
+        self.function = function
+        self.args = tuple(args)
+        self.kwargs = dict() if kwargs is None else kwargs
+        self.timeout = timeout
+        self.started = Event()
+        self.start_time = None  # type: Optional[float]
+        self.future = None  # type: Optional[Future]
+        self.abandoned = False  # True once wait gave up on the task after its timeout
+
+    def run(self) -> Any:
+        self.start_time = time.monotonic()
+        self.started.set()
+        return self.function(*self.args, **self.kwargs)
+
+    def cancel(self) -> bool:
+        """Cancel the task if it has not started yet. Return True if it was cancelled."""
+        return self.future.cancel()
+
+    def wait(self) -> TaskResult:
+        """Block until the task finishes, is cancelled or runs past its timeout, then return its TaskResult."""
+        try:
+            if self.timeout is None:
+                return TaskResult(self.future.result())
+            while not self.started.wait(0.05):
+                if self.future.done():
+                    break
+            remaining = None if self.start_time is None else self.start_time + self.timeout - time.monotonic()
+            return TaskResult(self.future.result(timeout=remaining))
+        except (CancelledError, FutureTimeoutError) as error:
+            if isinstance(error, FutureTimeoutError):
+                self.abandoned = True
+                error = TimeoutError(f'task exceeded its {self.timeout}s timeout')
+            return TaskResult(exception=error)
+        except Exception as error:
+            return TaskResult(exception=error)
+
+
+class WorkerPool:
+    """
+    Run calls on up to limit persistent worker threads.
+
+    Calls wait in a work queue, and a worker picks up the next call as soon as it frees up,
+    so one slow call never holds up the other workers.
+    Exceptions are caught and returned in each call's TaskResult.
+
+    Leaving a with block waits for every running call, unless a call was abandoned after its timeout
+    (see Task): queued calls are then cancelled and the block is left at once, without waiting for the abandoned
+    call. As it still holds its worker thread, a blocking call should have its own timeout as well
+    (download_all_photos passes its timeout to every request).
+    """
+
+    def __init__(self, limit: int = 10):
+        self.limit = limit
+        self._executor = ThreadPoolExecutor(max_workers=limit)
+        self._tasks = set()  # type: Set[Task]
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        abandoned = any(task.abandoned for task in list(self._tasks))
+        self.shutdown(wait=not abandoned, cancel_pending=abandoned)
+
+    def submit(self, function: Callable, args: Iterable = (), kwargs: Optional[dict] = None,
+               timeout: Optional[float] = None) -> Task:
+        """
+        Queue function to be called with args and kwargs.
+
+        :param function: function to call
+        :param args: arguments to pass to function
+        :param kwargs: other arguments to pass to function
+        :param timeout: seconds the call may run before its result is abandoned
+        :return: Task handle for the call
+        """
+        task = Task(function, args, kwargs, timeout)
+        task.future = self._executor.submit(task.run)
+        self._tasks.add(task)
+        task.future.add_done_callback(lambda _: self._tasks.discard(task))
+        return task
+
+    def map(self, functions: Iterable[Callable], args: Iterable = (), kwargs: Optional[dict] = None,
+            timeout: Optional[float] = None) -> List[TaskResult]:
+        """
+        Call each function (each with the same args and kwargs) and return every TaskResult in order.
+
+        :param functions: functions to call
+        :param args: arguments to pass to each function
+        :param kwargs: other arguments to pass to each function
+        :param timeout: seconds each call may run before its result is abandoned
+        """
+        args = tuple(args)
+        tasks = [self.submit(function, args, kwargs, timeout) for function in functions]
+        return [task.wait() for task in tasks]
+
+    def cancel_pending(self) -> int:
+        """Cancel every queued task that has not started yet. Return how many were cancelled."""
+        return sum(task.cancel() for task in list(self._tasks))
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop the workers once the queued work is done.
+
+        :param wait: block until every running task has finished
+        :param cancel_pending: cancel queued tasks that have not started yet
+        """
+        if cancel_pending:
+            self.cancel_pending()
+        self._executor.shutdown(wait=wait)
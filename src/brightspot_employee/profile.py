@@ -0,0 +1,120 @@
+"""
+Fetch each employee's profile page once and read its <head> meta tags and profile containers.
+
+Classes:
+Profile - Photo url, fields and meta tags of one profile page.
+
+Functions:
+parse_profile - Return the Profile in the html of a profile page.
+fetch_profile - Fetch a profile page and return its Profile.
+enrich - Fetch the profile page of many employees concurrently (each page once) and attach their Profiles.
+
+"""
+
+from .cache import ResponseCache
+from .pool import WorkerPool, TaskResult
+from .scheduler import RequestScheduler
+from . import instrument, util
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, TYPE_CHECKING
+import re
+
+if TYPE_CHECKING:
+    from .employee import Employee, EmployeeProcessor
+    import requests
+
+_HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+
+
+class Profile(NamedTuple):
+    page_url: str
+    photo_url: Optional[str]  # og:image:url (or og:image) meta tag. None if the page has neither
+    fields: Dict[str, str]  # email, bio, office_hours and any custom fields (see EmployeeProcessor.process_profile)
+    meta: Dict[str, str]  # content of every <head> meta tag, by property (or name)
+
+
+def parse_profile(html_data: str, page_url: str, processor: 'EmployeeProcessor') -> Profile:
+    """
+    Return the Profile in html_data, parsing only the meta tags of its <head>
+    and the tags with one of processor.profile_classes()
+
+    :param html_data: html text of a profile page
+    :param page_url: url html_data was fetched from
+    :param processor: EmployeeProcessor reading the fields of the page (see EmployeeProcessor.process_profile)
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    head_end = _HEAD_END.search(html_data)
+    head = html_data[:head_end.start()] if head_end else html_data
+    meta = dict()
+    for tag in BeautifulSoup(head, 'html.parser', parse_only=SoupStrainer('meta')).find_all('meta'):
+        key = tag.get('property') or tag.get('name')
+        if key and tag.has_attr('content'):
+            meta.setdefault(key, tag['content'])
+
+    containers = dict()
+    classes = processor.profile_classes()
+    if classes:
+        body = html_data[head_end.end():] if head_end else html_data
+        wanted = set(classes)
+        strainer = SoupStrainer(class_=classes)
+        for tag in BeautifulSoup(body, 'html.parser', parse_only=strainer).find_all(class_=classes):
+            for class_ in tag.get('class', ()):
+                if class_ in wanted:
+                    containers.setdefault(class_, tag)
+
+    photo_url = meta.get('og:image:url') or meta.get('og:image')
+    return Profile(page_url, photo_url, processor.process_profile(meta, containers), meta)
+
+
+def fetch_profile(page_url: str, processor: 'EmployeeProcessor', session: Optional['requests.Session'] = None,
+                  cache: Optional[ResponseCache] = None, scheduler: Optional[RequestScheduler] = None) -> Profile:
+    """
+    Fetch the profile page at page_url and return its Profile (see parse_profile).
+
+    :param page_url: url of the profile page
+    :param processor: EmployeeProcessor reading the fields of the page
+    :param session: session to send the request with. If None, a one-off request is made
+    :param cache: cache to reuse and store the response in. If None, nothing is cached
+    :param scheduler: scheduler limiting and retrying the request. If None, the default_scheduler is used
+    """
+    with instrument.timer('profile', url=page_url):
+        with util.open_url(page_url, session=session, cache=cache, scheduler=scheduler) as response:
+            response.raise_for_status()
+            html_data = response.text
+        return parse_profile(html_data, page_url, processor)
+
+
+def enrich(employees: Iterable['Employee'], limit: int = 10, cache: Optional[ResponseCache] = None,
+           scheduler: Optional[RequestScheduler] = None) -> Dict[str, TaskResult]:
+    """
+    Fetch the profile page of every employee concurrently and set each employee's profile to its Profile.
+    Every distinct page_url is fetched exactly once (with the processor of the first employee having it),
+    and employees sharing a page_url share its Profile. A failed page does not stop the others
+
+    :param employees: employees to fetch the profiles of. Employees without a page_url are skipped
+    :param limit: number of profile pages to fetch simultaneously
+    :param cache: cache to reuse and store the responses in. If None, nothing is cached
+    :param scheduler: scheduler limiting and retrying the requests. If None, the default_scheduler is used
+    :return: TaskResult (with the Profile or exception) of each page_url, keyed by page_url
+    """
+    by_url = dict()  # type: Dict[str, List[Employee]]
+    for employee in employees:
+        if employee.page_url:
+            by_url.setdefault(employee.page_url, []).append(employee)
+
+    session = util.make_session(pool_maxsize=limit)
+    try:
+        with WorkerPool(limit) as pool:
+            tasks = {page_url: pool.submit(fetch_profile, (page_url, group[0].processor),
+                                           {'session': session, 'cache': cache, 'scheduler': scheduler})
+                     for page_url, group in by_url.items()}
+            results = {page_url: task.wait() for page_url, task in tasks.items()}
+    finally:
+        session.close()
+
+    for page_url, result in results.items():
+        if result.ok:
+            for employee in by_url[page_url]:
+                employee.profile = result.result
+    return results
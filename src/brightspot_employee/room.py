@@ -1,20 +1,46 @@
 """
 Representation of a room on a college campus
+
+Classes:
+Room - Exact address of a room.
+RoomParser - Precompiled, memoized parsing of room strings into shared Room instances.
+
+Constants:
+BUILDING_ALIASES - default building names (matched at their start) and the abbreviation each is replaced by
 """
 import re
-from typing import Union, Iterable, List
+from functools import lru_cache
+from typing import Dict, Union, Iterable, List, Optional
+from weakref import WeakValueDictionary
+
+BUILDING_ALIASES = {'Joseph': 'JSB', 'Heber': 'HGB'}
 
 
 class Room:
     """
-    Represents the exact address of a room on a college campus
+    Represents the exact address of a room on a college campus.
+    Rooms are immutable, so equal rooms can be shared (see RoomParser)
 
+    Class Attributes:
+    parser - RoomParser used by the from_string methods
     """
+    __slots__ = ('building', 'floor', 'rm_num', 'rm_letter', '__weakref__')
+
     def __init__(self, building: str, floor: Union[str, int], rm_num: Union[str, int], rm_letter: str = ''):
-        self.floor = floor
-        self.rm_num = rm_num
-        self.rm_letter = rm_letter
-        self.building = building
+        set_part = object.__setattr__
+        set_part(self, 'floor', floor)
+        set_part(self, 'rm_num', rm_num)
+        set_part(self, 'rm_letter', rm_letter)
+        set_part(self, 'building', building)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'Room is immutable; cannot set {name}')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'Room is immutable; cannot delete {name}')
+
+    def __reduce__(self):
+        return type(self), (self.building, self.floor, self.rm_num, self.rm_letter)
 
     def __str__(self) -> str:
         output = ''
@@ -34,54 +60,150 @@ class Room:
         """Return False if no building, floor, or rm_num is specified"""
         return any((self.building, self.floor, self.rm_num))
 
-    @staticmethod
-    def clean_room_string(room_string: str) -> str:
+    @classmethod
+    def clean_room_string(cls, room_string: str) -> str:
         """
         Return a cleaned-up room input_string
         """
-        clean_string = room_string.strip()
-        clean_string = re.sub(r'-', ' ', clean_string)
-        clean_string = re.sub(r'Office(:\s)*', '', clean_string)
-        clean_string = re.sub(r'Joseph.*', 'JSB', clean_string)
-        clean_string = re.sub(r'Heber.*', 'HGB', clean_string)
-        clean_string = re.sub(r'(?<=\d)\s*([^\d\s])(?!\w)', r'\g<1>', clean_string)
-        return clean_string
-
-    @staticmethod
-    def split_room_string(room_string: str) -> (str, str, str, str):
+        return cls.parser.clean(room_string)
+
+    @classmethod
+    def split_room_string(cls, room_string: str) -> (str, str, str, str):
         """
         Return all parts of a room address from room_string (in order of Room initialization).
         """
-        building = re.search(r'[^\d\s]{2,}', room_string)
+        return cls.parser.split(room_string)
+
+    @classmethod
+    def from_string(cls, room_string: str) -> 'Room':
+        """
+        Return a Room instance after cleaning-up room_string.
+        Equal rooms are returned as the same (shared) instance
+        """
+        return cls.parser.parse(room_string)
+
+    @classmethod
+    def from_room_string_for_each(cls, string_iter: Iterable[str]) -> List['Room']:
+        """
+        Return a list of Room instances, one for each string in string_iter.
+        Each distinct string is only parsed once
+        """
+        return cls.parser.parse_many(string_iter)
+
+
+class RoomParser:
+    """
+    Parse room strings into Room instances.
+
+    All cleaning rules are compiled into a single regular expression, results are memoized
+    in a bounded LRU cache, and equal rooms are interned so every employee in the same room
+    shares one (immutable) Room instance. Interned rooms are only held weakly,
+    so a room no employee or cache entry uses any more is freed.
+
+    Attributes:
+    aliases - building names (matched at their start, up to the end of the line) and their replacements
+    cache_size - number of distinct room strings whose Room is memoized
+    """
+
+    ROOM_NUMBER_PATTERN = re.compile(r'\d{2,}')
+    BUILDING_PATTERN = re.compile(r'[^\d\s]{2,}')
+    ROOM_LETTER_PATTERN = re.compile(r'(?<=\d{2})([^\d\s])(?!\w)')
+    DETACHED_LETTER_PATTERN = re.compile(r'(?<=\d)\s*([^\d\s])(?!\w)')
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, cache_size: int = 4096):
+        self.aliases = dict(BUILDING_ALIASES if aliases is None else aliases)
+        self.cache_size = cache_size
+        self._rooms = WeakValueDictionary()  # type: WeakValueDictionary
+        self._compile()
+
+    def _compile(self) -> None:
+        """Compile the cleaning rules (including every alias) into one regular expression."""
+        alias_names = sorted(self.aliases, key=len, reverse=True)
+        alternatives = [r'(?P<dash>-)', r'(?P<office>Office(?::[\s-])*)']
+        if alias_names:
+            alternatives.append(r'(?P<alias>{}).*'.format('|'.join(map(re.escape, alias_names))))
+        self._clean_pattern = re.compile('|'.join(alternatives))
+        self._parse_cached = lru_cache(maxsize=self.cache_size)(self._parse)
+
+    def add_alias(self, name: str, building: str) -> None:
+        """Replace name (and everything after it on the line) with building while cleaning."""
+        self.aliases[name] = building
+        self._compile()
+
+    def _replace(self, match: 're.Match') -> str:
+        if match.lastgroup == 'dash':
+            return ' '
+        if match.lastgroup == 'office':
+            return ''
+        return self.aliases[match.group('alias')]
+
+    def clean(self, room_string: str) -> str:
+        """Return a cleaned-up room_string."""
+        clean_string = self._clean_pattern.sub(self._replace, room_string.strip())
+        return self.DETACHED_LETTER_PATTERN.sub(r'\g<1>', clean_string)
+
+    def split(self, room_string: str) -> (str, str, str, str):
+        """Return all parts of a room address from a cleaned room_string (in order of Room initialization)."""
+        building = self.BUILDING_PATTERN.search(room_string)
         building = '' if building is None else building.group(0)
 
-        rm_num = re.search(r'\d{2,}', room_string)
+        rm_num = self.ROOM_NUMBER_PATTERN.search(room_string)
         rm_num = '' if rm_num is None else rm_num.group(0)
 
-        rm_letter = re.search(r'(?<=\d{2})([^\d\s])(?!\w)', room_string)
+        rm_letter = self.ROOM_LETTER_PATTERN.search(room_string)
         rm_letter = '' if rm_letter is None else rm_letter.group(0)
 
         floor = rm_num[0] if rm_num else ''
         return building, floor, rm_num, rm_letter
 
-    @classmethod
-    def from_string(cls, room_string: str) -> 'Room':
-        """
-        Return a Room instance after cleaning-up room_string.
-        """
-        string = Room.clean_room_string(room_string)
-        return Room(*Room.split_room_string(string))
+    def _parse(self, room_string: str) -> Room:
+        return self.intern(*self.split(self.clean(room_string)))
+
+    def parse(self, room_string: str) -> Room:
+        """Return the (shared) Room described by room_string."""
+        return self._parse_cached(room_string)
+
+    def parse_many(self, room_strings: Iterable[str]) -> List[Room]:
+        """Return the (shared) Room described by each string in room_strings."""
+        parse = self._parse_cached
+        return [parse(room_string) for room_string in room_strings]
 
-    @staticmethod
-    def from_room_string_for_each(string_iter: Iterable[str]) -> List['Room']:
+    def parse_column(self, room_strings) -> List[Room]:
         """
-        Return a list of Room instances.
-        More optimized by only cleaning the input_string once
+        Return the (shared) Room described by each string in a pandas Series, using vectorized .str operations.
+        Each distinct string is only processed once
+
+        :param room_strings: pandas Series of room strings
         """
-        clean_string = '\n'.join(string_iter)
-        # scrub data
-        clean_string = Room.clean_room_string(clean_string)
-        new_string_iter = clean_string.split('\n')
+        codes, uniques = room_strings.astype(str).factorize()
+        if not len(uniques):
+            return []
+        clean = (uniques.to_series().str.strip()
+                 .str.replace(self._clean_pattern, self._replace, regex=True)
+                 .str.replace(self.DETACHED_LETTER_PATTERN, r'\g<1>', regex=True))
+        building = clean.str.extract(f'({self.BUILDING_PATTERN.pattern})', expand=False).fillna('')
+        rm_num = clean.str.extract(f'({self.ROOM_NUMBER_PATTERN.pattern})', expand=False).fillna('')
+        rm_letter = clean.str.extract(self.ROOM_LETTER_PATTERN, expand=False).fillna('')
+        floor = rm_num.str[0].fillna('')
+        rooms = [self.intern(*parts) for parts in zip(building, floor, rm_num, rm_letter)]
+        return [rooms[code] for code in codes]
+
+    def intern(self, building: str, floor: str, rm_num: str, rm_letter: str = '') -> Room:
+        """Return the shared Room with these parts."""
+        parts = (building, floor, rm_num, rm_letter)
+        room = self._rooms.get(parts)
+        if room is None:
+            room = self._rooms.setdefault(parts, Room(*parts))
+        return room
+
+    def cache_info(self):
+        """Return the hits, misses and size of the memoization cache."""
+        return self._parse_cached.cache_info()
+
+    def clear(self) -> None:
+        """Forget every memoized and interned Room."""
+        self._parse_cached.cache_clear()
+        self._rooms.clear()
+
 
-        return [Room(*Room.split_room_string(room_string))
-                for room_string in new_string_iter]
+Room.parser = RoomParser()
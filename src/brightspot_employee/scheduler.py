@@ -0,0 +1,267 @@
+"""
+Per-host scheduling of http requests: rate limits, adaptive concurrency, retries and backoff.
+
+Classes:
+RequestScheduler - Send GET requests within per-host limits that adapt to how the host responds.
+HostStats - Current limits and totals of one host.
+
+Functions:
+default_scheduler - Return the RequestScheduler used when none is given.
+set_default_scheduler - Replace the RequestScheduler used when none is given.
+parse_retry_after - Return the seconds asked for by a Retry-After header.
+
+Constants:
+RETRY_STATUSES - response statuses that are retried
+THROTTLE_STATUSES - response statuses telling that the host is overloaded
+
+"""
+
+from . import instrument
+
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Condition, Lock
+from typing import Dict, NamedTuple, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
+import random
+import time
+
+if TYPE_CHECKING:
+    import requests
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+THROTTLE_STATUSES = frozenset((429, 503))
+LATENCY_SMOOTHING = 0.2
+LATENCY_DECREASE = 0.9
+THROTTLE_DECREASE = 0.5
+
+
+class HostStats(NamedTuple):
+    concurrency: float  # current limit of simultaneous requests
+    in_flight: int
+    latency: Optional[float]  # smoothed seconds until the response headers arrived
+    requests: int
+    retries: int
+    throttled: int  # responses with a THROTTLE_STATUSES status, or that failed to connect
+
+
+class _Host:
+    """Token bucket, concurrency limit and latency estimate of one host."""
+
+    def __init__(self, concurrency: float, burst: float):
+        self.condition = Condition()
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.tokens = burst
+        self.refilled = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency = None  # type: Optional[float]
+        self.baseline = None  # type: Optional[float]
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Return the seconds to wait asked for by a Retry-After header value (delay seconds or an http date).
+    Return None if value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RequestScheduler:
+    """
+    Send GET requests to each host within a requests-per-second limit and an adaptive concurrency limit.
+
+    The rate limit is a token bucket per host: rate tokens are added every second, up to burst,
+    and every request takes one.
+    The concurrency limit of each host starts at concurrency and adapts like TCP congestion control:
+    it grows by about one every time a full window of requests succeeds,
+    shrinks by 10% when the smoothed latency exceeds latency_tolerance times the lowest smoothed latency seen,
+    and halves on a 429 or 503 response or a failed connection (at most once per latency, so one burst of
+    errors counts once). A request occupies its host until its response headers arrive.
+
+    Connection errors, timeouts and RETRY_STATUSES responses are retried up to retries times,
+    after a random delay of up to backoff * 2 ** attempt seconds (full jitter, at most max_backoff).
+    A Retry-After header replaces that delay, and a throttled host is paused for it;
+    if Retry-After asks for more than max_backoff, the response is returned instead of waiting.
+
+    Attributes:
+    rate - requests per second sent to each host. If None, requests are only limited by concurrency
+    burst - requests that may be sent at once after the host has been idle
+    concurrency - concurrency limit each host starts with
+    min_concurrency - lowest concurrency limit of any host
+    max_concurrency - highest concurrency limit of any host
+    latency_tolerance - how many times slower than its best latency a host may get before its limit shrinks
+    retries - times a failed request is retried
+    backoff - seconds of the longest delay before the first retry (doubled for each later retry)
+    max_backoff - longest delay before any retry
+    timeout - seconds to wait for the server before a request fails, unless a request sets its own
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None, concurrency: int = 8,
+                 min_concurrency: int = 1, max_concurrency: int = 32, latency_tolerance: float = 3.0,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 60.0, timeout: Optional[float] = 30):
+        if min_concurrency < 1 or not min_concurrency <= concurrency <= max_concurrency:
+            raise ValueError('concurrency limits must satisfy 1 <= min_concurrency <= concurrency <= max_concurrency')
+        if burst is None:
+            burst = 1.0 if rate is None else rate
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.concurrency = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_tolerance = latency_tolerance
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._hosts = dict()  # type: Dict[str, _Host]
+        self._hosts_lock = Lock()
+
+    def get(self, url: str, session: Optional['requests.Session'] = None, **kwargs) -> 'requests.Response':
+        """
+        Return the response to a GET request of url, sent once its host's limits allow it and retried on failure.
+        The last response is returned even if its status is an error (like requests.get)
+
+        :param url: url to pull
+        :param session: session to send the request with. If None, a one-off request is made
+        :param kwargs: other arguments of requests.Session.get (timeout defaults to RequestScheduler.timeout)
+        """
+        from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+        if session is None:
+            import requests
+            session = requests
+        kwargs.setdefault('timeout', self.timeout)
+        host = self._host(url)
+        attempt = 0
+        while True:
+            with instrument.timer('request_wait', url=url):
+                self._acquire(host)
+            start = time.monotonic()
+            try:
+                response = session.get(url, **kwargs)
+            except (RequestsConnectionError, Timeout):
+                self._release(host, throttled=True)
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+            else:
+                throttled = response.status_code in THROTTLE_STATUSES
+                self._release(host, time.monotonic() - start, throttled)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+                if delay is None:
+                    delay = self.backoff_delay(attempt)
+                elif delay > self.max_backoff:
+                    return response
+                if throttled:
+                    self._pause(host, delay)
+                response.close()
+            with host.condition:
+                host.retries += 1
+            instrument.count('requests_retried', url=url)
+            time.sleep(delay)
+            attempt += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return a random delay before retry number attempt (starting at 0), using full jitter."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def host_stats(self, url: str) -> HostStats:
+        """Return the current limits and totals of the host of url."""
+        host = self._host(url)
+        with host.condition:
+            return HostStats(host.concurrency, host.in_flight, host.latency, host.requests, host.retries,
+                             host.throttled)
+
+    def _host(self, url: str) -> _Host:
+        netloc = urlsplit(url).netloc
+        host = self._hosts.get(netloc)
+        if host is None:
+            with self._hosts_lock:
+                host = self._hosts.setdefault(netloc, _Host(float(self.concurrency), self.burst))
+        return host
+
+    def _acquire(self, host: _Host) -> None:
+        """Wait until host is not paused, is below its concurrency limit and has a token, then take a slot."""
+        with host.condition:
+            while True:
+                now = time.monotonic()
+                wait = host.blocked_until - now
+                if wait <= 0 and host.in_flight < int(host.concurrency):
+                    if self.rate is None:
+                        break
+                    host.tokens = min(self.burst, host.tokens + (now - host.refilled) * self.rate)
+                    host.refilled = now
+                    if host.tokens >= 1:
+                        host.tokens -= 1
+                        break
+                    wait = (1 - host.tokens) / self.rate
+                host.condition.wait(wait if wait > 0 else None)
+            host.in_flight += 1
+            host.requests += 1
+
+    def _release(self, host: _Host, latency: Optional[float] = None, throttled: bool = False) -> None:
+        """Free the slot taken by _acquire and adapt the concurrency limit of host to the outcome."""
+        with host.condition:
+            at_limit = host.in_flight >= int(host.concurrency)
+            host.in_flight -= 1
+            if latency is not None:
+                host.latency = latency if host.latency is None else \
+                    host.latency + LATENCY_SMOOTHING * (latency - host.latency)
+                host.baseline = host.latency if host.baseline is None else min(host.baseline, host.latency)
+            if throttled:
+                host.throttled += 1
+                self._decrease(host, THROTTLE_DECREASE)
+            elif latency is not None and host.latency > self.latency_tolerance * host.baseline:
+                self._decrease(host, LATENCY_DECREASE)
+            elif latency is not None and at_limit:
+                host.concurrency = min(float(self.max_concurrency), host.concurrency + 1 / host.concurrency)
+            host.condition.notify_all()
+
+    def _decrease(self, host: _Host, factor: float) -> None:
+        now = time.monotonic()
+        if now - host.last_decrease >= (host.latency or 0):
+            host.concurrency = max(float(self.min_concurrency), host.concurrency * factor)
+            host.last_decrease = now
+
+    def _pause(self, host: _Host, seconds: float) -> None:
+        """Send no new request to host for seconds."""
+        with host.condition:
+            host.blocked_until = max(host.blocked_until, time.monotonic() + seconds)
+
+
+_default = None  # type: Optional[RequestScheduler]
+_default_lock = Lock()
+
+
+def default_scheduler() -> RequestScheduler:
+    """Return the RequestScheduler every request is sent through when no scheduler is given."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = RequestScheduler()
+    return _default
+
+
+def set_default_scheduler(scheduler: RequestScheduler) -> None:
+    """Send every request that is given no scheduler through scheduler."""
+    global _default
+    with _default_lock:
+        _default = scheduler
@@ -0,0 +1,164 @@
+"""
+Indexed SQLite storage of employees.
+
+Classes:
+EmployeeStore - SQLite database of employees with fast lookups by department, building/floor and last name.
+
+Constants:
+COLUMNS - columns holding the Employee attributes, with the room split into its parts
+SCHEMA - sql creating the employees table and its indexes
+
+"""
+
+from .employee import Employee
+from .room import Room
+from .sync import record_key
+
+from contextlib import closing
+from os import PathLike
+from typing import Iterable, Iterator, List, Optional, Type, Union
+import sqlite3
+
+COLUMNS = ('first_name', 'last_name', 'building', 'floor', 'rm_num', 'rm_letter',
+           'page_url', 'telephone', 'department', 'job_title')
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS employees (
+    key TEXT PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL COLLATE NOCASE,
+    building TEXT NOT NULL,
+    floor TEXT NOT NULL,
+    rm_num TEXT NOT NULL,
+    rm_letter TEXT NOT NULL,
+    page_url TEXT NOT NULL,
+    telephone TEXT NOT NULL,
+    department TEXT NOT NULL,
+    job_title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS employees_department ON employees (department);
+CREATE INDEX IF NOT EXISTS employees_building_floor ON employees (building, floor);
+CREATE INDEX IF NOT EXISTS employees_last_name ON employees (last_name);
+'''
+
+
+class EmployeeStore:
+    """
+    Store employees in a SQLite database, keyed by page_url (or full_name, for employees without one).
+
+    Besides the Employee attributes, each room is stored split into building, floor, rm_num and rm_letter,
+    with indexes on department, building/floor and last_name (case-insensitive, for prefix searches).
+    Queries return Employee instances lazily, one cursor row at a time.
+
+    Attributes:
+    connection - sqlite3 connection to the database
+    employee_cls - Employee (sub)class created for each returned row
+    """
+
+    def __init__(self, database: Union[PathLike, str] = ':memory:', employee_cls: Type[Employee] = Employee):
+        self.connection = sqlite3.connect(str(database))
+        self.connection.executescript(SCHEMA)
+        self.employee_cls = employee_cls
+
+    def __enter__(self) -> 'EmployeeStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM employees').fetchone()[0]
+
+    def __iter__(self) -> Iterator[Employee]:
+        return self.query()
+
+    def upsert(self, employees: Iterable[Employee]) -> int:
+        """
+        Insert employees, replacing any stored employee with the same page_url, in a single transaction.
+
+        :param employees: employees to store
+        :return: number of employees inserted or replaced
+        """
+        updates = ', '.join(f'{column} = excluded.{column}' for column in COLUMNS)
+        sql = (f'INSERT INTO employees (key, {", ".join(COLUMNS)}) VALUES ({", ".join("?" * (len(COLUMNS) + 1))}) '
+               f'ON CONFLICT (key) DO UPDATE SET {updates}')
+        with self.connection, closing(self.connection.cursor()) as cursor:
+            cursor.executemany(sql, (_row(employee) for employee in employees))
+            return cursor.rowcount
+
+    def delete(self, page_urls: Iterable[str]) -> int:
+        """
+        Remove the employees with the given page_urls (or full_names, for employees without one).
+
+        :return: number of employees removed
+        """
+        with self.connection, closing(self.connection.cursor()) as cursor:
+            cursor.executemany('DELETE FROM employees WHERE key = ?', ((url,) for url in page_urls))
+            return cursor.rowcount
+
+    def get(self, page_url: str) -> Optional[Employee]:
+        """Return the employee with page_url (or with that full_name, if it has no page_url), or None."""
+        return next(self._select('WHERE key = ?', (page_url,)), None)
+
+    def query(self, department: Optional[str] = None, building: Optional[str] = None,
+              floor: Optional[Union[str, int]] = None, last_name_prefix: Optional[str] = None,
+              job_title: Optional[str] = None) -> Iterator[Employee]:
+        """
+        Yield every stored employee matching all of the given filters, ordered by last then first name.
+
+        :param department: exact department
+        :param building: exact building of the room (such as JSB)
+        :param floor: exact floor of the room
+        :param last_name_prefix: case-insensitive start of the last name
+        :param job_title: exact job title
+        """
+        conditions, parameters = [], []
+        for column, value in (('department', department), ('building', building), ('job_title', job_title)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                parameters.append(value)
+        if floor is not None:
+            conditions.append('floor = ?')
+            parameters.append(str(floor))
+        if last_name_prefix is not None:
+            conditions.append("last_name LIKE ? ESCAPE '\\'")
+            parameters.append(_escape_like(last_name_prefix) + '%')
+        where = f'WHERE {" AND ".join(conditions)} ' if conditions else ''
+        return self._select(where + 'ORDER BY last_name, first_name', parameters)
+
+    def departments(self) -> List[str]:
+        """Return every distinct department, in order."""
+        return [row[0] for row in self.connection.execute('SELECT DISTINCT department FROM employees ORDER BY 1')]
+
+    def import_csv(self, file_path: Union[PathLike, str], chunksize: int = 10000) -> int:
+        """
+        Upsert every employee of a csv file created by Employee.to_csv, reading it chunksize rows at a time.
+
+        :return: number of employees inserted or replaced
+        """
+        return sum(self.upsert(chunk) for chunk in Employee.iter_csv_chunks(file_path, chunksize))
+
+    def export_csv(self, file_path: Union[PathLike, str]) -> None:
+        """Create a csv file at file_path holding every stored employee (see Employee.to_csv)."""
+        Employee.to_csv(file_path, self.query())
+
+    def _select(self, clause: str, parameters: Iterable = ()) -> Iterator[Employee]:
+        cursor = self.connection.execute(f'SELECT {", ".join(COLUMNS)} FROM employees {clause}', tuple(parameters))
+        intern = Room.parser.intern
+        with closing(cursor):
+            for first_name, last_name, building, floor, rm_num, rm_letter, *fields in cursor:
+                yield self.employee_cls(first_name, last_name, intern(building, floor, rm_num, rm_letter), *fields)
+
+
+def _row(employee: Employee) -> tuple:
+    room = employee.room if isinstance(employee.room, Room) else Room.from_string(str(employee.room))
+    return (record_key(employee), str(employee.first_name), str(employee.last_name),
+            str(room.building), str(room.floor), str(room.rm_num), str(room.rm_letter),
+            str(employee.page_url), str(employee.telephone), str(employee.department), str(employee.job_title))
+
+
+def _escape_like(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
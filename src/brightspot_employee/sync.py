@@ -0,0 +1,170 @@
+"""
+Incrementally sync a stored csv snapshot of BrightSpot directories with a fresh scrape.
+
+Classes:
+Changeset - Employees added, removed and modified since the stored snapshot.
+
+Functions:
+fingerprint - Return a hash of every stored field of an employee.
+record_key - Return the key an employee is matched between scrapes by.
+diff - Return the Changeset between two collections of employees.
+update_snapshot - Write a Changeset to a csv snapshot, touching as little of the file as possible.
+sync_directory - Scrape directories, diff them against the snapshot, update it and download changed photos.
+
+Exceptions:
+EmptyScrapeError - Raised when a directory that had records in the snapshot yields no employees.
+
+"""
+
+from .employee import Employee, EmployeeAttributes
+from .cache import ResponseCache
+from . import util
+
+from hashlib import sha1
+import json
+from os import PathLike, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union
+
+
+class EmptyScrapeError(RuntimeError):
+    """Raised when a directory yields no employees although the snapshot holds records scraped from it."""
+
+
+class Changeset(NamedTuple):
+    added: List[Employee]
+    removed: List[Employee]
+    modified: List[Tuple[Employee, Employee]]
+    unchanged: List[Employee]
+
+    def __bool__(self) -> bool:
+        """Return True if any employee was added, removed or modified."""
+        return bool(self.added or self.removed or self.modified)
+
+    @property
+    def changed(self) -> List[Employee]:
+        """Return the current version of every added or modified employee."""
+        return self.added + [new for _, new in self.modified]
+
+
+def fingerprint(employee: Employee) -> str:
+    """Return a hash of every field of employee that is stored in a csv file."""
+    fields = (str(getattr(employee, field)) for field in EmployeeAttributes._fields)
+    return sha1('\x1f'.join(fields).encode('utf-8')).hexdigest()
+
+
+def record_key(employee: Employee) -> str:
+    """Return the page_url of employee (or its full_name, if it has no page_url)."""
+    return employee.page_url or employee.full_name
+
+
+def diff(old: Iterable[Employee], new: Iterable[Employee]) -> Changeset:
+    """
+    Return what changed between old and new, matching employees by record_key.
+
+    :param old: employees of the stored snapshot
+    :param new: employees of a fresh scrape
+    :return: Changeset listing modified employees as (old, new) pairs
+    """
+    old_by_key = {record_key(employee): employee for employee in old}
+    new_by_key = {record_key(employee): employee for employee in new}
+    added, modified, unchanged = [], [], []
+    for key, employee in new_by_key.items():
+        previous = old_by_key.get(key)
+        if previous is None:
+            added.append(employee)
+        elif fingerprint(previous) != fingerprint(employee):
+            modified.append((previous, employee))
+        else:
+            unchanged.append(previous)
+    removed = [employee for key, employee in old_by_key.items() if key not in new_by_key]
+    return Changeset(added, removed, modified, unchanged)
+
+
+def update_snapshot(snapshot_path: Union[PathLike, str], old: List[Employee], changeset: Changeset) -> None:
+    """
+    Apply changeset to the csv snapshot at snapshot_path, which holds old.
+
+    An unchanged snapshot is not written to, and new employees alone are appended to the end of the file.
+    Otherwise modified records are replaced where they stand, removed ones are dropped,
+    and the new file is swapped in atomically.
+
+    :param snapshot_path: csv file created by Employee.to_csv
+    :param old: employees currently stored in the snapshot, in file order
+    :param changeset: changes to apply (from diff(old, ...))
+    """
+    snapshot_path = Path(snapshot_path)
+    if not changeset:
+        return
+    if not (changeset.removed or changeset.modified) and snapshot_path.exists() and old:
+        Employee.to_csv(snapshot_path, changeset.added, append=True, first_index=len(old))
+        return
+
+    replacements = {record_key(previous): employee
+                    for previous, employee in changeset.modified}  # type: Dict[str, Employee]
+    removed = {record_key(employee) for employee in changeset.removed}
+    employees = [replacements.get(record_key(employee), employee)
+                 for employee in old if record_key(employee) not in removed]
+    temp_path = snapshot_path.with_name(snapshot_path.name + '.tmp')
+    Employee.to_csv(temp_path, employees + changeset.added)
+    replace(temp_path, snapshot_path)
+
+
+def _sources_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name + '.sources.json')
+
+
+def _read_sources(snapshot_path: Path) -> Optional[Dict[str, int]]:
+    """Return the number of records each directory url added to the snapshot, or None if it was never recorded."""
+    try:
+        return json.loads(_sources_path(snapshot_path).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def sync_directory(urls: Union[str, Iterable[str]], snapshot_path: Union[PathLike, str],
+                   photo_dir: Optional[Union[PathLike, str]] = None, employee_cls: Type[Employee] = Employee,
+                   cache: Optional[ResponseCache] = None, thread_limit: int = 5) -> Changeset:
+    """
+    Scrape urls, update the csv snapshot at snapshot_path with what changed and return the Changeset.
+
+    If any url fails (including an error status that is still returned once the scheduler stops retrying),
+    its error is raised before the snapshot is touched, so a failed scrape never marks employees as removed.
+    Likewise EmptyScrapeError is raised if a url yields no employees although the snapshot holds records from it
+    (or, for a snapshot whose sources were never recorded, although the snapshot is not empty).
+    The number of records of each url is kept next to the snapshot, in <snapshot_path>.sources.json
+
+    :param urls: directory webpage (or webpages) to pull all data from
+    :param snapshot_path: csv file holding the last scrape. Created if it does not exist
+    :param photo_dir: directory to download photos of added and modified employees to. If None, none are downloaded
+    :param employee_cls: Employee (sub)class whose processor matches the webpages
+    :param cache: cache to reuse and store responses in. If None, nothing is cached
+    :param thread_limit: number of photos to download simultaneously
+    :return: Changeset between the stored snapshot and the fresh scrape
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+    fresh = []
+    counts = dict()  # type: Dict[str, int]
+    for url, result in employee_cls.from_websites(urls, cache=cache).items():
+        if not result.ok:
+            raise result.error
+        fresh.extend(result.employees)
+        counts[url] = len(result.employees)
+
+    snapshot_path = Path(snapshot_path)
+    old = employee_cls.from_csv(snapshot_path) if snapshot_path.exists() else []
+    if old:
+        sources = _read_sources(snapshot_path)
+        for url, count in counts.items():
+            if count == 0 and (sources is None or sources.get(url, 0) > 0):
+                raise EmptyScrapeError(f'{url} yielded no employees, but {snapshot_path} holds records from it')
+
+    changeset = diff(old, fresh)
+    update_snapshot(snapshot_path, old, changeset)
+    sources = dict(_read_sources(snapshot_path) or dict(), **counts)
+    util.atomic_write(_sources_path(snapshot_path), json.dumps(sources).encode('utf-8'))
+
+    if photo_dir is not None and changeset.changed:
+        employee_cls.download_all_photos(changeset.changed, photo_dir, thread_limit=thread_limit, cache=cache)
+    return changeset
@@ -0,0 +1,152 @@
+"""
+Columnar storage for large rosters of employees.
+
+Classes:
+EmployeeTable - Employees stored as DataFrame columns, turned into Employee instances only when indexed.
+
+Constants:
+ROOM_COLUMNS - columns holding the parts of each employee's Room
+COLUMNS - columns of an EmployeeTable (the Employee attributes, with the room split into its parts)
+CATEGORICAL_COLUMNS - columns with few distinct values, stored as pandas categoricals
+
+"""
+
+from .employee import Employee, EmployeeAttributes
+from .room import Room
+
+from os import PathLike
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Type, Union, overload, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+ROOM_COLUMNS = ('building', 'floor', 'rm_num', 'rm_letter')
+COLUMNS = ('first_name', 'last_name') + ROOM_COLUMNS + ('page_url', 'telephone', 'department', 'job_title')
+CATEGORICAL_COLUMNS = ('building', 'floor', 'rm_letter', 'department', 'job_title')
+
+
+class EmployeeTable:
+    """
+    Store many employees as columns of a DataFrame.
+
+    Only the column values are stored; Employee and Room instances are created when a row is indexed
+    or iterated over, so holding a merged roster costs a few bytes per field instead of two objects per row.
+    Columns with few distinct values (such as buildings and departments) are stored as categoricals.
+    Requires pandas, which is imported when the first EmployeeTable is created.
+
+    Attributes:
+    dataframe - DataFrame holding one column for each name in COLUMNS
+    employee_cls - Employee (sub)class created for each indexed row
+    """
+
+    def __init__(self, dataframe: Optional['DataFrame'] = None, employee_cls: Type[Employee] = Employee):
+        from pandas import DataFrame
+
+        if dataframe is None:
+            dataframe = DataFrame(columns=list(COLUMNS))
+        self.dataframe = _compact(dataframe.reset_index(drop=True))
+        self.employee_cls = employee_cls
+
+    @classmethod
+    def from_employees(cls, employees: Iterable[Employee],
+                       employee_cls: Optional[Type[Employee]] = None) -> 'EmployeeTable':
+        """
+        Return an EmployeeTable holding the data of employees.
+
+        :param employees: employees to store
+        :param employee_cls: Employee (sub)class created for each indexed row. If None, Employee
+        """
+        from pandas import DataFrame
+
+        columns = {column: [] for column in COLUMNS}
+        for employee in employees:
+            room = employee.room if isinstance(employee.room, Room) else Room.from_string(str(employee.room))
+            for column in ('first_name', 'last_name', 'page_url', 'telephone', 'department', 'job_title'):
+                columns[column].append(str(getattr(employee, column)))
+            for column in ROOM_COLUMNS:
+                columns[column].append(str(getattr(room, column)))
+        return cls(DataFrame(columns), Employee if employee_cls is None else employee_cls)
+
+    @classmethod
+    def from_csv(cls, file_path: Union[PathLike, str],
+                 employee_cls: Optional[Type[Employee]] = None) -> 'EmployeeTable':
+        """
+        Return an EmployeeTable holding the data of a csv file created by Employee.to_csv.
+
+        :param file_path: path to load the csv file from
+        :param employee_cls: Employee (sub)class created for each indexed row. If None, Employee
+        """
+        from pandas import DataFrame, read_csv
+
+        dataframe = read_csv(Path(file_path), keep_default_na=False, dtype=str, index_col=0)
+        rooms = dataframe['room'].astype('category')
+        parts = DataFrame([Room.split_room_string(Room.clean_room_string(room)) for room in rooms.cat.categories],
+                          columns=list(ROOM_COLUMNS))
+        codes = rooms.cat.codes.to_numpy()
+        for column in ROOM_COLUMNS:
+            dataframe[column] = parts[column].to_numpy()[codes]
+        return cls(dataframe, Employee if employee_cls is None else employee_cls)
+
+    @classmethod
+    def concat(cls, tables: Iterable['EmployeeTable']) -> 'EmployeeTable':
+        """Return one EmployeeTable holding the rows of every table, in order."""
+        from pandas import concat
+
+        tables = list(tables)
+        if not tables:
+            return cls()
+        dataframe = concat([table.dataframe.astype(str) for table in tables], ignore_index=True)
+        return cls(dataframe, tables[0].employee_cls)
+
+    def to_csv(self, file_path: Union[PathLike, str]) -> None:
+        """Create a csv file at file_path in the same format as Employee.to_csv."""
+        from pandas import DataFrame
+
+        dataframe = self.dataframe.astype(str)
+        rooms = [str(Room(*parts)) for parts in zip(*(dataframe[column] for column in ROOM_COLUMNS))]
+        output = DataFrame({field: rooms if field == 'room' else dataframe[field]
+                            for field in EmployeeAttributes._fields})
+        output.to_csv(Path(file_path))
+
+    def __len__(self) -> int:
+        return len(self.dataframe)
+
+    @overload
+    def __getitem__(self, index: int) -> Employee: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'EmployeeTable': ...
+
+    def __getitem__(self, index):
+        """Return the Employee at index, or an EmployeeTable of the rows in a slice."""
+        if isinstance(index, slice):
+            return type(self)(self.dataframe.iloc[index], self.employee_cls)
+        row = self.dataframe.iloc[index]
+        return self._employee(*(row[column] for column in COLUMNS))
+
+    def __iter__(self) -> Iterator[Employee]:
+        columns = (self.dataframe[column].astype(str) for column in COLUMNS)
+        for values in zip(*columns):
+            yield self._employee(*values)
+
+    def column(self, name: str) -> list:
+        """Return every value of a column in COLUMNS as a list."""
+        return self.dataframe[name].astype(str).tolist()
+
+    def memory_usage(self) -> int:
+        """Return the bytes used by every column (including the strings they hold)."""
+        return int(self.dataframe.memory_usage(index=True, deep=True).sum())
+
+    def _employee(self, first_name, last_name, building, floor, rm_num, rm_letter, page_url, telephone,
+                  department, job_title) -> Employee:
+        return self.employee_cls(first_name, last_name, Room(building, floor, rm_num, rm_letter),
+                                 page_url, telephone, department, job_title)
+
+
+def _compact(dataframe: 'DataFrame') -> 'DataFrame':
+    """Return dataframe with only COLUMNS, stored as strings or categoricals."""
+    dataframe = dataframe.loc[:, list(COLUMNS)].astype(str)
+    for column in CATEGORICAL_COLUMNS:
+        dataframe[column] = dataframe[column].astype('category')
+    return dataframe
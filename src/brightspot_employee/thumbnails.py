@@ -0,0 +1,174 @@
+"""
+Resize and transcode downloaded photos in worker processes, decoding each photo only once.
+
+Classes:
+ThumbnailPool - Process pool making every ThumbnailSpec of each photo submitted to it.
+ThumbnailSpec - Size, format and quality of one kind of output.
+ThumbnailResult - Outputs written and skipped for a single photo.
+
+Functions:
+make_thumbnails - Write every out-of-date output of one photo (run in the workers).
+thumbnail_path - Return where a ThumbnailSpec of a photo is written.
+
+Constants:
+DEFAULT_SPECS - thumbnails made when no specs are given
+EXTENSIONS - file extension of each supported Pillow format
+
+"""
+
+from .pool import TaskResult
+from . import util
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from os import PathLike, cpu_count
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+EXTENSIONS = {'JPEG': '.jpg', 'WEBP': '.webp', 'PNG': '.png'}
+
+
+class ThumbnailSpec(NamedTuple):
+    name: str  # directory (under the output directory) the outputs are written to
+    size: Optional[int] = None  # longest side in pixels. If None, the photo keeps its size
+    format: str = 'JPEG'  # Pillow format, one of EXTENSIONS
+    quality: int = 85
+
+
+DEFAULT_SPECS = (ThumbnailSpec('small', 128), ThumbnailSpec('medium', 512), ThumbnailSpec('webp', None, 'WEBP', 80))
+
+
+class ThumbnailResult(NamedTuple):
+    source: Path
+    written: Tuple[Path, ...] = ()
+    skipped: Tuple[Path, ...] = ()  # outputs that were already newer than source
+
+
+def thumbnail_path(source: Union[PathLike, str], out_dir: Union[PathLike, str], spec: ThumbnailSpec) -> Path:
+    """Return the path the spec output of the photo at source is written to: out_dir/spec.name/<stem>.<format>."""
+    return Path(out_dir) / spec.name / (Path(source).stem + EXTENSIONS[spec.format])
+
+
+def make_thumbnails(source: Union[PathLike, str], out_dir: Union[PathLike, str],
+                    specs: Iterable[ThumbnailSpec] = DEFAULT_SPECS) -> ThumbnailResult:
+    """
+    Write every spec of the photo at source into out_dir, unless its output is already newer than source.
+    Source is as new as its last modification or status change, so a photo re-linked to older content
+    (see PhotoDownloader) still counts as changed.
+    The photo is decoded once, JPEGs at the smallest scale (see Image.draft) still covering every size needed;
+    outputs are made largest first, each from the one before. Every output is written atomically
+
+    :param source: photo to resize
+    :param out_dir: directory holding a subdirectory for each spec (see thumbnail_path)
+    :param specs: outputs to make
+    """
+    from PIL import Image, ImageOps
+
+    source = Path(source)
+    source_stat = source.stat()
+    source_mtime = max(source_stat.st_mtime, source_stat.st_ctime)
+    pending, skipped = [], []
+    for spec in specs:
+        target = thumbnail_path(source, out_dir, spec)
+        try:
+            fresh = target.stat().st_mtime >= source_mtime
+        except FileNotFoundError:
+            fresh = False
+        (skipped if fresh else pending).append((spec, target))
+    if not pending:
+        return ThumbnailResult(source, skipped=tuple(skipped))
+
+    written = []
+    with Image.open(source) as image:
+        if all(spec.size for spec, _ in pending):
+            largest = max(spec.size for spec, _ in pending)
+            image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        full_size = max(image.size)
+        # largest first, so each output can be resized from the previous one
+        pending.sort(key=lambda item: item[0].size or full_size, reverse=True)
+        for spec, target in pending:
+            if spec.size and spec.size < max(image.size):
+                image.thumbnail((spec.size, spec.size), Image.LANCZOS, reducing_gap=3.0)
+            output = image
+            if spec.format == 'JPEG' and output.mode not in ('RGB', 'L'):
+                output = output.convert('RGB')
+            buffer = BytesIO()
+            output.save(buffer, spec.format, quality=spec.quality)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            util.atomic_write(target, buffer.getvalue())
+            written.append(target)
+    return ThumbnailResult(source, tuple(written), tuple(skipped))
+
+
+class ThumbnailPool:
+    """
+    Make every spec of each submitted photo in a pool of worker processes (see make_thumbnails).
+
+    Photos can be submitted while others are still downloading; pass a ThumbnailPool to
+    Employee.download_all_photos and each photo is submitted as soon as it is saved.
+
+    Attributes:
+    out_dir - directory holding a subdirectory for each spec (see thumbnail_path)
+    specs - outputs made of every photo
+    processes - number of worker processes
+    """
+
+    def __init__(self, out_dir: Union[PathLike, str], specs: Iterable[ThumbnailSpec] = DEFAULT_SPECS,
+                 processes: Optional[int] = None):
+        self.out_dir = Path(out_dir)
+        self.specs = tuple(specs)
+        unknown = {spec.format for spec in self.specs} - EXTENSIONS.keys()
+        if unknown:
+            raise ValueError(f'unsupported thumbnail formats: {", ".join(sorted(unknown))}')
+        self.processes = processes or cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        self._futures = []  # type: List[Future]
+        self._lock = Lock()
+
+    def __enter__(self) -> 'ThumbnailPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for every submitted photo, then stop the worker processes."""
+        self._executor.shutdown(wait=True)
+
+    def submit(self, source: Union[PathLike, str]) -> 'Future[ThumbnailResult]':
+        """Start making the thumbnails of the photo at source and return a Future of its ThumbnailResult."""
+        future = self._executor.submit(make_thumbnails, Path(source), self.out_dir, self.specs)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def wait(self) -> List[TaskResult]:
+        """
+        Block until every photo submitted so far is done, then return the TaskResult
+        (with its ThumbnailResult or exception) of each, in the order they were submitted.
+        Each photo is only returned by one call of wait
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        return _task_results(futures)
+
+    def map(self, sources: Iterable[Union[PathLike, str]]) -> List[TaskResult]:
+        """Make the thumbnails of every photo in sources and return each TaskResult, in order (see wait)."""
+        futures = [self.submit(source) for source in sources]
+        submitted = set(futures)
+        with self._lock:
+            self._futures = [future for future in self._futures if future not in submitted]
+        return _task_results(futures)
+
+
+def _task_results(futures: Iterable[Future]) -> List[TaskResult]:
+    """Wait for each future and return its TaskResult, in order."""
+    results = []
+    for future in futures:
+        try:
+            results.append(TaskResult(future.result()))
+        except Exception as error:
+            results.append(TaskResult(exception=error))
+    return results
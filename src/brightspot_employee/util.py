@@ -1,17 +1,28 @@
 """
 Random utility functions used by the brightspot_employee package
+requests, bs4 and lxml are imported by the functions that use them, the first time they are called
 
 Constants:
 NAME_SUFFIXES - default name suffixes to ignore while splitting a name
 """
-import requests
-from bs4 import BeautifulSoup
-from bs4.element import ResultSet
+from . import instrument
+from .scheduler import RequestScheduler, default_scheduler
 
-from typing import Iterable, Callable, Any, Optional
-from threading import Thread
+from os import replace
+import re
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Iterable, Iterator, Callable, Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from bs4.element import ResultSet, Tag
+    from lxml import etree
+    import requests
 
 NAME_SUFFIXES = ['jr.', 'iii', 'sr.']
+STREAM_CHUNK_SIZE = 2 ** 16
+_FIND_ALL_ONLY_KWARGS = {'string', 'text', 'limit', 'recursive'}
 
 
 def chunk_iterator(count: int, iterable: Iterable):
@@ -34,25 +45,18 @@ def chunk_iterator(count: int, iterable: Iterable):
 def stepped_limited_multithread(functions: Iterable[Callable[[Any], None]],
                                 args: Iterable = (), kwargs: Optional[dict] = None, limit: int = 10) -> None:
     """
-    Calls each function, using up to limit threads at a time.
+    Calls each function, using up to limit threads at a time, and returns once every call is done.
+    Runs on a WorkerPool, so a thread starts the next function as soon as it is free.
+    Exceptions raised by the functions are ignored (use WorkerPool.map to get them)
 
     :param functions: functions to call in each thread
     :param args: arguments to pass to each function (same arguments used for each)
     :param kwargs: other arguments to pass to each function
-    :param limit: number of threads to run as a chunk at a time
+    :param limit: number of threads to run at a time
     """
-    if kwargs is None:
-        kwargs = dict()
-
-    for function_chunk in chunk_iterator(limit, functions):
-        current_threads = []
-        for func in function_chunk:
-            new_thread = Thread(target=func, args=args, kwargs=kwargs)
-            new_thread.start()
-            current_threads.append(new_thread)
-
-        for thread in current_threads:
-            thread.join()
+    from .pool import WorkerPool
+    with WorkerPool(limit) as pool:
+        pool.map(functions, args, kwargs)
 
 
 def split_name(full_name: str, name_suffixes: Optional[Iterable[str]] = None) -> (str, str):
@@ -68,28 +72,208 @@ def split_name(full_name: str, name_suffixes: Optional[Iterable[str]] = None) ->
     return ' '.join(first), last
 
 
-def tag_iterator(url: str, args: Iterable = (), kwargs: Optional[dict] = None) -> ResultSet:
+def split_name_column(full_names, name_suffixes: Optional[Iterable[str]] = None) -> (list, list):
     """
-    Return an iterable of the specified found tags in the html found at url
+    Return the estimated first and last names of every name in a pandas Series, using vectorized .str operations.
+    Gives the same results as split_name on each name
+
+    :param full_names: pandas Series of full names
+    :param name_suffixes: name suffixes (such as jr.) kept with the last name
+    :return: list of first names and list of last names
+    """
+    if name_suffixes is None:
+        name_suffixes = NAME_SUFFIXES
+    full_names = full_names.astype(str)
+    split = full_names.str.extract(r'^(?:(.*) )?([^ ]*)$', flags=re.DOTALL)
+    first_names, last_names = split[0].fillna(''), split[1].fillna('')
+    has_suffix = last_names.str.lower().isin(list(name_suffixes))
+    if has_suffix.any():
+        split = full_names[has_suffix].str.extract(r'^(?:(.*) )?([^ ]*) ([^ ]*)$', flags=re.DOTALL)
+        first_names[has_suffix] = split[0].fillna('')
+        last_names[has_suffix] = (split[1] + ' ' + split[2]).fillna(full_names[has_suffix])
+    return first_names.tolist(), last_names.tolist()
+
+
+def make_session(pool_connections: int = 10, pool_maxsize: int = 10) -> 'requests.Session':
+    """
+    Return a requests.Session that keeps connections alive and reuses them.
+
+    :param pool_connections: number of hosts to keep connection pools for
+    :param pool_maxsize: connections kept open (and used at once) per host
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def find_tags(html_data: str, args: Iterable = (), kwargs: Optional[dict] = None) -> 'ResultSet':
+    """
+    Return the specified found tags in html_data
     Provided args and kwargs are directly passed as if in a BeautifulSoup.find_all function
 
-    :param url: url of html text to pull
-    :param args: args to filter the iterator by
-    :param kwargs: key-value pairs to filter the iterator by
+    :param html_data: html text to search
+    :param args: args to filter the tags by
+    :param kwargs: key-value pairs to filter the tags by
     """
+    from bs4 import BeautifulSoup, SoupStrainer
+
     if not args:
         args = 'div',
     if kwargs is None:
         kwargs = {'class_': 'ListVerticalImage-items-item'}
 
-    with requests.get(url) as request:
-        html_data = request.text
-    bs = BeautifulSoup(html_data, 'html.parser')
+    strainer = None
+    if len(args) <= 2 and not _FIND_ALL_ONLY_KWARGS.intersection(kwargs):
+        strainer = SoupStrainer(*args, **kwargs)
+    bs = BeautifulSoup(html_data, 'html.parser', parse_only=strainer)
     return bs.find_all(*args, **kwargs)
 
 
+def open_url(url: str, session: Optional['requests.Session'] = None, cache: Optional['ResponseCache'] = None,
+             stream: bool = False, scheduler: Optional[RequestScheduler] = None) -> 'requests.Response':
+    """
+    Return the response to a GET request of url (use it as a context manager).
+    With a cache, a stored response is reused whenever it is fresh or the server confirms it is unchanged
+
+    :param url: url to pull
+    :param session: session to send the request with. If None, a one-off request is made
+    :param cache: cache to reuse and store responses in. If None, nothing is cached
+    :param stream: do not download the body until it is read
+    :param scheduler: scheduler limiting and retrying the request. If None, the default_scheduler is used
+    """
+    if cache is not None:
+        return cache.open(url, session=session, stream=stream, scheduler=scheduler)
+    if scheduler is None:
+        scheduler = default_scheduler()
+    return scheduler.get(url, session=session, stream=stream)
+
+
+def tag_iterator(url: str, args: Iterable = (), kwargs: Optional[dict] = None,
+                 session: Optional['requests.Session'] = None, cache: Optional['ResponseCache'] = None,
+                 scheduler: Optional[RequestScheduler] = None) -> 'ResultSet':
+    """
+    Return an iterable of the specified found tags in the html found at url
+    Provided args and kwargs are directly passed as if in a BeautifulSoup.find_all function
+    Raises requests.HTTPError if the response status is not a success
+
+    :param url: url of html text to pull
+    :param args: args to filter the iterator by
+    :param kwargs: key-value pairs to filter the iterator by
+    :param session: session to send the request with. If None, a one-off request is made
+    :param cache: cache to reuse and store responses in. If None, nothing is cached
+    :param scheduler: scheduler limiting and retrying the request. If None, the default_scheduler is used
+    """
+    with instrument.timer('fetch', url=url):
+        with open_url(url, session=session, cache=cache, scheduler=scheduler) as request:
+            request.raise_for_status()
+            html_data = request.text
+    instrument.count('page_bytes_fetched', len(request.content), url=url)
+    with instrument.timer('parse', url=url):
+        tags = find_tags(html_data, args, kwargs)
+    instrument.count('tags_found', len(tags), url=url)
+    return tags
+
+
+def iter_tags(url: str, class_: str, name: Optional[str] = 'div', session: Optional['requests.Session'] = None,
+              chunk_size: int = STREAM_CHUNK_SIZE, cache: Optional['ResponseCache'] = None,
+              scheduler: Optional[RequestScheduler] = None) -> Iterator['Tag']:
+    """
+    Yield each tag with the css class class_ in the html found at url, while the html is still downloading.
+    Tags are yielded in the same order (and with the same contents) as tag_iterator would return them,
+    but only one top-level matching tag is ever held in memory at once.
+    Raises requests.HTTPError if the response status is not a success
+
+    :param url: url of html text to pull
+    :param class_: css class every yielded tag has
+    :param name: tag name every yielded tag has. If None, any tag name matches
+    :param session: session to send the request with. If None, a one-off request is made
+    :param chunk_size: bytes read from the response at a time
+    :param cache: cache to reuse and store responses in. If None, nothing is cached
+    :param scheduler: scheduler limiting and retrying the request. If None, the default_scheduler is used
+    """
+    with open_url(url, session=session, cache=cache, stream=True, scheduler=scheduler) as request:
+        request.raise_for_status()
+        encoding = request.encoding if 'charset' in request.headers.get('content-type', '') else None
+        chunks = request.iter_content(chunk_size)
+        if not instrument.enabled():
+            yield from iter_tags_from_chunks(chunks, class_, name, encoding)
+            return
+        for tag in iter_tags_from_chunks(_counted_chunks(chunks, url), class_, name, encoding):
+            instrument.count('tags_found', url=url)
+            yield tag
+
+
+def _counted_chunks(chunks: Iterable[bytes], url: str) -> Iterator[bytes]:
+    """Yield every chunk, reporting its size to the page_bytes_fetched counter."""
+    for chunk in chunks:
+        instrument.count('page_bytes_fetched', len(chunk), url=url)
+        yield chunk
+
+
+def iter_tags_from_chunks(chunks: Iterable[bytes], class_: str, name: Optional[str] = 'div',
+                          encoding: Optional[str] = None) -> Iterator['Tag']:
+    """
+    Yield each tag with the css class class_ found in html as it arrives in chunks (see iter_tags).
+
+    :param chunks: consecutive pieces of an html document
+    :param class_: css class every yielded tag has
+    :param name: tag name every yielded tag has. If None, any tag name matches
+    :param encoding: encoding of chunks. If None, it is detected from the html
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    strainer = SoupStrainer(name, class_=class_)
+    open_matches = 0
+
+    def read_events() -> Iterator['Tag']:
+        nonlocal open_matches
+        for event, element in parser.read_events():
+            matches = _element_matches(element, class_, name)
+            if event == 'start':
+                open_matches += matches
+                continue
+            if matches:
+                open_matches -= 1
+                if not open_matches:
+                    html_data = etree.tostring(element, encoding='unicode', method='html', with_tail=False)
+                    yield from BeautifulSoup(html_data, 'lxml', parse_only=strainer).find_all(name, class_=class_)
+            if not open_matches:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from read_events()
+    parser.close()
+    yield from read_events()
+
+
+def _element_matches(element: 'etree.ElementBase', class_: str, name: Optional[str]) -> bool:
+    """Return True if the lxml element would be matched by BeautifulSoup.find_all(name, class_=class_)."""
+    if not isinstance(element.tag, str) or (name is not None and element.tag != name):
+        return False
+    classes = element.get('class', '')
+    return class_ in classes.split() or classes == class_
+
+
 def remove_prefix(input_string: str, prefix: str) -> str:
     """Return input_string but without prefix (if it exactly appears at the start of input_string)."""
     if prefix != input_string[0:len(prefix)]:
         return input_string
     return input_string[len(prefix):]
+
+
+def atomic_write(file_path: Path, data: bytes) -> None:
+    """Write data to file_path through a temporary file, so readers never see a partially written file."""
+    with NamedTemporaryFile('wb', dir=file_path.parent, delete=False, suffix='.tmp') as file:
+        file.write(data)
+    replace(file.name, file_path)
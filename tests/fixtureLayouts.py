@@ -0,0 +1,84 @@
+"""
+Directory layouts shared by the offline tests and the benchmarks: Employee subclasses matching each recorded fixture,
+synthetic pages scaled up from them, and a generator of large csv files.
+"""
+from src.brightspot_employee import Employee, EmployeeProcessor, util
+from tests.fixtureServer import fixture_text
+
+from bs4.element import Tag as BeautifulSoup_Tag
+
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Type
+import random
+
+BUILDINGS = ('Joseph Smith Building', 'Heber J. Grant Building', 'TMCB', 'JFSB', 'MARB')
+
+
+class ReligionEmployee(Employee):
+    processor = EmployeeProcessor('PromoVerticalImage', 'ListVerticalImage-items-item')
+
+
+class CompSciProcessor(EmployeeProcessor):
+    NAME_SEARCH_TEXT = '-title'
+
+    def __init__(self, container: str = 'card', super_container: Optional[str] = None):
+        super().__init__(container, super_container)
+
+    def process_job_title(self, tag: BeautifulSoup_Tag, search_text: str = 'subtitle') -> str:
+        return super().process_job_title(tag, search_text)
+
+    def process_full_name(self, tag: BeautifulSoup_Tag, search_text: Optional[str] = NAME_SEARCH_TEXT) -> str:
+        if search_text is None:
+            search_text = self.NAME_SEARCH_TEXT
+        return tag.find('div', class_=(self.container + search_text)).text.replace(u'\xa0', u' ')
+
+    def process_page_url(self, tag: BeautifulSoup_Tag, search_text: str = 'btn accent') -> str:
+        return super().process_page_url(tag, search_text)
+
+
+class CompSciEmployee(Employee):
+    processor = CompSciProcessor()
+
+
+class HistoryEmployee(Employee):
+    processor = EmployeeProcessor('PromoIconOnTopLarge', 'List-items-item')
+
+
+class Layout(NamedTuple):
+    fixture: str
+    employee_cls: Type[Employee]
+
+
+LAYOUTS = {
+    'default': Layout('religion_directory.html', ReligionEmployee),
+    'promo_icon_on_top_large': Layout('history_directory.html', HistoryEmployee),
+    'cs_card': Layout('cs_directory.html', CompSciEmployee),
+}  # type: Dict[str, Layout]
+
+
+def scaled_page(layout: Layout, cards: int) -> str:
+    """
+    Return a directory page of the layout holding cards employee cards,
+    made by repeating the cards of its fixture (each copy linking to its own profile pages).
+    """
+    items = [str(tag) for tag in util.find_tags(fixture_text(layout.fixture),
+                                                kwargs={'class_': layout.employee_cls.processor.super_container})]
+    body = ''.join(items[index % len(items)].replace('/directory/', f'/directory/{index}/') for index in range(cards))
+    return f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="UTF-8"></head>\n<body>\n{body}\n</body>\n</html>\n'
+
+
+def write_csv(file_path: Path, rows: int, full_name: bool = False, seed: int = 0) -> None:
+    """Write a csv file of rows random employees, with a full_name column or first_name and last_name columns."""
+    from pandas import DataFrame
+
+    rng = random.Random(seed)
+    names = [(f'First{i}', f'Last{i}' + (' Jr.' if i % 17 == 0 else '')) for i in range(rows)]
+    columns = {'full_name': [f'{first} {last}' for first, last in names]} if full_name else {
+        'first_name': [first for first, _ in names], 'last_name': [last for _, last in names]}
+    columns['room'] = [f'Office: {rng.randint(100, 4999)}{rng.choice(("", "A"))} {rng.choice(BUILDINGS)}'
+                       for _ in range(rows)]
+    columns['page_url'] = [f'https://example.byu.edu/directory/person-{i}' for i in range(rows)]
+    columns['telephone'] = [f'801-422-{i % 10000:04d}' for i in range(rows)]
+    columns['department'] = [rng.choice(('History', 'Ancient Scripture')) for _ in range(rows)]
+    columns['job_title'] = [rng.choice(('Professor', 'Secretary')) for _ in range(rows)]
+    DataFrame(columns).to_csv(file_path)
@@ -0,0 +1,96 @@
+"""
+Local HTTP stand-in for BrightSpot websites, used by the offline tests.
+"""
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread, Lock
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+import time
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+
+
+def fixture_text(file_name: str) -> str:
+    """Return the contents of a file in the fixtures directory."""
+    return (FIXTURE_DIR / file_name).read_text(encoding='utf-8')
+
+
+def profile_page(image_url: str) -> str:
+    """Return the html of an employee profile page whose photo is at image_url."""
+    return fixture_text('profile_page.html').replace('{image_url}', image_url)
+
+
+def etag_route(body: Union[str, bytes], etag: str, content_type: str = 'text/html; charset=utf-8') -> Callable:
+    """Return a route serving body with an ETag, answering a matching If-None-Match with 304."""
+    body = body.encode('utf-8') if isinstance(body, str) else body
+
+    def route(handler):
+        if handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.end_headers()
+            return
+        handler.send_response(200)
+        handler.send_header('ETag', etag)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+    return route
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FixtureServer:
+    """
+    Serve fixed responses from a background thread.
+
+    Routes map a path to either a body (str/bytes, served with status 200)
+    or a callable taking the request handler, which writes its own response.
+    Every requested path is recorded in FixtureServer.requests.
+    """
+
+    def __init__(self, routes: Dict[str, Union[str, bytes, Callable]], delay: float = 0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []  # type: List[str]
+        self._lock = Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(self.path)
+                if server.delay:
+                    time.sleep(server.delay)
+                route = server.routes.get(self.path)
+                if route is None:
+                    self.send_error(404)
+                elif callable(route):
+                    route(self)
+                else:
+                    body = route.encode('utf-8') if isinstance(route, str) else route
+                    self.send_response(200)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path: str = '/') -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}{path}'
+
+    def __enter__(self) -> 'FixtureServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,34 @@
+from src.brightspot_employee import util
+from benchmarks import __main__ as runner
+from tests.fixtureLayouts import LAYOUTS, scaled_page
+
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import json
+import unittest
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_scaled_pages(self):
+        for name, layout in LAYOUTS.items():
+            with self.subTest(layout=name):
+                page = scaled_page(layout, 25)
+                tags = util.find_tags(page, kwargs={'class_': layout.employee_cls.processor.super_container})
+                self.assertEqual(len(tags), 25)
+                employees = layout.employee_cls.from_html_tags(tags)
+                self.assertTrue(employees)
+                self.assertEqual(len({employee.page_url for employee in employees}), len(employees))
+
+    def test_runner_writes_results(self):
+        with TemporaryDirectory() as temp_dir, redirect_stderr(StringIO()):
+            output = Path(temp_dir) / 'results.json'
+            runner.main(['pool', '--quick', '--output', str(output)])
+            report = json.loads(output.read_text(encoding='utf-8'))
+        self.assertEqual(list(report['results']), ['pool'])
+        self.assertGreater(report['results']['pool']['pool_tasks_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+from src.brightspot_employee import Employee, util
+from src.brightspot_employee.cache import DiskCache, CacheMissError, ResponseCache
+from src.brightspot_employee.pool import WorkerPool
+from src.brightspot_employee.room import Room
+from tests.fixtureLayouts import ReligionEmployee
+from tests.fixtureServer import FixtureServer, fixture_text, etag_route, profile_page
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = Path(temp_dir.name) / 'cache'
+        self.photo_dir = Path(temp_dir.name) / 'photos'
+        self.server = FixtureServer({'/religion': etag_route(fixture_text('religion_directory.html'), '"v1"'),
+                                     '/plain': fixture_text('cs_directory.html'),
+                                     '/img/alma.jpg': etag_route(b'\xff\xd8' + b'\x00' * 4096, '"img1"', 'image/jpeg')})
+        self.server.routes['/profile'] = profile_page(self.server.url('/img/alma.jpg'))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_conditional_revalidation(self):
+        cache = DiskCache(self.cache_dir)
+        url = self.server.url('/religion')
+        first = [str(e) for e in ReligionEmployee.from_website(url, cache=cache)]
+        second = [str(e) for e in ReligionEmployee.from_website(url, cache=cache)]
+        streamed = [str(e) for e in ReligionEmployee.iter_website(url, cache=cache)]
+        self.assertEqual(first, second)
+        self.assertEqual(first, streamed)
+        self.assertEqual((cache.stats.misses, cache.stats.revalidated, cache.stats.hits), (1, 2, 0))
+        self.assertEqual(self.server.requests.count('/religion'), 3)
+
+    def test_ttl_and_offline(self):
+        url = self.server.url('/plain')
+        DiskCache(self.cache_dir).open(url).content
+        fresh = DiskCache(self.cache_dir, ttl=60)
+        self.assertEqual(util.tag_iterator(url, cache=fresh), util.tag_iterator(url, cache=fresh))
+        self.assertEqual(fresh.stats.hits, 2)
+        self.assertEqual(self.server.requests.count('/plain'), 1)
+
+        offline = DiskCache(self.cache_dir, offline=True)
+        self.assertTrue(offline.open(url).from_cache)
+        self.assertRaises(CacheMissError, offline.open, self.server.url('/religion'))
+
+    def test_stats_from_threads(self):
+        url = self.server.url('/plain')
+        cache = DiskCache(self.cache_dir, ttl=60)
+        cache.open(url).content
+        with WorkerPool(8) as pool:
+            pool.map([cache.open] * 400, args=(url,))
+        self.assertEqual((cache.stats.misses, cache.stats.hits), (1, 400))
+        self.assertEqual(cache.stats.bytes_saved, 400 * cache.stats.bytes_downloaded)
+
+    def test_interface_is_abstract(self):
+        class NoClear(ResponseCache):
+            def load(self, url):
+                return None
+
+            def store(self, entry):
+                pass
+        self.assertRaises(TypeError, ResponseCache)
+        self.assertRaises(TypeError, NoClear)
+
+    def test_lru_eviction(self):
+        cache = DiskCache(self.cache_dir, max_size=4000)
+        for path in ('/religion', '/plain', '/religion'):
+            cache.open(self.server.url(path)).content
+        self.assertLessEqual(cache.size, 4000)
+        self.assertEqual(cache.stats.evicted, 2)
+        self.assertIsNone(cache.load(self.server.url('/plain')))
+        self.assertIsNotNone(cache.load(self.server.url('/religion')))
+
+    def test_download_photo(self):
+        cache = DiskCache(self.cache_dir)
+        self.server.routes['/profile'] = etag_route(self.server.routes['/profile'], '"p1"')
+        for _ in range(2):
+            employee = Employee('Alma', 'Jones', Room('JSB', 2, 270, 'F'), self.server.url('/profile'), '', '', '')
+            employee.download_photo(self.photo_dir, cache=cache)
+        self.assertEqual(cache.stats.revalidated, 1)
+        self.assertEqual(self.server.requests.count('/profile'), 2)
+
+        # the profile fetched by the last download is reused
+        employee.download_photo(self.photo_dir, cache=cache)
+        self.assertEqual(self.server.requests.count('/profile'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+from src.brightspot_employee.crawler import Crawler
+from tests.fixtureLayouts import CompSciEmployee, ReligionEmployee
+from tests.fixtureServer import FixtureServer, fixture_text
+
+import time
+import unittest
+
+
+class _SleepingCrawler(Crawler):
+    """Crawler whose pages each take 0.2 s and hold no employees, recording when each url finished."""
+
+    def process_url(self, url: str) -> list:
+        time.sleep(0.2)
+        self.finished[url] = time.monotonic()
+        return []
+
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FixtureServer({'/religion': fixture_text('religion_directory.html'),
+                                     '/cs': fixture_text('cs_directory.html')}, delay=0.05)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_from_websites_matches_from_website(self):
+        urls = [self.server.url('/religion'), self.server.url('/cs')]
+        results = ReligionEmployee.from_websites(urls)
+        self.assertEqual(list(results), urls)
+        self.assertTrue(results[urls[0]].ok)
+        self.assertEqual([str(e) for e in results[urls[0]].employees],
+                         [str(e) for e in ReligionEmployee.from_website(urls[0])])
+        self.assertEqual(len(results[urls[0]].employees), 3)
+        self.assertEqual(results[urls[1]].employees, [])
+
+    def test_subclass_processor(self):
+        url = self.server.url('/cs')
+        employees = CompSciEmployee.from_websites([url])[url].employees
+        self.assertEqual([(e.full_name, e.job_title) for e in employees],
+                         [('Ada Lovelace', 'Professor'), ('Alan Turing', 'Teaching Professor')])
+        self.assertTrue(all(isinstance(e, CompSciEmployee) for e in employees))
+
+    def test_error_does_not_abort_others(self):
+        urls = [self.server.url('/missing'), 'http://127.0.0.1:1/refused', self.server.url('/religion')]
+        results = ReligionEmployee.from_websites(urls)
+        self.assertFalse(results[urls[0]].ok)
+        self.assertEqual(results[urls[0]].error.response.status_code, 404)
+        self.assertIsNotNone(results[urls[1]].error)
+        self.assertTrue(results[urls[2]].ok)
+        self.assertEqual(len(results[urls[2]].employees), 3)
+
+    def test_iter_websites(self):
+        urls = [self.server.url('/religion')] * 3 + [self.server.url('/cs')]
+        pairs = list(CompSciEmployee.iter_websites(urls))
+        self.assertEqual({url for url, _ in pairs}, {self.server.url('/cs')})
+        self.assertEqual(len(pairs), 2)
+        self.assertEqual(self.server.requests.count('/religion'), 1)
+
+    def test_iter_websites_errors(self):
+        errors = dict()
+        urls = [self.server.url('/missing'), self.server.url('/religion')]
+        pairs = list(ReligionEmployee.iter_websites(urls, errors=errors))
+        self.assertEqual(len(pairs), 3)
+        self.assertEqual(list(errors), [self.server.url('/missing')])
+
+    def test_busy_host_does_not_starve_others(self):
+        urls = [f'http://a.example/{n}' for n in range(30)] + [f'http://b.example/{n}' for n in range(4)]
+        with _SleepingCrawler(limit=6, per_host_limit=2) as crawler:
+            crawler.finished = dict()
+            start = time.monotonic()
+            results = crawler.run(urls)
+        self.assertTrue(all(result.ok for result in results.values()))
+        # host b gets its 2 slots right away, so its 4 pages take 2 rounds of 0.2 s
+        self.assertLess(max(crawler.finished[url] for url in urls[30:]) - start, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
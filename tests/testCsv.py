@@ -0,0 +1,84 @@
+from src.brightspot_employee import Employee, EmployeeAttributes
+from src.brightspot_employee.room import Room
+from tests.fixtureLayouts import write_csv
+
+from pandas import DataFrame, read_csv
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import gzip
+import tracemalloc
+import unittest
+
+
+def generated_employees(count: int):
+    for index in range(count):
+        yield Employee(f'First{index}', f'Last{index}', Room.from_string(f'{100 + index % 900} JSB'),
+                       f'/person-{index}', f'801-422-{index % 10000:04d}', 'History', 'Professor')
+
+
+class TestBulkCsv(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name)
+
+    def test_matches_per_row(self):
+        for full_name in (False, True):
+            file_path = self.dir / f'{full_name}.csv'
+            write_csv(file_path, 500, full_name=full_name)
+            expected = [str(Employee.from_named_tuple(row))
+                        for row in read_csv(file_path, keep_default_na=False).itertuples()]
+            for engine in ('csv', 'pandas'):
+                with self.subTest(full_name=full_name, engine=engine):
+                    self.assertEqual([str(e) for e in Employee.from_csv(file_path, engine=engine)], expected)
+                    self.assertEqual([str(e) for e in Employee.from_csv(file_path, 64, engine)], expected)
+
+    def test_same_format_as_pandas(self):
+        employees = [Employee('Alma', 'Jones', Room.from_string('270F JSB'), '/alma', '801-422-1111', 'History',
+                              'Professor, "Emeritus"'),
+                     Employee('Eliza', 'Snow', Room('', '', ''), '/eliza', '', 'Church History\nand Doctrine', '')]
+        file_path = self.dir / 'employees.csv'
+        Employee.to_csv(file_path, employees)
+        Employee.to_csv(file_path, employees[:1], append=True, first_index=2)
+
+        pandas_path = self.dir / 'pandas.csv'
+        dataframe = DataFrame.from_records({k: getattr(e, k) for k in EmployeeAttributes._fields}
+                                           for e in employees + employees[:1])
+        dataframe.to_csv(pandas_path)
+        self.assertEqual(file_path.read_bytes(), pandas_path.read_bytes())
+        self.assertEqual([str(e) for e in Employee.from_csv(file_path)], [str(e) for e in employees + employees[:1]])
+
+    def test_chunks(self):
+        file_path = self.dir / 'employees.csv'
+        write_csv(file_path, 250)
+        self.assertEqual([len(chunk) for chunk in Employee.iter_csv_chunks(file_path, 100)], [100, 100, 50])
+
+    def test_stream_gzip(self):
+        plain, compressed = self.dir / 'employees.csv', self.dir / 'employees.csv.gz'
+        Employee.to_csv(plain, generated_employees(250))
+        self.assertEqual(Employee.write_csv_stream(compressed, generated_employees(250), batch_size=64), 250)
+        self.assertEqual(gzip.decompress(compressed.read_bytes()), plain.read_bytes())
+        self.assertEqual(Employee.write_csv_stream(compressed, generated_employees(5), append=True, first_index=250), 5)
+
+        expected = [str(e) for e in generated_employees(250)] + [str(e) for e in generated_employees(5)]
+        for engine in ('csv', 'pandas'):
+            with self.subTest(engine=engine):
+                self.assertEqual([str(e) for e in Employee.iter_csv(compressed, 100, engine)], expected)
+        self.assertEqual(len(read_csv(compressed, keep_default_na=False)), 255)
+
+    def test_stream_memory_is_flat(self):
+        file_path = self.dir / 'employees.csv'
+        peaks = []
+        for count in (2000, 20000):
+            tracemalloc.start()
+            Employee.write_csv_stream(file_path, generated_employees(count), batch_size=500)
+            for _ in Employee.iter_csv(file_path, chunksize=500):
+                pass
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+from pathlib import Path
+import json
+import subprocess
+import sys
+import unittest
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ('pandas', 'requests', 'bs4', 'lxml')
+
+
+def _run(code: str) -> dict:
+    """Run code in a fresh interpreter and return the json it prints."""
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE, check=True,
+                            universal_newlines=True).stdout
+    return json.loads(output)
+
+
+def _import_seconds(modules: str) -> float:
+    code = f'import json, time\nstart = time.perf_counter()\nimport {modules}\n' \
+           f'print(json.dumps(time.perf_counter() - start))'
+    return min(_run(code) for _ in range(3))
+
+
+class TestImport(unittest.TestCase):
+    def test_heavy_modules_are_lazy(self):
+        code = '''if True:
+            import json, sys, tempfile
+            from pathlib import Path
+            from src.brightspot_employee import Employee
+            from src.brightspot_employee.room import Room
+            imported = [sorted(m for m in %r if m in sys.modules)]
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = Path(temp_dir) / 'employees.csv'
+                Employee.to_csv(file_path, [Employee('Alma', 'Jones', Room.from_string('270F JSB'), '', '', '', '')])
+                Employee.from_csv(file_path)
+            imported.append(sorted(m for m in %r if m in sys.modules))
+            print(json.dumps(imported))
+        ''' % (HEAVY_MODULES, HEAVY_MODULES)
+        self.assertEqual(_run(code), [[], []])
+
+    def test_import_time(self):
+        package = _import_seconds('src.brightspot_employee')
+        heavy = _import_seconds(', '.join(HEAVY_MODULES))
+        self.assertLess(package, heavy, f'import src.brightspot_employee: {package * 1e3:.1f} ms '
+                                        f'(importing {", ".join(HEAVY_MODULES)}: {heavy * 1e3:.1f} ms)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+from src.brightspot_employee import Employee, util
+from src.brightspot_employee.index import EmployeeIndex
+from src.brightspot_employee.room import Room
+
+import unittest
+
+
+def _employee(full_name: str, room: str, telephone: str, department: str, job_title: str = 'Professor'):
+    first_name, last_name = util.split_name(full_name)
+    return Employee(first_name, last_name, Room.from_string(room), f'https://example.byu.edu/{last_name}',
+                    telephone, department, job_title)
+
+
+class TestEmployeeIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.alma = _employee('Alma Jones', '2f 270F JSB', '(801) 422-1111', 'Church History and Doctrine')
+        self.brigham = _employee('Brigham Young Carter Jr.', '3f 310 JSB', '801-422-2222', 'Ancient Scripture')
+        self.eliza = _employee('Eliza Snow', '1f 110 HGB', '801-422-3333', 'Church History and Doctrine',
+                               'Secretary')
+        self.alice = _employee('Alice Jonas', '2f 220 JSB', '801-422-4444', 'Ancient Scripture')
+        self.index = EmployeeIndex([self.alma, self.brigham, self.eliza, self.alice])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.index.search('jon'), [self.alma, self.alice])
+        self.assertEqual(self.index.search('AL', 'first_name'), [self.alma, self.alice])
+        self.assertEqual(self.index.search('carter j', 'last_name'), [self.brigham])
+        self.assertEqual(self.index.search('brigham  young c', 'full_name'), [self.brigham])
+        self.assertEqual(self.index.search('alma '), [self.alma])
+        self.assertEqual(self.index.search('zed'), [])
+        self.assertEqual(len(self.index.search('')), 4)
+
+    def test_lookups(self):
+        self.assertEqual(self.index.lookup('department', 'Ancient Scripture'), [self.brigham, self.alice])
+        self.assertEqual(self.index.lookup('job_title', 'Secretary'), [self.eliza])
+        self.assertEqual(self.index.lookup('telephone', '801.422.1111'), [self.alma])
+        self.assertEqual(self.index.by_room('JSB'), [self.alma, self.brigham, self.alice])
+        self.assertEqual(self.index.by_room('JSB', 2), [self.alma, self.alice])
+        self.assertEqual(list(self.index.group_by('building')), ['HGB', 'JSB'])
+        with self.assertRaises(ValueError):
+            self.index.lookup('page_url', '')
+
+    def test_incremental_updates(self):
+        self.index.remove(self.alma)
+        self.assertNotIn(self.alma, self.index)
+        self.assertEqual(self.index.search('jon'), [self.alice])
+        self.assertEqual(self.index.by_room('JSB', 2), [self.alice])
+        self.index.remove(self.alice)
+        self.assertEqual(self.index.search('jo'), [])
+        self.assertEqual(self.index.search('al'), [])
+        with self.assertRaises(KeyError):
+            self.index.remove(self.alice)
+
+        self.index.add(self.alma)
+        self.index.add(self.alma)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search('jones'), [self.alma])
+        self.assertEqual(list(self.index), [self.brigham, self.eliza, self.alma])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+from src.brightspot_employee import Employee, instrument
+from tests.fixtureLayouts import ReligionEmployee
+from tests.fixtureServer import FixtureServer, fixture_text
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self) -> None:
+        self.page = fixture_text('religion_directory.html')
+        self.server = FixtureServer({'/religion': self.page})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_from_website_metrics(self):
+        with instrument.Metrics() as metrics:
+            employees = ReligionEmployee.from_website(self.server.url('/religion'))
+        self.assertEqual(len(employees), 3)
+        self.assertEqual(metrics.counters['tags_found'], 4)
+        self.assertEqual(metrics.counters['tags_dropped'], 1)
+        self.assertEqual(metrics.counters['page_bytes_fetched'], len(self.page.encode('utf-8')))
+        for stage in ('fetch', 'parse', 'from_website', 'extract.find', 'extract.room', 'extract.job_title'):
+            self.assertIn(stage, metrics.timings)
+        self.assertEqual(metrics.timings['from_website'].count, 1)
+        self.assertEqual(metrics.timings['from_html_tag'].count, 4)
+        self.assertEqual(metrics.timings['extract.job_title'].count, 3)
+
+    def test_streaming_and_csv_counters(self):
+        with instrument.Metrics() as metrics, TemporaryDirectory() as temp_dir:
+            employees = list(ReligionEmployee.iter_website(self.server.url('/religion')))
+            file_path = Path(temp_dir) / 'employees.csv'
+            Employee.to_csv(file_path, employees)
+            Employee.from_csv(file_path)
+        self.assertEqual(metrics.counters['tags_found'], 4)
+        self.assertEqual(metrics.counters['page_bytes_fetched'], len(self.page.encode('utf-8')))
+        self.assertEqual(metrics.counters['csv_rows_written'], 3)
+        self.assertEqual(metrics.counters['csv_rows_read'], 3)
+        self.assertEqual(metrics.timings['to_csv'].count, 1)
+
+    def test_listeners(self):
+        events = []
+        instrument.add_listener(events.append)
+        try:
+            ReligionEmployee.from_website(self.server.url('/religion'))
+        finally:
+            instrument.remove_listener(events.append)
+        self.assertFalse(instrument.enabled())
+        self.assertIn(('count', 'tags_dropped', 1), [event[:3] for event in events])
+        fetch = next(event for event in events if event.name == 'fetch')
+        self.assertEqual(fetch.labels, {'url': self.server.url('/religion')})
+
+        reported = len(events)
+        ReligionEmployee.from_website(self.server.url('/religion'))
+        self.assertEqual(len(events), reported)
+
+
+if __name__ == '__main__':
+    unittest.main()
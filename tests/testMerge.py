@@ -0,0 +1,52 @@
+from src.brightspot_employee import Employee
+from src.brightspot_employee.merge import identity_key, merge, merge_pairs, prefer_longest
+from src.brightspot_employee.room import Room
+
+import unittest
+
+DEPARTMENT = 'https://history.byu.edu/directory'
+COLLEGE = 'https://fhss.byu.edu/directory'
+STAFF = 'https://byu.edu/staff'
+
+
+def alma(page_url: str = 'https://history.byu.edu/directory/alma-jones', room: Room = None,
+         telephone: str = '801-422-1111', job_title: str = 'Professor') -> Employee:
+    return Employee('Alma', 'Jones', room or Room('', '', ''), page_url, telephone, 'History', job_title)
+
+
+class TestMerge(unittest.TestCase):
+    def test_identity_key(self):
+        self.assertEqual(identity_key(alma('https://www.History.BYU.edu/directory/alma-jones/?from=list#bio')),
+                         identity_key(alma('http://history.byu.edu/directory/alma-jones')))
+        self.assertEqual(identity_key(alma('', telephone='(801) 422-1111')),
+                         identity_key(Employee('alma ', ' JONES', Room('', '', ''), '', '8014221111', '', '')))
+
+    def test_field_resolution_and_sources(self):
+        department = [alma(job_title='')]
+        college = [alma('https://www.history.byu.edu/directory/alma-jones/', room=Room.from_string('270F JSB'))]
+        staff = [alma('', job_title='Professor of History'), alma('', telephone='801-422-9999')]
+        merged = merge({DEPARTMENT: department, COLLEGE: college, STAFF: staff})
+
+        self.assertEqual(len(merged), 2)
+        employee, sources = merged[0]
+        self.assertEqual(sources, (DEPARTMENT, COLLEGE, STAFF))
+        self.assertEqual(str(employee.room), str(Room.from_string('270F JSB')))
+        self.assertEqual(employee.job_title, 'Professor')
+        self.assertEqual(employee.page_url, department[0].page_url)
+        self.assertEqual(department[0].job_title, '')
+        self.assertEqual(merged[1].sources, (STAFF,))
+
+    def test_url_less_first_and_other_urls(self):
+        pairs = [(STAFF, alma('')), (DEPARTMENT, alma()),
+                 (COLLEGE, alma('https://fhss.byu.edu/directory/alma-jones-2'))]
+        merged = merge_pairs(pairs, resolvers={'job_title': prefer_longest})
+        self.assertEqual([m.sources for m in merged], [(STAFF, DEPARTMENT), (COLLEGE,)])
+        self.assertEqual(merged[0].employee.page_url, alma().page_url)
+
+    def test_nameless_never_match(self):
+        nameless = Employee('', '', Room('', '', ''), '', '', '', '')
+        self.assertEqual(len(merge({DEPARTMENT: [nameless, nameless], COLLEGE: [nameless]})), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+from src.brightspot_employee import Employee, EmployeeProcessor, util
+from src.brightspot_employee.parallel import ParsePool, parse_page
+from tests.fixtureLayouts import CompSciEmployee, HistoryEmployee, ReligionEmployee
+from tests.fixtureServer import FixtureServer, fixture_text
+
+import multiprocessing
+import pickle
+import unittest
+
+
+class RuntimeEmployee(Employee):
+    pass  # its processor is only assigned at runtime, so spawned workers importing this module never see it
+
+
+class ShoutingEmployee(ReligionEmployee):
+    @classmethod
+    def from_html_tag(cls, tag):
+        employee = super().from_html_tag(tag)
+        employee.job_title = employee.job_title.upper()
+        return employee
+
+
+class TestParsePool(unittest.TestCase):
+    def test_matches_from_html_tags(self):
+        pages = [('religion_directory.html', ReligionEmployee), ('cs_directory.html', CompSciEmployee),
+                 ('history_directory.html', HistoryEmployee)]
+        for file_name, employee_cls in pages:
+            html_data = fixture_text(file_name)
+            tags = util.find_tags(html_data, kwargs={'class_': employee_cls.processor.super_container})
+            expected = [str(employee) for employee in employee_cls.from_html_tags(tags)]
+            with self.subTest(page=file_name), ParsePool(employee_cls, processes=2) as pool:
+                employees = pool.parse(html_data)
+                self.assertEqual([str(employee) for employee in employees], expected)
+                self.assertTrue(all(type(employee) is employee_cls for employee in employees))
+                self.assertEqual([len(employees) for employees in pool.map([html_data] * 3)], [len(expected)] * 3)
+
+    def test_records_are_plain_tuples(self):
+        records = parse_page(ReligionEmployee, fixture_text('religion_directory.html'))
+        self.assertEqual(records[0][:3], ('Alma', 'Jones', ('JSB', '2', '270', 'F')))
+        self.assertEqual(pickle.loads(pickle.dumps(records)), records)
+
+    def test_crawler_with_processes(self):
+        with FixtureServer({'/religion': fixture_text('religion_directory.html')}) as server:
+            url = server.url('/religion')
+            results = ReligionEmployee.from_websites([url], processes=2)
+        self.assertEqual([str(e) for e in results[url].employees],
+                         [str(e) for e in ReligionEmployee.from_html_tags(util.find_tags(
+                             fixture_text('religion_directory.html'),
+                             kwargs={'class_': ReligionEmployee.processor.super_container}))])
+
+    def test_runtime_processor_with_spawn(self):
+        RuntimeEmployee.processor = EmployeeProcessor('PromoVerticalImage', 'ListVerticalImage-items-item')
+        self.addCleanup(delattr, RuntimeEmployee, 'processor')
+        html_data = fixture_text('religion_directory.html')
+        with ParsePool(RuntimeEmployee, processes=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            employees = pool.parse(html_data)
+        self.assertEqual([str(employee) for employee in employees],
+                         [str(employee) for employee in ReligionEmployee.from_html_tags(util.find_tags(
+                             html_data, kwargs={'class_': ReligionEmployee.processor.super_container}))])
+
+    def test_workers_use_from_html_tag(self):
+        html_data = fixture_text('religion_directory.html')
+        tags = util.find_tags(html_data, kwargs={'class_': ShoutingEmployee.processor.super_container})
+        expected = [employee.job_title for employee in ShoutingEmployee.from_html_tags(tags)]
+        self.assertIn('PROFESSOR', expected)
+        with ParsePool(ShoutingEmployee, processes=1) as pool:
+            self.assertEqual([employee.job_title for employee in pool.parse(html_data)], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
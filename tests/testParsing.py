@@ -0,0 +1,84 @@
+from src.brightspot_employee import util
+from tests.fixtureLayouts import ReligionEmployee, CompSciEmployee
+from tests.fixtureServer import FixtureServer, fixture_text
+
+from threading import Event
+import unittest
+
+
+def legacy_fields(processor, tag):
+    first_name, last_name = processor.process_split_name(tag)
+    return (first_name, last_name, str(processor.process_room(tag)), processor.process_page_url(tag),
+            processor.process_telephone(tag), processor.process_department(tag), processor.process_job_title(tag))
+
+
+class TestStreamingParser(unittest.TestCase):
+    def test_matches_find_all(self):
+        for file_name, class_ in (('religion_directory.html', 'ListVerticalImage-items-item'),
+                                  ('religion_directory.html', 'ListVerticalImage-items'),
+                                  ('religion_directory.html', 'Link'),
+                                  ('cs_directory.html', 'card')):
+            html_data = fixture_text(file_name)
+            data = html_data.encode('utf-8')
+            with self.subTest(file_name=file_name, class_=class_):
+                expected = util.find_tags(html_data, (None,), {'class_': class_})
+                chunks = (data[i:i + 64] for i in range(0, len(data), 64))
+                streamed = list(util.iter_tags_from_chunks(chunks, class_, name=None))
+                self.assertEqual([t.get_text(' ', strip=True) for t in streamed],
+                                 [t.get_text(' ', strip=True) for t in expected])
+
+    def test_iter_website_matches_from_website(self):
+        with FixtureServer({'/religion': fixture_text('religion_directory.html'),
+                            '/cs': fixture_text('cs_directory.html')}) as server:
+            for cls, path in ((ReligionEmployee, '/religion'), (CompSciEmployee, '/cs')):
+                with self.subTest(cls=cls.__name__):
+                    self.assertEqual([str(e) for e in cls.iter_website(server.url(path))],
+                                     [str(e) for e in cls.from_website(server.url(path))])
+
+    def test_first_employee_before_body_finishes(self):
+        data = fixture_text('religion_directory.html').encode('utf-8')
+        split = data.index(b'<div class="ListVerticalImage-items-item">', 2000)
+        release = Event()
+
+        def gated(handler):
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'text/html; charset=utf-8')
+            handler.end_headers()
+            handler.wfile.write(data[:split])
+            handler.wfile.flush()
+            release.wait(5)
+            handler.wfile.write(data[split:])
+
+        with FixtureServer({'/religion': gated}) as server:
+            tags = util.iter_tags(server.url('/religion'), 'ListVerticalImage-items-item', chunk_size=512)
+            first = next(tags)
+            self.assertFalse(release.is_set())
+            release.set()
+            self.assertEqual(len(list(tags)), 3)
+        self.assertIn('270F Joseph Smith', first.get_text(' ', strip=True))
+
+
+class TestExtractionPlan(unittest.TestCase):
+    def assert_matches_process_methods(self, cls, file_name):
+        tags = util.find_tags(fixture_text(file_name), kwargs={'class_': cls.processor.super_container})
+        self.assertGreater(len(tags), 0)
+        for tag in tags:
+            try:
+                expected = legacy_fields(cls.processor, tag)
+            except AttributeError:
+                self.assertRaises(AttributeError, cls.processor.extract, tag)
+                continue
+            fields = cls.processor.extract(tag)
+            self.assertEqual(fields._replace(room=str(fields.room)), expected)
+
+    def test_default_processor(self):
+        self.assert_matches_process_methods(ReligionEmployee, 'religion_directory.html')
+
+    def test_overridden_process_methods(self):
+        self.assertEqual(CompSciEmployee.processor.compile().native_fields,
+                         {'room', 'telephone', 'department'})
+        self.assert_matches_process_methods(CompSciEmployee, 'cs_directory.html')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+from src.brightspot_employee import Employee
+from src.brightspot_employee.photos import PhotoDownloader
+from src.brightspot_employee.room import Room
+from src.brightspot_employee.scheduler import RequestScheduler
+from tests.fixtureServer import FixtureServer, profile_page
+
+from requests import HTTPError
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+import time
+import unittest
+
+LAST_MODIFIED = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+IMAGE = bytes(range(256)) * 4096
+
+
+def image_route(body: bytes, etag: Optional[str], fail_first_at: int = 0, last_modified: Optional[str] = None,
+                range_shift: int = 0):
+    """
+    Return a route serving body with ETag (and Last-Modified) and Range support, cutting its first response off after
+    fail_first_at bytes. Ranges are served range_shift bytes early. Every Range request is recorded in route.ranges
+    as (Range, If-Range)
+    """
+    failures = [fail_first_at] if fail_first_at else []
+    validator = etag or last_modified
+
+    def route(handler):
+        if etag and handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.end_headers()
+            return
+        start = 0
+        range_header = handler.headers.get('Range')
+        if range_header:
+            route.ranges.append((range_header, handler.headers.get('If-Range')))
+        if range_header and handler.headers.get('If-Range', validator) == validator:
+            start = int(range_header[len('bytes='):].rstrip('-')) - range_shift
+            handler.send_response(206)
+            handler.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        else:
+            handler.send_response(200)
+        if etag:
+            handler.send_header('ETag', etag)
+        if last_modified:
+            handler.send_header('Last-Modified', last_modified)
+        handler.send_header('Content-Length', str(len(body) - start))
+        handler.end_headers()
+        if failures:
+            handler.wfile.write(body[start:failures.pop()])
+            handler.close_connection = True
+            return
+        handler.wfile.write(body[start:])
+    route.ranges = []
+    return route
+
+
+class TestPhotoDownloader(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name)
+        self.server = FixtureServer({'/a.jpg': image_route(IMAGE, '"a"'),
+                                     '/copy.jpg': image_route(IMAGE, '"copy"'),
+                                     '/flaky.jpg': image_route(IMAGE, '"flaky"', fail_first_at=100000)})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_skip_unchanged(self):
+        with PhotoDownloader(self.dir / 'store') as downloader:
+            first = downloader.download(self.server.url('/a.jpg'), self.dir / 'a.jpg')
+        with PhotoDownloader(self.dir / 'store') as downloader:
+            second = downloader.download(self.server.url('/a.jpg'), self.dir / 'a.jpg')
+        self.assertTrue(first.downloaded)
+        self.assertFalse(second.downloaded)
+        self.assertEqual((self.dir / 'a.jpg').read_bytes(), IMAGE)
+
+    def test_identical_images_stored_once(self):
+        with PhotoDownloader(self.dir / 'store') as downloader:
+            downloader.download(self.server.url('/a.jpg'), self.dir / 'one' / 'a.jpg')
+            copy = downloader.download(self.server.url('/copy.jpg'), self.dir / 'two' / 'copy.jpg')
+        self.assertTrue(copy.deduplicated)
+        self.assertEqual(len(list((self.dir / 'store' / 'objects').rglob('*.jpg'))), 1)
+        self.assertEqual((self.dir / 'two' / 'copy.jpg').read_bytes(), IMAGE)
+        self.assertEqual(list(self.dir.rglob('*.part')), [])
+
+    def test_resume_after_interruption(self):
+        with PhotoDownloader(self.dir / 'store', chunk_size=10000, backoff=0) as downloader:
+            result = downloader.download(self.server.url('/flaky.jpg'), self.dir / 'flaky.jpg')
+        self.assertEqual((self.dir / 'flaky.jpg').read_bytes(), IMAGE)
+        self.assertEqual(result.size, len(IMAGE))
+        self.assertEqual(self.server.requests.count('/flaky.jpg'), 2)
+        self.assertEqual(self.server.routes['/flaky.jpg'].ranges, [('bytes=100000-', '"flaky"')])
+
+    def test_resume_with_last_modified(self):
+        route = image_route(IMAGE, None, fail_first_at=100000, last_modified=LAST_MODIFIED)
+        self.server.routes['/dated.jpg'] = route
+        with PhotoDownloader(self.dir / 'store', chunk_size=10000, backoff=0) as downloader:
+            downloader.download(self.server.url('/dated.jpg'), self.dir / 'dated.jpg')
+        self.assertEqual((self.dir / 'dated.jpg').read_bytes(), IMAGE)
+        self.assertEqual(route.ranges, [('bytes=100000-', LAST_MODIFIED)])
+
+    def test_restart_without_validators(self):
+        route = image_route(IMAGE, None, fail_first_at=100000)
+        self.server.routes['/plain.jpg'] = route
+        with PhotoDownloader(self.dir / 'store', chunk_size=10000, backoff=0) as downloader:
+            result = downloader.download(self.server.url('/plain.jpg'), self.dir / 'plain.jpg')
+        self.assertEqual((self.dir / 'plain.jpg').read_bytes(), IMAGE)
+        self.assertEqual(result.size, len(IMAGE))
+        self.assertEqual(route.ranges, [])
+
+    def test_restart_on_misplaced_range(self):
+        route = image_route(IMAGE, '"shifted"', fail_first_at=100000, range_shift=10)
+        self.server.routes['/shifted.jpg'] = route
+        with PhotoDownloader(self.dir / 'store', chunk_size=10000, backoff=0) as downloader:
+            result = downloader.download(self.server.url('/shifted.jpg'), self.dir / 'shifted.jpg')
+        self.assertEqual((self.dir / 'shifted.jpg').read_bytes(), IMAGE)
+        self.assertEqual(result.size, len(IMAGE))
+        self.assertEqual(self.server.requests.count('/shifted.jpg'), 3)
+
+    def test_unexpected_not_modified(self):
+        def not_modified(handler):
+            handler.send_response(304)
+            handler.end_headers()
+        self.server.routes['/unmodified.jpg'] = not_modified
+        with PhotoDownloader(self.dir / 'store') as downloader:
+            with self.assertRaises(HTTPError):
+                downloader.download(self.server.url('/unmodified.jpg'), self.dir / 'unmodified.jpg')
+
+    def test_error_status_is_only_retried_by_scheduler(self):
+        def failing(handler):
+            handler.send_response(500)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+        self.server.routes['/failing.jpg'] = failing
+        scheduler = RequestScheduler(retries=3, backoff=0)
+        with PhotoDownloader(self.dir / 'store', backoff=0, scheduler=scheduler) as downloader:
+            with self.assertRaises(HTTPError):
+                downloader.download(self.server.url('/failing.jpg'), self.dir / 'failing.jpg')
+        self.assertEqual(self.server.requests.count('/failing.jpg'), 4)
+
+    def test_download_all_photos(self):
+        employees = []
+        for name in ('a', 'copy'):
+            page = f'/{name}-profile'
+            self.server.routes[page] = profile_page(self.server.url(f'/{name}.jpg'))
+            employees.append(Employee(name, 'Smith', Room('', '', ''), self.server.url(page), '', '', ''))
+        results = Employee.download_all_photos(employees, self.dir)
+        self.assertTrue(all(r.ok and r.result.downloaded for r in results))
+        results = Employee.download_all_photos(employees, self.dir)
+        self.assertFalse(any(r.result.downloaded for r in results))
+        self.assertEqual((self.dir / 'copy Smith.jpg').read_bytes(), IMAGE)
+
+    def test_download_all_photos_timeout(self):
+        def hanging(handler):
+            time.sleep(2)
+            handler.send_error(404)
+        self.server.routes['/hanging.jpg'] = hanging
+        self.server.routes['/hanging-profile'] = profile_page(self.server.url('/hanging.jpg'))
+        employee = Employee('Hanging', 'Smith', Room('', '', ''), self.server.url('/hanging-profile'), '', '', '')
+        start = time.monotonic()
+        results = Employee.download_all_photos([employee], self.dir, timeout=0.5)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertIsInstance(results[0].exception, TimeoutError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+from src.brightspot_employee.pool import WorkerPool
+from src.brightspot_employee import util
+
+from functools import partial
+from threading import Event
+import time
+import unittest
+
+
+def _identity(value):
+    return value
+
+
+def _raise(error):
+    raise error
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_results_in_order(self):
+        with WorkerPool(3) as pool:
+            results = pool.map(partial(_identity, n) for n in range(20))
+        self.assertEqual([r.result for r in results], list(range(20)))
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_exceptions_are_returned(self):
+        with WorkerPool(2) as pool:
+            results = pool.map([partial(_identity, 1), partial(_raise, ValueError('bad'))])
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[1].exception, ValueError)
+
+    def test_slow_task_does_not_block_slot_refill(self):
+        release = Event()
+        with WorkerPool(2) as pool:
+            slow = pool.submit(release.wait)
+            fast = [pool.submit(_identity, (n,)) for n in range(10)]
+            self.assertEqual([task.wait().result for task in fast], list(range(10)))
+            self.assertFalse(slow.future.done())
+            release.set()
+            self.assertTrue(slow.wait().ok)
+
+    def test_timeout_counts_from_start(self):
+        release = Event()
+        with WorkerPool(1) as pool:
+            hung = pool.submit(release.wait, timeout=0.1)
+            queued = pool.submit(time.sleep, (0.01,), timeout=0.1)
+            self.assertIsInstance(hung.wait().exception, TimeoutError)
+            release.set()
+            self.assertTrue(queued.wait().ok)
+
+    def test_cancel_pending(self):
+        release = Event()
+        pool = WorkerPool(1)
+        running = pool.submit(release.wait)
+        running.started.wait()
+        queued = [pool.submit(_identity, (n,)) for n in range(5)]
+        self.assertEqual(pool.cancel_pending(), 5)
+        release.set()
+        pool.shutdown()
+        self.assertTrue(running.wait().ok)
+        self.assertFalse(any(task.wait().ok for task in queued))
+
+    def test_exit_does_not_wait_for_abandoned(self):
+        release = Event()
+        self.addCleanup(release.set)
+        start = time.monotonic()
+        with WorkerPool(1) as pool:
+            hung = pool.submit(release.wait, timeout=0.1)
+            queued = pool.submit(_identity, (1,))
+            self.assertIsInstance(hung.wait().exception, TimeoutError)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(hung.abandoned)
+        self.assertFalse(hung.future.done())
+        self.assertTrue(queued.future.cancelled())
+
+    def test_stepped_limited_multithread(self):
+        release = Event()
+        done = []
+        # the first function only returns once the last one has run, so every other function must share one thread
+        functions = [partial(release.wait, 5)] + [partial(done.append, n) for n in range(10)] + [release.set]
+        start = time.monotonic()
+        util.stepped_limited_multithread(functions, limit=2)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(done, list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+from src.brightspot_employee import Employee, EmployeeProcessor
+from src.brightspot_employee.room import Room
+from tests.fixtureServer import FixtureServer, profile_page
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+PROFILE_EXTRAS = '<div class="ProfilePage-research"><p>Mormon  history</p></div>'
+
+
+class ResearchProcessor(EmployeeProcessor):
+    PROFILE_FIELDS = dict(EmployeeProcessor.PROFILE_FIELDS, research='-research')
+
+    def process_profile(self, meta, containers):
+        fields = super().process_profile(meta, containers)
+        fields['title'] = meta.get('og:title', self.NON_EXISTENT)
+        return fields
+
+
+class ResearchEmployee(Employee):
+    __slots__ = ()
+    processor = ResearchProcessor('')
+
+
+def employee(employee_cls, name: str, page_url: str) -> Employee:
+    first_name, last_name = name.split()
+    return employee_cls(first_name, last_name, Room('', '', ''), page_url, '', '', '')
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FixtureServer({'/img/alma.jpg': b'\xff\xd8' + b'\x00' * 1024})
+        page = profile_page(self.server.url('/img/alma.jpg'))
+        self.server.routes['/alma'] = page
+        self.server.routes['/research'] = page.replace('</main>', PROFILE_EXTRAS + '</main>')
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_fetch_each_page_once(self):
+        employees = [employee(Employee, 'Alma Jones', self.server.url('/alma')),
+                     employee(Employee, 'Alma Jones', self.server.url('/alma')),
+                     employee(Employee, 'Missing Page', self.server.url('/missing')),
+                     employee(Employee, 'No Page', '')]
+        results = Employee.fetch_profiles(employees)
+        self.assertEqual(list(results), [self.server.url('/alma'), self.server.url('/missing')])
+        self.assertEqual(self.server.requests.count('/alma'), 1)
+        self.assertFalse(results[self.server.url('/missing')].ok)
+
+        profile = employees[0].profile
+        self.assertIs(employees[1].profile, profile)
+        self.assertIsNone(employees[2].profile)
+        self.assertEqual(profile.photo_url, self.server.url('/img/alma.jpg'))
+        self.assertEqual(profile.fields, {'email': 'alma_jones@byu.edu',
+                                          'bio': 'Alma Jones studies the history of the early Restoration.',
+                                          'office_hours': 'Tuesdays and Thursdays, 10:00-11:30 a.m.'})
+        self.assertEqual(profile.meta['description'], 'Alma Jones is a professor of Church History and Doctrine.')
+        self.assertNotIn('profile', employees[0].as_dict())
+
+    def test_processor_hook(self):
+        researcher = employee(ResearchEmployee, 'Alma Jones', self.server.url('/research'))
+        fields = researcher.fetch_profile().fields
+        self.assertEqual(fields['research'], 'Mormon history')
+        self.assertEqual(fields['title'], 'Alma Jones')
+
+    def test_photo_reuses_profile(self):
+        alma = employee(Employee, 'Alma Jones', self.server.url('/alma'))
+        Employee.fetch_profiles([alma])
+        with TemporaryDirectory() as temp_dir:
+            result = alma.download_photo(temp_dir)
+            self.assertEqual(result.path, Path(temp_dir) / 'Alma Jones.jpg')
+        self.assertEqual(self.server.requests.count('/alma'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
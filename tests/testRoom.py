@@ -0,0 +1,52 @@
+from src.brightspot_employee.room import Room, RoomParser
+
+import gc
+import unittest
+
+
+class TestRoomParser(unittest.TestCase):
+    def test_from_string(self):
+        for room_string, expected in (('Office: 270F Joseph Smith Building', '2f 270F JSB'),
+                                      ('125-B Heber J. Grant Building', '1f 125B HGB'),
+                                      ('Office:  4010 b JFSB', '4f 4010b JFSB'),
+                                      ('3370 TMCB', '3f 3370 TMCB'),
+                                      ('', '')):
+            with self.subTest(room_string=room_string):
+                self.assertEqual(str(Room.from_string(room_string)), expected)
+
+    def test_batch_with_embedded_newlines(self):
+        rooms = Room.from_room_string_for_each(['270F JSB', 'Office:\n125 Heber Grant', '3370 TMCB'])
+        self.assertEqual([str(room) for room in rooms], ['2f 270F JSB', '1f 125 HGB', '3f 3370 TMCB'])
+
+    def test_rooms_are_interned(self):
+        parser = RoomParser()
+        self.assertIs(parser.parse('270F JSB'), parser.parse('Office: 270 F Joseph Smith Building'))
+        parser.parse('270F JSB')
+        self.assertEqual(parser.cache_info().hits, 1)
+
+    def test_interned_rooms_are_freed(self):
+        parser = RoomParser(cache_size=1)
+        parser.parse('270F JSB')
+        parser.parse('3370 TMCB')  # evicts 270F JSB from the memoization cache
+        gc.collect()
+        self.assertEqual(len(parser._rooms), 1)
+
+    def test_rooms_are_immutable(self):
+        room = Room.from_string('270F JSB')
+        with self.assertRaises(AttributeError):
+            room.floor = '3'
+        self.assertEqual(str(room), '2f 270F JSB')
+
+    def test_configurable_aliases(self):
+        parser = RoomParser(aliases={})
+        self.assertEqual(str(parser.parse('270F Joseph Smith Building')), '2f 270F Joseph')
+        parser.add_alias('Talmage', 'TMCB')
+        parser.add_alias('Joseph F', 'JFSB')
+        parser.add_alias('Joseph', 'JSB')
+        self.assertEqual(str(parser.parse('3370 Talmage Building')), '3f 3370 TMCB')
+        self.assertEqual(str(parser.parse('4010 Joseph F. Smith Building')), '4f 4010 JFSB')
+        self.assertEqual(str(parser.parse('270F Joseph Smith Building')), '2f 270F JSB')
+
+
+if __name__ == '__main__':
+    unittest.main()
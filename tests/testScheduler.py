@@ -0,0 +1,104 @@
+from src.brightspot_employee import util
+from src.brightspot_employee.scheduler import RequestScheduler, parse_retry_after
+from tests.fixtureServer import FixtureServer
+
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from threading import Lock
+import time
+import unittest
+
+
+def status_route(*statuses: int, retry_after: str = None):
+    """Return a route answering with each of statuses in turn (then 200), sending retry_after with errors."""
+    remaining = list(statuses)
+
+    def route(handler):
+        status = remaining.pop(0) if remaining else 200
+        handler.send_response(status)
+        if status != 200 and retry_after is not None:
+            handler.send_header('Retry-After', retry_after)
+        handler.send_header('Content-Length', '2')
+        handler.end_headers()
+        handler.wfile.write(b'ok')
+    return route
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FixtureServer({'/plain': 'ok'})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_retry_after(self):
+        self.server.routes['/busy'] = status_route(429, retry_after='1')
+        scheduler = RequestScheduler(concurrency=8)
+        url = self.server.url('/busy')
+        start = time.monotonic()
+        response = util.open_url(url, scheduler=scheduler)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests.count('/busy'), 2)
+        stats = scheduler.host_stats(url)
+        self.assertEqual((stats.requests, stats.retries, stats.throttled), (2, 1, 1))
+        self.assertEqual(stats.concurrency, 4)
+
+    def test_retries_run_out(self):
+        self.server.routes['/down'] = status_route(503, 503, 503, 503)
+        scheduler = RequestScheduler(retries=2, backoff=0)
+        self.assertEqual(scheduler.get(self.server.url('/down')).status_code, 503)
+        self.assertEqual(self.server.requests.count('/down'), 3)
+
+        self.server.routes['/long'] = status_route(429, retry_after='3600')
+        self.assertEqual(scheduler.get(self.server.url('/long')).status_code, 429)
+        self.assertEqual(self.server.requests.count('/long'), 1)
+
+    def test_connection_errors(self):
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+        scheduler = RequestScheduler(retries=1, backoff=0)
+        with self.assertRaises(RequestsConnectionError):
+            scheduler.get('http://127.0.0.1:1/refused')
+        self.assertEqual(scheduler.host_stats('http://127.0.0.1:1/').requests, 2)
+
+    def test_rate_limit(self):
+        scheduler = RequestScheduler(rate=20, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            scheduler.get(self.server.url('/plain')).close()
+        self.assertGreaterEqual(time.monotonic() - start, 0.24)
+
+    def test_concurrency_limit(self):
+        lock = Lock()
+        in_flight = []
+        peak = [0]
+
+        def slow(handler):
+            with lock:
+                in_flight.append(handler)
+                peak[0] = max(peak[0], len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(handler)
+            handler.send_response(200)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+
+        self.server.routes['/slow'] = slow
+        scheduler = RequestScheduler(concurrency=2, max_concurrency=2)
+        url = self.server.url('/slow')
+        with ThreadPoolExecutor(8) as executor:
+            statuses = list(executor.map(lambda _: scheduler.get(url).status_code, range(16)))
+        self.assertEqual(statuses, [200] * 16)
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(scheduler.host_stats(url).in_flight, 0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 60, usegmt=True)), 60, delta=2)
+        self.assertEqual(parse_retry_after(formatdate(time.time() - 60, usegmt=True)), 0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
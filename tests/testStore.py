@@ -0,0 +1,54 @@
+from src.brightspot_employee import Employee, util
+from src.brightspot_employee.room import Room
+from src.brightspot_employee.store import EmployeeStore
+from tests.fixtureLayouts import ReligionEmployee
+from tests.fixtureServer import fixture_text
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+
+class TestEmployeeStore(unittest.TestCase):
+    def setUp(self) -> None:
+        tags = util.find_tags(fixture_text('religion_directory.html'),
+                              kwargs={'class_': ReligionEmployee.processor.super_container})
+        self.employees = ReligionEmployee.from_html_tags(tags)
+        self.store = EmployeeStore()
+        self.addCleanup(self.store.close)
+        self.store.upsert(self.employees)
+
+    def test_upsert_replaces_by_page_url(self):
+        changed = Employee('Alma', 'Jones', Room('JSB', '3', '310'), self.employees[0].page_url, '', 'History', '')
+        self.store.upsert([changed])
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(str(self.store.get(changed.page_url)), str(changed))
+
+    def test_queries(self):
+        self.assertEqual([e.full_name for e in self.store.query(building='JSB', floor=2)], ['Alma Jones'])
+        self.assertEqual([e.full_name for e in self.store.query(department='Ancient Scripture')],
+                         ['Brigham Young Carter Jr.'])
+        self.assertEqual([e.full_name for e in self.store.query(last_name_prefix='s')], ['Eliza Snow'])
+        self.assertEqual(list(self.store.query(last_name_prefix='%')), [])
+        self.assertEqual(self.store.departments(), ['', 'Ancient Scripture', 'Church History and Doctrine'])
+
+    def test_indexes_are_used(self):
+        for sql in ("SELECT * FROM employees WHERE department = 'x'",
+                    "SELECT * FROM employees WHERE building = 'JSB' AND floor = '2'",
+                    "SELECT * FROM employees WHERE last_name LIKE 'sn%' ESCAPE '\\'"):
+            with self.subTest(sql=sql):
+                plan = ' '.join(row[-1] for row in self.store.connection.execute('EXPLAIN QUERY PLAN ' + sql))
+                self.assertIn('USING INDEX', plan)
+
+    def test_csv_round_trip(self):
+        with TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / 'employees.csv'
+            self.store.export_csv(file_path)
+            self.store.delete([e.page_url for e in self.employees])
+            self.assertEqual(len(self.store), 0)
+            self.store.import_csv(file_path, chunksize=2)
+        self.assertEqual(sorted(str(e) for e in self.store), sorted(str(e) for e in self.employees))
+
+
+if __name__ == '__main__':
+    unittest.main()
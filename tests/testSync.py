@@ -0,0 +1,116 @@
+from src.brightspot_employee import Employee
+from src.brightspot_employee.sync import EmptyScrapeError, sync_directory
+from tests.fixtureLayouts import ReligionEmployee
+from tests.fixtureServer import FixtureServer, fixture_text, profile_page
+
+from requests import HTTPError
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+ELIZA_CARD = '''<div class="ListVerticalImage-items-item">
+                <div class="PromoVerticalImage">
+                    <div class="PromoVerticalImage-content">
+                        <div class="PromoVerticalImage-title promo-title"><a class="Link" href="/directory/eliza-snow">Eliza Snow</a></div>
+                        <div class="PromoVerticalImage-jobTitle">Secretary</div>
+                    </div>
+                </div>
+            </div>'''
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.snapshot = Path(temp_dir.name) / 'religion.csv'
+        self.page = fixture_text('religion_directory.html')
+        self.server = FixtureServer({'/religion': self.page})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.url = self.server.url('/religion')
+
+    def sync(self, photo_dir=None):
+        return sync_directory(self.url, self.snapshot, photo_dir=photo_dir, employee_cls=ReligionEmployee)
+
+    def assert_snapshot_matches_website(self):
+        self.assertEqual(sorted(str(e) for e in Employee.from_csv(self.snapshot)),
+                         sorted(str(e) for e in ReligionEmployee.from_website(self.url)))
+
+    def test_first_sync_adds_everything(self):
+        changeset = self.sync()
+        self.assertEqual(len(changeset.added), 3)
+        self.assert_snapshot_matches_website()
+
+    def test_unchanged_snapshot_is_not_written(self):
+        self.sync()
+        contents = self.snapshot.read_bytes()
+        changeset = self.sync()
+        self.assertFalse(changeset)
+        self.assertEqual(len(changeset.unchanged), 3)
+        self.assertEqual(self.snapshot.read_bytes(), contents)
+
+    def test_additions_are_appended(self):
+        self.server.routes['/religion'] = self.page.replace(ELIZA_CARD, '')
+        self.sync()
+        contents = self.snapshot.read_bytes()
+        self.server.routes['/religion'] = self.page
+        changeset = self.sync()
+        self.assertEqual([e.full_name for e in changeset.added], ['Eliza Snow'])
+        self.assertTrue(self.snapshot.read_bytes().startswith(contents))
+        self.assert_snapshot_matches_website()
+
+    def test_modified_and_removed(self):
+        self.sync()
+        self.server.routes['/religion'] = (self.page.replace(ELIZA_CARD, '')
+                                                    .replace('>Associate Professor<', '>Professor<'))
+        changeset = self.sync()
+        self.assertEqual([e.full_name for e in changeset.removed], ['Eliza Snow'])
+        self.assertEqual([(old.job_title, new.job_title) for old, new in changeset.modified],
+                         [('Associate Professor', 'Professor')])
+        self.assertEqual([e.full_name for e in changeset.changed], ['Brigham Young Carter Jr.'])
+        self.assert_snapshot_matches_website()
+
+    def test_error_status_leaves_snapshot(self):
+        self.sync()
+        contents = self.snapshot.read_bytes()
+
+        def unavailable(handler):
+            handler.send_response(503)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+        self.server.routes['/religion'] = unavailable
+        with self.assertRaises(HTTPError) as context:
+            self.sync()
+        self.assertEqual(context.exception.response.status_code, 503)
+        self.assertEqual(self.snapshot.read_bytes(), contents)
+
+    def test_empty_page_leaves_snapshot(self):
+        self.sync()
+        contents = self.snapshot.read_bytes()
+        self.server.routes['/religion'] = '<html><body></body></html>'
+        with self.assertRaises(EmptyScrapeError):
+            self.sync()
+        self.assertEqual(self.snapshot.read_bytes(), contents)
+
+    def test_only_changed_photos_are_fetched(self):
+        self.page = self.page.replace('href="/directory/', f'href="{self.server.url("/directory/")}')
+        self.server.routes['/religion'] = self.page
+        for slug in ('alma-jones', 'brigham-carter-jr', 'eliza-snow'):
+            self.server.routes[f'/directory/{slug}'] = profile_page(self.server.url(f'/img/{slug}.jpg'))
+            self.server.routes[f'/img/{slug}.jpg'] = slug.encode('utf-8')
+        photo_dir = self.snapshot.parent / 'photos'
+        self.sync(photo_dir)
+        self.assertEqual(sorted(path.name for path in photo_dir.glob('*.jpg')),
+                         ['Alma Jones.jpg', 'Brigham Young Carter Jr..jpg', 'Eliza Snow.jpg'])
+
+        self.server.routes['/religion'] = self.page.replace('>Associate Professor<', '>Professor<')
+        self.server.requests.clear()
+        changeset = self.sync(photo_dir)
+        self.assertEqual([e.full_name for e in changeset.changed], ['Brigham Young Carter Jr.'])
+        self.assertEqual(sorted(path for path in self.server.requests if path != '/religion'),
+                         ['/directory/brigham-carter-jr', '/img/brigham-carter-jr.jpg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+from src.brightspot_employee import Employee, EmployeeTable, util
+from src.brightspot_employee.room import Room
+from tests.fixtureLayouts import ReligionEmployee
+from tests.fixtureServer import fixture_text
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import unittest
+
+
+class TestEmployeeTable(unittest.TestCase):
+    def setUp(self) -> None:
+        tags = util.find_tags(fixture_text('religion_directory.html'),
+                              kwargs={'class_': ReligionEmployee.processor.super_container})
+        self.employees = ReligionEmployee.from_html_tags(tags)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(Employee('Alma', 'Jones', Room('JSB', 2, 270), '', '', '', ''), '__dict__'))
+        self.assertFalse(hasattr(Room('JSB', 2, 270), '__dict__'))
+
+    def test_rows_are_employees(self):
+        table = EmployeeTable.from_employees(self.employees, ReligionEmployee)
+        self.assertEqual(len(table), 3)
+        self.assertEqual([str(e) for e in table], [str(e) for e in self.employees])
+        self.assertEqual(str(table[-1]), str(self.employees[-1]))
+        self.assertIsInstance(table[0], ReligionEmployee)
+        self.assertEqual(table[1:].column('building'), ['HGB', ''])
+
+    def test_csv_round_trip(self):
+        with TemporaryDirectory() as temp_dir:
+            employee_csv, table_csv = Path(temp_dir) / 'employees.csv', Path(temp_dir) / 'table.csv'
+            Employee.to_csv(employee_csv, self.employees)
+            table = EmployeeTable.from_csv(employee_csv)
+            table.to_csv(table_csv)
+            self.assertEqual(employee_csv.read_text(), table_csv.read_text())
+        merged = EmployeeTable.concat([table, table])
+        self.assertEqual(len(merged), 6)
+        self.assertEqual(str(merged[3]), str(self.employees[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+from src.brightspot_employee import Employee
+from src.brightspot_employee.photos import PhotoDownloader
+from src.brightspot_employee.room import Room
+from src.brightspot_employee.thumbnails import (ThumbnailPool, ThumbnailSpec, make_thumbnails, thumbnail_path,
+                                                DEFAULT_SPECS)
+from tests.fixtureServer import FixtureServer, etag_route, profile_page
+
+from PIL import Image
+
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import os
+import unittest
+
+
+def jpeg_bytes(width: int = 1200, height: int = 800) -> bytes:
+    buffer = BytesIO()
+    Image.linear_gradient('L').resize((width, height)).convert('RGB').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def solid_jpeg_bytes(color: str) -> bytes:
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class TestThumbnails(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = Path(temp_dir.name)
+        self.source = self.dir / 'Alma Jones.jpg'
+        self.source.write_bytes(jpeg_bytes())
+
+    def test_sizes_and_formats(self):
+        result = make_thumbnails(self.source, self.dir / 'thumbnails')
+        self.assertEqual(len(result.written), len(DEFAULT_SPECS))
+        expected = {'small': ('JPEG', (128, 85)), 'medium': ('JPEG', (512, 341)), 'webp': ('WEBP', (1200, 800))}
+        for spec in DEFAULT_SPECS:
+            with self.subTest(spec=spec.name), Image.open(thumbnail_path(self.source, self.dir / 'thumbnails',
+                                                                         spec)) as image:
+                self.assertEqual((image.format, image.size), expected[spec.name])
+
+    def test_skip_newer_outputs(self):
+        out_dir = self.dir / 'thumbnails'
+        specs = (ThumbnailSpec('small', 64), ThumbnailSpec('large', 600, 'PNG'))
+        make_thumbnails(self.source, out_dir, specs)
+        second = make_thumbnails(self.source, out_dir, specs)
+        self.assertEqual((len(second.written), len(second.skipped)), (0, 2))
+
+        small = thumbnail_path(self.source, out_dir, specs[0])
+        stale = self.source.stat().st_mtime - 10
+        os.utime(small, (stale, stale))
+        third = make_thumbnails(self.source, out_dir, specs)
+        self.assertEqual(third.written, (small,))
+
+    def test_photo_relinked_to_stored_content(self):
+        red, blue = solid_jpeg_bytes('red'), solid_jpeg_bytes('blue')
+        server = FixtureServer({'/other.jpg': etag_route(blue, '"blue"', 'image/jpeg'),
+                                '/alma.jpg': etag_route(red, '"red"', 'image/jpeg')})
+        photo = self.dir / 'photos' / 'alma.jpg'
+        spec = ThumbnailSpec('small', 32)
+        with server, PhotoDownloader(self.dir / 'photos' / '.photos') as downloader:
+            downloader.download(server.url('/other.jpg'), self.dir / 'photos' / 'other.jpg')
+            downloader.download(server.url('/alma.jpg'), photo)
+            make_thumbnails(photo, self.dir / 'thumbnails', (spec,))
+            # alma's photo changes to content that is already stored, so it is linked to an older object
+            server.routes['/alma.jpg'] = etag_route(blue, '"blue"', 'image/jpeg')
+            self.assertTrue(downloader.download(server.url('/alma.jpg'), photo).deduplicated)
+        result = make_thumbnails(photo, self.dir / 'thumbnails', (spec,))
+        self.assertEqual(result.written, (thumbnail_path(photo, self.dir / 'thumbnails', spec),))
+        with Image.open(result.written[0]) as thumbnail:
+            red_level, _, blue_level = thumbnail.convert('RGB').getpixel((16, 16))
+        self.assertGreater(blue_level, red_level)
+
+    def test_pool_after_downloads(self):
+        server = FixtureServer({'/img/alma.jpg': jpeg_bytes(), '/img/broken.jpg': b'not an image'})
+        server.routes['/alma'] = profile_page(server.url('/img/alma.jpg'))
+        server.routes['/broken'] = profile_page(server.url('/img/broken.jpg'))
+        employees = [Employee('Alma', 'Jones', Room('', '', ''), server.url('/alma'), '', '', ''),
+                     Employee('Broken', 'Image', Room('', '', ''), server.url('/broken'), '', '', '')]
+        photo_dir = self.dir / 'photos'
+        with server, ThumbnailPool(self.dir / 'thumbnails', processes=2) as thumbnails:
+            downloads = Employee.download_all_photos(employees, photo_dir, thumbnails=thumbnails)
+            results = thumbnails.wait()
+        self.assertTrue(all(download.ok for download in downloads))
+        # photos are submitted in the order their downloads finish
+        by_ok = {result.ok: result for result in results}
+        self.assertEqual(len(results), 2)
+        self.assertEqual(by_ok[True].result.source, photo_dir / 'Alma Jones.jpg')
+        self.assertIsNotNone(by_ok[False].exception)
+        small = thumbnail_path(photo_dir / 'Alma Jones.jpg', self.dir / 'thumbnails', DEFAULT_SPECS[0])
+        self.assertTrue(small.is_file())
+
+
+if __name__ == '__main__':
+    unittest.main()